@@ -22,7 +22,7 @@ def isolated_executor(
         stack.enter_context(
             patch(
                 "trainsh.core.executor_main.load_config",
-                return_value={"tmux": {"auto_bridge": False}},
+                return_value={"tmux": {"auto_bridge": False}, "ssh": {"prewarm_masters": False}},
             )
         )
         stack.enter_context(patch("trainsh.core.executor_main.CONFIG_DIR", config_dir))
@@ -24,6 +24,10 @@ class FakeLocalTmux:
         self.sessions.add(name)
         return TmuxCmdResult(0, "", "")
 
+    def ensure_session(self, name: str) -> TmuxCmdResult:
+        self.sessions.add(name)
+        return TmuxCmdResult(0, "", "")
+
     def send_keys(self, target: str, text: str, enter: bool = True, literal: bool = True) -> TmuxCmdResult:
         self.sent.append((target, text, enter, literal))
         return TmuxCmdResult(0, "", "")
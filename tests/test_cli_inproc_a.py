@@ -94,6 +94,8 @@ class HelpCatalogTests(unittest.TestCase):
         self.assertIn("Recipe lifecycle", top)
         self.assertIn("train recipe run <name>", recipe_help)
         self.assertEqual(readme, help_catalog.render_readme_overview())
+        self.assertIs(top, help_catalog.render_top_level_help())
+        self.assertIs(recipe_help, help_catalog.render_command_help("recipe"))
 
 
 class HelpCommandTests(CaptureMixin, unittest.TestCase):
@@ -75,17 +75,15 @@ class CoverageGrowthTests(unittest.TestCase):
             self.assertIn("root@gpu.example:/remote/dst", popen_args)
 
         local_tmux = SimpleNamespace(
-            has_session=MagicMock(return_value=True),
-            new_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
+            ensure_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             kill_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             run=MagicMock(side_effect=RuntimeError("source failed")),
         )
         remote_tmux = SimpleNamespace(
-            has_session=MagicMock(side_effect=RuntimeError("remote boom")),
-            new_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
+            ensure_session=MagicMock(side_effect=RuntimeError("remote boom")),
             build_attach_command=MagicMock(return_value="attach"),
             kill_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
-            write_text=MagicMock(side_effect=RuntimeError("write boom")),
+            write_and_source=MagicMock(side_effect=RuntimeError("write boom")),
             run=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             list_sessions=MagicMock(return_value=[]),
         )
@@ -104,10 +102,10 @@ class CoverageGrowthTests(unittest.TestCase):
         ok, msg = helper.cmd_tmux_open(["@gpu", "as", "main"])
         self.assertFalse(ok)
         self.assertIn("remote boom", msg)
+        executor.config = {"tmux": {"options": ["set -g mouse on"]}}
         with tempfile.TemporaryDirectory() as tmpdir, patch(
-            "trainsh.core.executor_tmux.load_config",
-            return_value={"tmux": {"options": ["set -g mouse on"]}},
-        ), patch("trainsh.core.executor_tmux.os.path.expanduser", return_value=str(Path(tmpdir) / ".tmux.conf")):
+            "trainsh.core.executor_tmux.os.path.expanduser", return_value=str(Path(tmpdir) / ".tmux.conf")
+        ):
             ok, msg = helper.cmd_tmux_config(["@local"])
             self.assertTrue(ok)
             ok, msg = helper.cmd_tmux_config(["@gpu"])
@@ -398,7 +396,7 @@ class CoverageGrowthTests(unittest.TestCase):
                 self.assertFalse(helper.is_pane_idle("gpu", "sess"))
 
             window = SimpleNamespace(name="main", host="local", remote_session="sess")
-            with patch("trainsh.core.executor_wait.time.sleep"), patch.object(
+            with patch.object(helper, "_pause", return_value=False), patch.object(
                 helper, "is_pane_idle", side_effect=[True, False]
             ), patch.object(helper, "get_pane_process_info", return_value=("bash", "")), patch.object(
                 helper, "get_pane_recent_output", side_effect=RuntimeError("boom")
@@ -423,15 +421,15 @@ class CoverageGrowthTests(unittest.TestCase):
             executor._resolve_window.return_value = remote_window
             with patch.object(helper, "host_from_ssh_spec", return_value=SimpleNamespace(hostname="remote")), patch(
                 "trainsh.core.executor_wait.subprocess.run", side_effect=OSError("nc boom")
-            ), patch("trainsh.core.executor_wait.time.time", side_effect=[0, 0, 0, 31, 31]), patch(
-                "trainsh.core.executor_wait.time.sleep"
+            ), patch("trainsh.core.executor_wait.time.time", side_effect=[0, 0, 0, 31, 31]), patch.object(
+                helper, "_pause", return_value=False
             ):
                 ok, msg = helper.exec_wait(SimpleNamespace(target="gpu", pattern="", condition="port:8080", timeout=5))
             self.assertFalse(ok)
 
             executor._resolve_window.return_value = window
-            with patch("trainsh.core.executor_wait.time.time", side_effect=[0, 0, 0, 31, 31]), patch(
-                "trainsh.core.executor_wait.time.sleep"
+            with patch("trainsh.core.executor_wait.time.time", side_effect=[0, 0, 0, 31, 31]), patch.object(
+                helper, "_pause", return_value=False
             ):
                 ok, msg = helper.exec_wait(SimpleNamespace(target="main", pattern="", condition="other", timeout=5))
             self.assertFalse(ok)
@@ -545,6 +543,19 @@ class CoverageGrowthTests(unittest.TestCase):
                 window = SimpleNamespace(host="gpu", remote_session="sess-1")
                 executor.ctx.windows["main"] = window
                 executor._save_checkpoint(0)
+                with patch.object(executor.state_manager, "save") as mocked_save:
+                    executor._save_checkpoint(0)
+                    mocked_save.assert_not_called()
+                    executor.ctx.variables["CHANGED"] = "1"
+                    executor._save_checkpoint(0)
+                    executor._save_checkpoint(0, status="failed")
+                    executor._save_checkpoint(1)
+                self.assertEqual(mocked_save.call_count, 3)
+                saved = [call.args[0].variables for call in mocked_save.call_args_list]
+                self.assertIs(saved[1], saved[2])
+                self.assertIs(saved[1], saved[0])
+                self.assertEqual(saved[0]["CHANGED"], "1")
+                self.assertIsNot(saved[0], executor.ctx.variables)
                 self.assertEqual(executor.job_state.hosts["main"], "gpu")
                 self.assertEqual(executor.job_state.window_sessions["main"], "sess-1")
                 self.assertIsNotNone(executor._load_checkpoint(executor.ctx.job_id))
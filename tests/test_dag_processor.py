@@ -161,6 +161,58 @@ class DagProcessorEdgeTests(unittest.TestCase):
             self.assertEqual(processor._coerce_dict([]), {})
             self.assertEqual(dag_id_from_path(recipe_path), str(recipe_path.resolve()))
 
+    def test_discover_files_scandir_matches_glob(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "a" / "b").mkdir(parents=True)
+            (root / "top.pyrecipe").write_text("", encoding="utf-8")
+            (root / "a" / "mid.pyrecipe").write_text("", encoding="utf-8")
+            (root / "a" / "b" / "deep.pyrecipe").write_text("", encoding="utf-8")
+            (root / "a" / "b" / "skip.txt").write_text("", encoding="utf-8")
+            (root / "dir.pyrecipe").mkdir()
+
+            for pattern in ("**/*.pyrecipe", "*.pyrecipe", "a/*.pyrecipe"):
+                expected = sorted(p for p in root.resolve().glob(pattern) if p.is_file())
+                processor = DagProcessor([str(root)], include_patterns=[pattern])
+                self.assertEqual(processor.discover_files(), expected, pattern)
+
+    def test_discover_dags_reuses_unchanged_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            first = root / "a.pyrecipe"
+            second = root / "b.pyrecipe"
+            first.write_text("# name: alpha\n", encoding="utf-8")
+            second.write_text("# name: beta\n", encoding="utf-8")
+
+            processor = DagProcessor([str(root)])
+            initial = processor.discover_dags()
+            again = processor.discover_dags()
+            self.assertIs(again[0], initial[0])
+            self.assertIs(again[1], initial[1])
+
+            second.write_text("# name: beta-renamed\n", encoding="utf-8")
+            first.unlink()
+            updated = processor.discover_dags()
+            self.assertEqual([d.recipe_name for d in updated], ["beta-renamed"])
+            self.assertEqual(len(processor._dag_cache), 1)
+
+    def test_discover_dags_parallel_matches_serial(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for index in range(4):
+                (root / f"r{index}.pyrecipe").write_text(f"# name: recipe-{index}\n", encoding="utf-8")
+
+            serial = DagProcessor([str(root)]).discover_dags()
+            parallel_processor = DagProcessor([str(root)], max_workers=2)
+            parallel_processor.PARALLEL_MIN_FILES = 1
+            parallel = parallel_processor.discover_dags()
+            self.assertEqual([d.recipe_name for d in parallel], [d.recipe_name for d in serial])
+            self.assertEqual([d.dag_id for d in parallel], [d.dag_id for d in serial])
+
+            with patch("trainsh.core.dag_processor.ProcessPoolExecutor", side_effect=OSError("no pool")):
+                fallback = parallel_processor.discover_dags()
+            self.assertEqual([d.recipe_name for d in fallback], [d.recipe_name for d in serial])
+
 
 if __name__ == "__main__":
     unittest.main()
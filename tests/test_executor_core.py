@@ -1,9 +1,12 @@
 import concurrent.futures
+import pickle
+import threading
 import unittest
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from trainsh.core.executor_main import _StepNode
+from trainsh.core.executor_runtime import VariableMap
 from trainsh.core.recipe_models import RecipeModel
 from trainsh.pyrecipe.models import ProviderStep
 
@@ -116,6 +119,15 @@ class ExecutorMainCoreTests(unittest.TestCase):
             self.assertIn("RuntimeError", output)
             mocked_emit.assert_called()
 
+            with patch.object(executor, "_execute_step_with_timeout", return_value=(True, "ok")), patch.object(
+                executor, "_build_step_details"
+            ) as mocked_details, patch.object(executor, "_emit_event"):
+                state, _output, _duration = executor._run_single_step_with_state(
+                    1, step, step_id="empty", try_number=1, track_checkpoint=False, emit_events=False
+                )
+            self.assertEqual(state, "success")
+            mocked_details.assert_not_called()
+
             provider_step = ProviderStep("util", "empty", {}, id="provider")
             with patch.object(executor, "_exec_provider", return_value=(True, "provider")):
                 self.assertEqual(executor._execute_step(provider_step), (True, "provider"))
@@ -166,10 +178,13 @@ class ExecutorMainCoreTests(unittest.TestCase):
         recipe = RecipeModel(name="core")
         with isolated_executor(recipe, executor_name="sequential") as (executor, _config_dir):
             step = SimpleNamespace(command="sleep", args=["1s"])
-            with patch("trainsh.core.executor_main.time.sleep") as mocked_sleep:
+            with patch.object(executor._stop_event, "wait", return_value=False) as mocked_wait:
                 ok, msg = executor._exec_control(step)
             self.assertTrue(ok)
-            mocked_sleep.assert_called_once_with(1)
+            mocked_wait.assert_called_once_with(1)
+            executor._stop_event.set()
+            self.assertEqual(executor._exec_control(step), (False, "Sleep interrupted"))
+            executor._stop_event.clear()
 
             bad_sleep = SimpleNamespace(command="sleep", args=[])
             ok, msg = executor._exec_control(bad_sleep)
@@ -222,6 +237,104 @@ class ExecutorMainCoreTests(unittest.TestCase):
             self.assertIsNone(executor._normalize_provider_timeout("bad"))
             self.assertEqual(executor._positive_provider_timeout("bad", default=7), 7)
 
+    def test_interpolate_fast_path_and_chained_references(self):
+        recipe = RecipeModel(name="core", variables={"A": "1"})
+        with isolated_executor(recipe) as (executor, _config_dir):
+            executor.ctx.variables.update({"B": "${A}-x", "C": "$B"})
+            with patch.object(executor.secrets, "get", return_value="tok") as mocked_get:
+                self.assertEqual(executor._interpolate("plain text"), "plain text")
+                mocked_get.assert_not_called()
+                self.assertEqual(executor._interpolate("${C}/$A/${secret:GH}/$MISSING"), "1-x/1/tok/$MISSING")
+            mocked_get.assert_called_once_with("GH")
+            self.assertEqual(executor._interpolate(""), "")
+
+            executor.ctx.variables.clear()
+            with patch("trainsh.core.executor_support._split_template") as mocked_split:
+                self.assertEqual(executor._interpolate("$HOME/${X}"), "$HOME/${X}")
+            mocked_split.assert_not_called()
+
+            executor.ctx.variables.update({"EMPTY": "", "N": "2"})
+            self.assertEqual(executor._interpolate("a${EMPTY}b-$N-$N"), "ab-2-2")
+            self.assertEqual(executor._interpolate("a${EMPTY}b-$N-$N"), "ab-2-2")
+            executor.ctx.variables["N"] = "3"
+            self.assertEqual(executor._interpolate("a${EMPTY}b-$N-$N"), "ab-3-3")
+
+    def test_prewarm_ssh_opens_masters_for_static_remote_hosts(self):
+        recipe = RecipeModel(
+            name="core",
+            hosts={"a": "root@a", "b": " root@a ", "gpu": "vast:1", "pod": "runpod:x", "here": "local", "c": "root@c -p 22"},
+        )
+        with isolated_executor(recipe) as (executor, _config_dir):
+            daemons = []
+            with patch(
+                "trainsh.core.executor_support._open_ssh_master",
+                side_effect=lambda host: daemons.append(threading.current_thread().daemon),
+            ) as mocked_open:
+                self.assertEqual(executor._prewarm_ssh(), [])
+                self.assertEqual(mocked_open.call_count, 0)
+                executor.prewarm_ssh_masters = True
+                for thread in executor._prewarm_ssh():
+                    thread.join(5)
+            self.assertEqual(sorted(call.args[0] for call in mocked_open.call_args_list), ["root@a", "root@c -p 22"])
+            self.assertEqual(daemons, [True, True])
+
+    def test_variable_map_counts_mutations(self):
+        variables = VariableMap({"A": "1"})
+        self.assertEqual(variables.version, 0)
+        variables["B"] = "2"
+        variables.update(C="3")
+        variables.setdefault("A", "x")
+        variables.setdefault("D", "4")
+        variables.pop("D")
+        del variables["C"]
+        variables |= {"E": "5"}
+        self.assertEqual(variables.version, 6)
+        self.assertEqual(dict(variables), {"A": "1", "B": "2", "E": "5"})
+        variables.clear()
+        self.assertEqual(variables.version, 7)
+
+    def test_variable_map_pickles_and_counts_parallel_writes(self):
+        restored = pickle.loads(pickle.dumps(VariableMap({"A": "1"})))
+        self.assertIsInstance(restored, VariableMap)
+        self.assertEqual(dict(restored), {"A": "1"})
+        restored["B"] = "2"
+        self.assertEqual(restored.version, 1)
+
+        variables = VariableMap()
+
+        def write(name):
+            for index in range(2000):
+                variables[name] = str(index)
+
+        threads = [threading.Thread(target=write, args=(f"V{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(variables.version, 8000)
+
+    def test_global_hosts_and_storages_are_loaded_once_per_run(self):
+        recipe = RecipeModel(name="core", hosts={"gpu": "root@gpu"}, storages={"out": "r2:bucket"})
+        with isolated_executor(recipe) as (executor, _config_dir):
+            with patch("trainsh.commands.host.load_hosts", return_value={}) as mocked_hosts, patch(
+                "trainsh.commands.storage.load_storages", return_value={}
+            ) as mocked_storages:
+                for _ in range(3):
+                    executor._parse_endpoint("@out:/logs")
+                    executor._build_transfer_hosts()
+                    executor._build_transfer_storages()
+            # Per-spec alias lookups pass include_auto_vast; the global map is read once.
+            self.assertEqual(mocked_hosts.call_args_list.count(call()), 1)
+            mocked_storages.assert_called_once()
+
+    def test_provider_helpers_are_built_on_first_use(self):
+        with isolated_executor(RecipeModel(name="core")) as (executor, _config_dir):
+            for name in ("transfer_helper", "vast_control", "runpod_control", "notifier"):
+                self.assertNotIn(name, executor.__dict__)
+            self.assertIs(executor.vast_control, executor.vast_control)
+            self.assertIs(executor.vast_control.executor, executor)
+            self.assertEqual(executor.notifier.app_name, executor.notify_app_name)
+
 
 if __name__ == "__main__":
     unittest.main()
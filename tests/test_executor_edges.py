@@ -248,22 +248,47 @@ class ExecSupportAndNotifyEdgeTests(unittest.TestCase):
                 self.assertEqual(executor._cmd_vast_cost(["gpu"]), (True, "cost"))
             mocked_attach.assert_called_once()
 
-            with patch("trainsh.core.executor_support.time.sleep") as mocked_sleep:
+            with patch.object(executor._stop_event, "wait", return_value=False) as mocked_wait:
                 ok, msg = executor._cmd_sleep(["2s"])
             self.assertTrue(ok)
-            mocked_sleep.assert_called_once_with(2)
+            mocked_wait.assert_called_once_with(2)
             ok, msg = executor._cmd_sleep([])
             self.assertFalse(ok)
             self.assertIn("Usage: sleep", msg)
 
             executor.recipe.hosts["gpu"] = "vast:123"
-            with patch("trainsh.core.executor_support._resolve_vast_host", return_value="gpu-host"):
+            with patch("trainsh.core.executor_support._lookup_vast_host", return_value=("gpu-host", True)):
                 self.assertEqual(executor._resolve_host("@gpu"), "gpu-host")
             self.assertIsNone(executor._resolve_window("missing"))
             executor.allow_host_execute = True
-            with patch("trainsh.core.executor_support._resolve_vast_host", return_value="gpu-host"):
+            with patch("trainsh.core.executor_support._lookup_vast_host", return_value=("gpu-host", True)):
                 resolved = executor._resolve_window("gpu")
             self.assertEqual(resolved.host, "gpu-host")
+            with patch("trainsh.core.executor_support._lookup_vast_host", return_value=("other", True)) as mocked_resolve:
+                self.assertEqual(executor._resolve_host("@gpu"), "gpu-host")
+                mocked_resolve.assert_not_called()
+                executor.vast_control.cmd_vast_stop = lambda args: (True, "stopped")
+                executor._cmd_vast_stop([])
+                self.assertEqual(executor._resolve_host("@gpu"), "other")
+            executor._invalidate_host_caches()
+            with patch("trainsh.core.executor_support._lookup_vast_host", return_value=("vast-123", False)) as mocked_resolve:
+                self.assertEqual(executor._resolve_host("@gpu"), "vast-123")
+                self.assertEqual(executor._resolve_host("@gpu"), "vast-123")
+            self.assertEqual(mocked_resolve.call_count, 2)
+
+            with patch("trainsh.core.executor_support._lookup_vast_host", return_value=("root@gpu-host", True)) as mocked_resolve, patch(
+                "trainsh.commands.host.load_hosts", return_value={}
+            ), patch("trainsh.commands.storage.load_storages", return_value={}):
+                executor._invalidate_host_caches()
+                first = executor._build_transfer_hosts()
+                self.assertIs(executor._build_transfer_hosts()["gpu"], first["gpu"])
+                self.assertEqual(mocked_resolve.call_count, 1)
+                executor.recipe.hosts["extra"] = "root@extra"
+                self.assertIn("extra", executor._build_transfer_hosts())
+                self.assertEqual(mocked_resolve.call_count, 1)
+                executor._cmd_vast_stop([])
+                executor._build_transfer_hosts()
+                self.assertEqual(mocked_resolve.call_count, 2)
 
             executor.ctx.variables["TOKEN"] = "${secret:API_KEY}"
             executor.ctx.variables["NAME"] = "demo"
@@ -276,6 +301,9 @@ class ExecSupportAndNotifyEdgeTests(unittest.TestCase):
             self.assertEqual(executor._parse_duration("2m"), 120)
             self.assertEqual(executor._parse_duration("3s"), 3)
             self.assertEqual(executor._parse_duration("4"), 4)
+            self.assertEqual(executor._parse_duration(" 5M "), 300)
+            with self.assertRaises(ValueError):
+                executor._parse_duration("1.5h")
 
     def test_notify_python_and_vast_provider_edges(self):
         with isolated_executor(RecipeModel(name="edge-notify")) as (executor, _config_dir):
@@ -1,10 +1,15 @@
 import tempfile
+import threading
+import time
 import unittest
+from contextlib import closing
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from trainsh.core.executor_utils import _verify_in_order
 from trainsh.core.executor_vast import VastControlHelper
+from trainsh.services.vast_connection import ATTACHED_KEY_TTL, vast_wait_delay
 
 
 def make_executor():
@@ -35,6 +40,129 @@ def make_helper(executor=None):
 
 
 class ExecutorVastMoreTests(unittest.TestCase):
+    def test_wait_delay_backs_off_until_running(self):
+        with patch("trainsh.services.vast_connection.random.uniform", return_value=0.0):
+            delays = [vast_wait_delay(count, 10, False) for count in range(1, 7)]
+        self.assertEqual(delays[:3], [2.0, 3.0, 4.5])
+        self.assertEqual(delays[-1], 10)
+        self.assertEqual(delays, sorted(delays))
+        self.assertEqual(vast_wait_delay(6, 10, True), 2.0)
+        self.assertEqual(vast_wait_delay(1, 1, False), 1)
+
+    def test_wait_returns_when_executor_is_stopped(self):
+        executor = make_executor()
+        executor._stop_event = threading.Event()
+        executor._stop_event.set()
+        executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        helper = make_helper(executor)
+        instance = SimpleNamespace(
+            id=7,
+            actual_status="loading",
+            is_running=False,
+            ssh_host=None,
+            ssh_port=None,
+            public_ipaddr=None,
+            direct_port_start=None,
+            direct_port_end=None,
+        )
+        stop_instance = MagicMock()
+        client = SimpleNamespace(get_instance=lambda instance_id: instance, stop_instance=stop_instance)
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch("trainsh.core.executor_vast.time.sleep") as sleep:
+            ok, msg = helper.cmd_vast_wait(["7", "timeout=10m", "poll=10s"])
+        self.assertEqual((ok, msg), (False, "Wait interrupted"))
+        sleep.assert_not_called()
+        stop_instance.assert_not_called()
+
+    def test_vast_client_is_built_once_per_helper(self):
+        helper = VastControlHelper(make_executor(), build_ssh_args=lambda *a, **k: [], format_duration=str)
+        client = SimpleNamespace(stop_instance=MagicMock())
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client) as mocked_factory:
+            self.assertTrue(helper.cmd_vast_stop(["7"])[0])
+            self.assertTrue(helper.cmd_vast_stop(["8"])[0])
+        mocked_factory.assert_called_once_with()
+        self.assertEqual(client.stop_instance.call_count, 2)
+
+        with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("no key")):
+            fresh = VastControlHelper(make_executor(), build_ssh_args=lambda *a, **k: [], format_duration=str)
+            self.assertFalse(fresh.cmd_vast_stop(["7"])[0])
+        self.assertIsNone(fresh._client)
+
+    def test_verify_in_order_runs_concurrently_and_keeps_priority(self):
+        started = threading.Barrier(2, timeout=5)
+
+        def verify(spec, timeout=10, runs=None):
+            started.wait()
+            return spec != "direct"
+
+        self.assertEqual(list(_verify_in_order(verify, ["direct", "proxy"])), [False, True])
+
+        mocked_verify = MagicMock(return_value=True)
+        self.assertEqual(list(_verify_in_order(mocked_verify, ["only"])), [True])
+        mocked_verify.assert_called_once_with("only")
+
+    def test_verify_in_order_kills_the_losing_probe(self):
+        done = threading.Event()
+        outcome = []
+
+        def verify(spec, timeout=10, runs=None):
+            if spec == "direct":
+                return True
+            ok = runs.run(["sleep", "30"], timeout=60).returncode == 0
+            outcome.append(ok)
+            done.set()
+            return ok
+
+        with closing(_verify_in_order(verify, ["direct", "proxy"])) as results:
+            self.assertTrue(next(results))
+        self.assertTrue(done.wait(5))
+        self.assertEqual(outcome, [False])
+
+    def test_recorded_ssh_key_expires_and_is_rechecked_on_auth_failure(self):
+        helper = make_helper()
+        ready = SimpleNamespace(
+            id=7,
+            actual_status="running",
+            is_running=True,
+            ssh_host="proxy",
+            ssh_port=22,
+            public_ipaddr=None,
+            direct_port_start=None,
+            direct_port_end=None,
+        )
+        with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.services.vast_connection.STATE_DIR", Path(tmpdir)):
+            key_path = Path(tmpdir) / "id_ed25519.pub"
+            key_path.write_text("ssh-ed25519 AAA demo\n", encoding="utf-8")
+            client = SimpleNamespace(
+                get_instance=lambda instance_id: ready,
+                list_ssh_keys=MagicMock(return_value=[{"ssh_key": "ssh-ed25519 AAA demo"}]),
+            )
+            helper.ensure_ssh_key_attached(client, str(key_path))
+            helper.ensure_ssh_key_attached(client, str(key_path))
+            self.assertEqual(client.list_ssh_keys.call_count, 1)
+            self.assertEqual([p.name for p in (Path(tmpdir) / "vast").iterdir()], ["ssh_keys.json"])
+
+            with patch("trainsh.services.vast_connection.time.time", return_value=time.time() + ATTACHED_KEY_TTL + 1):
+                helper.ensure_ssh_key_attached(client, str(key_path))
+            self.assertEqual(client.list_ssh_keys.call_count, 2)
+
+            def verify(spec, timeout=10):
+                if not verify.denied:
+                    verify.denied = True
+                    helper._ssh_auth_denied = True
+                    return False
+                return True
+
+            verify.denied = False
+            helper.executor.recipe.hosts = {}
+            helper.executor.config = {"vast": {}, "defaults": {"ssh_key_path": str(key_path)}}
+            with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch.object(
+                helper, "verify_ssh_connection", side_effect=verify
+            ), patch("subprocess.run"), patch("trainsh.core.executor_vast.time.sleep"):
+                ok, msg = helper.cmd_vast_wait(["7", "timeout=10m", "poll=10s"])
+            self.assertTrue(ok, msg)
+            # Skipped by the record at start, then listed again after the denial.
+            self.assertEqual(client.list_ssh_keys.call_count, 3)
+
     def test_logger_and_additional_vast_branches(self):
         logger = SimpleNamespace(
             log_detail=MagicMock(),
@@ -81,15 +209,18 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertIn("No instance ID provided for vast.stop", msg)
 
         helper.executor.recipe.hosts = {"gpu": "vast:1"}
-        instance_bad = SimpleNamespace(id=4, actual_status="stopped", gpu_name="T4", num_gpus=1, gpu_memory_gb=8, dph_total=2.0)
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(list_instances=lambda: [instance_bad])):
+        list_instances = MagicMock(return_value=[])
+        helper._client = None
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(list_instances=list_instances)):
             ok, msg = helper.cmd_vast_pick(["gpu_name=A100"])
         self.assertFalse(ok)
         self.assertIn("No Vast.ai instances match filters", msg)
+        list_instances.assert_called_once_with(gpu_name="A100")
 
         inst1 = SimpleNamespace(id=9, actual_status="starting", gpu_name="A100", num_gpus=1, gpu_memory_gb=80, dph_total=0.8)
         inst2 = SimpleNamespace(id=11, actual_status="stopped", gpu_name="A100", num_gpus=2, gpu_memory_gb=80, dph_total=0.7)
-        client = SimpleNamespace(list_instances=lambda: [inst1, inst2])
+        client = SimpleNamespace(list_instances=lambda **filters: [inst1, inst2])
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
             "trainsh.utils.vast_formatter.get_currency_settings", return_value=SimpleNamespace(display_currency="USD", rates=SimpleNamespace(convert=lambda amount, _from, _to: amount))
         ), patch("trainsh.utils.vast_formatter.format_instance_header", return_value=("HEADER", "---")), patch(
@@ -116,10 +247,11 @@ class ExecutorVastMoreTests(unittest.TestCase):
             return 901
 
         client = SimpleNamespace(
-            list_instances=lambda: [],
+            list_instances=lambda **filters: [],
             search_offers=lambda **kwargs: [offer],
             create_instance=create_instance,
         )
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=client):
             ok, msg = helper.cmd_vast_pick(
                 [
@@ -142,6 +274,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertTrue(created["kwargs"]["direct"])
 
         helper.executor.ctx.variables.clear()
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("pick boom")):
             ok, msg = helper.cmd_vast_pick(["host=gpu"])
         self.assertFalse(ok)
@@ -178,6 +311,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
             start_date=None,
         )
         client = SimpleNamespace(get_instance=lambda inst_id: stopped, start_instance=lambda inst_id: None)
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=client):
             ok, msg = helper.cmd_vast_start(["8"])
         self.assertTrue(ok)
@@ -204,6 +338,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertIn("No instance ID provided for vast.stop", msg)
 
         helper.executor.recipe.hosts = {"gpu": "vast:12"}
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(stop_instance=lambda inst_id: None)):
             ok, msg = helper.cmd_vast_stop(["gpu"])
         self.assertTrue(ok)
@@ -224,6 +359,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertIn("Using existing instance: 5", msg)
 
         helper.executor.ctx.variables.clear()
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(list_instances=lambda: [])):
             ok, msg = helper.cmd_vast_pick(["host=gpu"])
         self.assertFalse(ok)
@@ -275,9 +411,9 @@ class ExecutorVastMoreTests(unittest.TestCase):
         )
         helper.executor.recipe.hosts = {"gpu": "vast:7"}
         helper.executor.ctx.variables["VAST_ID"] = "7"
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: ready)), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ), patch.object(helper, "verify_ssh_connection", return_value=True), patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="", stderr="")), patch(
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        helper._client = None
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: ready)), patch.object(helper, "verify_ssh_connection", return_value=True), patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="", stderr="")), patch(
             "time.time", side_effect=[0, 0, 1, 1]
         ):
             ok, msg = helper.cmd_vast_wait(["7", "timeout=10m", "poll=10s"])
@@ -316,6 +452,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertFalse(ok)
         self.assertIn("No instance ID provided for vast.start", msg)
 
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("boom")):
             ok, msg = helper.cmd_vast_stop(["1"])
         self.assertFalse(ok)
@@ -387,16 +524,14 @@ class ExecutorVastMoreTests(unittest.TestCase):
             calls["n"] += 1
             return 0 if calls["n"] <= 3 else 1000
 
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ), patch("time.time", side_effect=fake_time), patch("time.sleep"):
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch("time.time", side_effect=fake_time), patch("time.sleep"):
             ok, msg = helper.cmd_vast_wait(["timeout=10m", "poll_interval=10s", "stop_on_fail=false"])
         self.assertFalse(ok)
         self.assertNotIn("instance stopped", msg)
 
-        with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("boom")), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ):
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("boom")):
             ok, msg = helper.cmd_vast_wait(["7"])
         self.assertFalse(ok)
         self.assertIn("Vast wait failed", msg)
@@ -416,9 +551,8 @@ class ExecutorVastMoreTests(unittest.TestCase):
             gpu_name="A100",
             num_gpus=1,
         )
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: ready)), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ), patch.object(helper, "verify_ssh_connection", return_value=True), patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="", stderr="")), patch(
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: ready)), patch.object(helper, "verify_ssh_connection", return_value=True), patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="", stderr="")), patch(
             "time.time", side_effect=[0, 0, 1, 1]
         ):
             ok, msg = helper.cmd_vast_wait(["gpu"])
@@ -459,9 +593,8 @@ class ExecutorVastMoreTests(unittest.TestCase):
             calls["n"] += 1
             return 0 if calls["n"] <= 3 else 700
 
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: ready_direct, stop_instance=lambda instance_id: None)), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": True}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ), patch.object(helper, "ensure_ssh_key_attached") as mocked_attach, patch.object(
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": True}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: ready_direct, stop_instance=lambda instance_id: None)), patch.object(helper, "ensure_ssh_key_attached") as mocked_attach, patch.object(
             helper, "verify_ssh_connection", return_value=False
         ), patch("time.time", side_effect=time_after_one_loop), patch("time.sleep"):
             ok, msg = helper.cmd_vast_wait(["7", "timeout=10m", "poll=10s"])
@@ -489,9 +622,8 @@ class ExecutorVastMoreTests(unittest.TestCase):
             calls["n"] += 1
             return 0 if calls["n"] <= 3 else 1000
 
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ), patch("time.time", side_effect=time_timeout), patch("time.sleep"):
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch("time.time", side_effect=time_timeout), patch("time.sleep"):
             ok, msg = helper.cmd_vast_wait(["7"])
         self.assertFalse(ok)
         self.assertIn("instance stopped", msg)
@@ -502,9 +634,9 @@ class ExecutorVastMoreTests(unittest.TestCase):
 
         client = SimpleNamespace(get_instance=lambda instance_id: timeout_inst, stop_instance=lambda instance_id: (_ for _ in ()).throw(VastAPIError("stop boom")))
         calls = {"n": 0}
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
-            "trainsh.config.load_config", return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
-        ), patch("trainsh.services.vast_api.VastAPIError", VastAPIError), patch(
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        helper._client = None
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch("trainsh.services.vast_api.VastAPIError", VastAPIError), patch(
             "time.time", side_effect=lambda: 0 if (calls.__setitem__('n', calls['n'] + 1) or calls['n']) <= 3 else 1000
         ), patch("time.sleep"):
             ok, msg = helper.cmd_vast_wait(["7"])
@@ -519,9 +651,13 @@ class ExecutorVastMoreTests(unittest.TestCase):
             self.assertFalse(helper.verify_ssh_connection("root@example"))
         with patch("subprocess.run", side_effect=RuntimeError("boom")):
             self.assertFalse(helper.verify_ssh_connection("root@example"))
+        self.assertFalse(helper._ssh_auth_denied)
+        with patch("subprocess.run", return_value=SimpleNamespace(returncode=255, stdout="", stderr="root@x: Permission denied (publickey).")):
+            self.assertFalse(helper.verify_ssh_connection("root@example"))
+        self.assertTrue(helper._ssh_auth_denied)
 
         client = SimpleNamespace(list_ssh_keys=lambda: [])
-        with tempfile.TemporaryDirectory() as tmpdir:
+        with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.services.vast_connection.STATE_DIR", Path(tmpdir)):
             key_path = Path(tmpdir) / "id_rsa"
             helper.ensure_ssh_key_attached(client, str(key_path))
             key_path.with_suffix(".pub").write_text("", encoding="utf-8")
@@ -533,9 +669,18 @@ class ExecutorVastMoreTests(unittest.TestCase):
             helper.ensure_ssh_key_attached(dup_client, str(key_path))
             err_client = SimpleNamespace(list_ssh_keys=lambda: [], add_ssh_key=lambda content, label="tmux-trainsh": (_ for _ in ()).throw(RuntimeError("duplicate key")))
             helper.ensure_ssh_key_attached(err_client, str(key_path))
-            warn_client = SimpleNamespace(list_ssh_keys=lambda: [], add_ssh_key=lambda content, label="tmux-trainsh": (_ for _ in ()).throw(RuntimeError("boom")))
+            warn_client = SimpleNamespace(
+                api_key="other",
+                list_ssh_keys=lambda: [],
+                add_ssh_key=lambda content, label="tmux-trainsh": (_ for _ in ()).throw(RuntimeError("boom")),
+            )
             helper.ensure_ssh_key_attached(warn_client, str(key_path))
 
+            # The duplicate branches recorded the key; the next wait skips the lookup.
+            listed = SimpleNamespace(list_ssh_keys=MagicMock(return_value=[]))
+            helper.ensure_ssh_key_attached(listed, str(key_path))
+            listed.list_ssh_keys.assert_not_called()
+
         helper.executor.ctx.variables.clear()
         ok, msg = helper.cmd_vast_cost([])
         self.assertFalse(ok)
@@ -557,6 +702,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertIn("no pricing", msg)
 
         priced_instance = SimpleNamespace(dph_total=1.0, gpu_name="A100")
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda inst_id: priced_instance)), patch(
             "trainsh.services.pricing.load_pricing_settings", return_value=SimpleNamespace(exchange_rates=SimpleNamespace(convert=lambda amount, _from, _to: amount * 7))
         ), patch("trainsh.utils.vast_formatter.get_currency_settings", return_value=SimpleNamespace(display_currency="CNY")), patch(
@@ -568,6 +714,7 @@ class ExecutorVastMoreTests(unittest.TestCase):
         self.assertTrue(ok)
         self.assertIn("CNY7.00", msg)
 
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("boom")):
             ok, msg = helper.cmd_vast_cost(["7"])
         self.assertFalse(ok)
@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 
 from trainsh.core.models import (
@@ -67,6 +69,11 @@ class ModelsMoreTests(unittest.TestCase):
         self.assertEqual(payload["type"], "s3")
         self.assertTrue(Storage.from_dict(payload).is_default)
 
+        for instance in (host, storage, TransferEndpoint(type="host", path="/x", host_id="gpu")):
+            self.assertFalse(hasattr(instance, "__dict__"))
+            self.assertEqual(copy.deepcopy(instance), instance)
+            self.assertEqual(pickle.loads(pickle.dumps(instance)), instance)
+
     def test_recipe_execution_transfer_and_vast_models(self):
         step = RecipeStep(name="run", operation=OperationType.RUN_COMMANDS, params={"cmd": "echo hi"}, depends_on=["a"], retry_count=2, timeout=5.0, interactive=True)
         step_data = step.to_dict()
@@ -143,17 +143,15 @@ class DispatchAndConditionSweepTests(unittest.TestCase):
 class TmuxAndRemoteSweepTests(unittest.TestCase):
     def test_tmux_control_and_remote_tmux_sweep(self):
         local_tmux = SimpleNamespace(
-            has_session=MagicMock(return_value=False),
-            new_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
+            ensure_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             kill_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             run=MagicMock(return_value=TmuxCmdResult(1, "", "source fail")),
         )
         remote_tmux = SimpleNamespace(
-            has_session=MagicMock(return_value=True),
-            new_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
+            ensure_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             build_attach_command=MagicMock(return_value="attach"),
             kill_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
-            write_text=MagicMock(return_value=TmuxCmdResult(0, "", "")),
+            write_and_source=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             run=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             list_sessions=MagicMock(return_value=["sess"]),
         )
@@ -174,18 +172,18 @@ class TmuxAndRemoteSweepTests(unittest.TestCase):
         executor.ctx.windows["main"] = SimpleNamespace(host="gpu", remote_session="sess")
         self.assertTrue(helper.cmd_tmux_close(["@main"])[0])
 
+        executor.config = {"tmux": {"options": ["set -g mouse on"]}}
         with tempfile.TemporaryDirectory() as tmpdir:
             tmux_conf = Path(tmpdir) / ".tmux.conf"
-            with patch("trainsh.core.executor_tmux.load_config", return_value={"tmux": {"options": ["set -g mouse on"]}}), patch(
-                "os.path.expanduser", return_value=str(tmux_conf)
-            ):
+            with patch("os.path.expanduser", return_value=str(tmux_conf)) as mocked_expand:
                 ok, msg = helper.cmd_tmux_config(["@local"])
+                self.assertTrue(helper.cmd_tmux_config(["@local"])[0])
             self.assertTrue(ok)
+            self.assertEqual(mocked_expand.call_count, 1)
+            self.assertTrue(tmux_conf.read_text().endswith("set -g mouse on"))
 
-        remote_tmux.run.return_value = TmuxCmdResult(1, "", "source fail")
-        remote_tmux.list_sessions.return_value = ["sess"]
-        with patch("trainsh.core.executor_tmux.load_config", return_value={"tmux": {"options": ["set -g mouse on"]}}):
-            ok, msg = helper.cmd_tmux_config(["@gpu"])
+        remote_tmux.write_and_source.return_value = TmuxCmdResult(1, "", "source fail")
+        ok, msg = helper.cmd_tmux_config(["@gpu"])
         self.assertFalse(ok)
         self.assertIn("Failed to source", msg)
 
@@ -90,6 +90,25 @@ class SmallModuleSweepTests(unittest.TestCase):
             self.assertEqual(client.wait_for("sig").returncode, 0)
         self.assertIn("attach -t", client.build_attach_command("sess"))
 
+    def test_load_config_reparses_only_after_file_changes(self):
+        from trainsh import config as config_mod
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_file = Path(tmpdir) / "config.yaml"
+            config_file.write_text("ui:\n  currency: EUR\n", encoding="utf-8")
+            with patch.object(config_mod, "CONFIG_DIR", Path(tmpdir)), patch.object(
+                config_mod, "CONFIG_FILE", config_file
+            ), patch.object(config_mod, "_config_cache", None):
+                with patch.object(config_mod.yaml, "safe_load", wraps=config_mod.yaml.safe_load) as mocked_load:
+                    first = config_mod.load_config()
+                    first["ui"]["currency"] = "mutated"
+                    second = config_mod.load_config()
+                self.assertEqual(mocked_load.call_count, 1)
+                self.assertEqual(second["ui"]["currency"], "EUR")
+
+                config_mod.save_config({"ui": {"currency": "JPY"}})
+                self.assertEqual(config_mod.load_config()["ui"]["currency"], "JPY")
+
     def test_provider_dispatch_conditions_tmux_and_transfer_support(self):
         class FakeDispatch(ExecutorProviderDispatchMixin, ExecutorProviderConditionsMixin):
             def __init__(self):
@@ -158,7 +177,7 @@ class SmallModuleSweepTests(unittest.TestCase):
         self.assertEqual(ExecutorProviderConditionsMixin._exec_provider_short_circuit(ex, {"condition": "x", "invert": False})[0], True)
         self.assertEqual(ExecutorProviderConditionsMixin._exec_provider_latest_only(ex, {"enabled": False}), (True, "latest_only disabled"))
 
-        local_tmux = SimpleNamespace(has_session=lambda name: False, new_session=lambda *a, **k: TmuxCmdResult(0, "", ""), kill_session=lambda name: TmuxCmdResult(0, "", ""), run=lambda *a, **k: TmuxCmdResult(0, "", ""))
+        local_tmux = SimpleNamespace(ensure_session=lambda name: TmuxCmdResult(0, "", ""), kill_session=lambda name: TmuxCmdResult(0, "", ""), run=lambda *a, **k: TmuxCmdResult(0, "", ""))
         executor = SimpleNamespace(
             _resolve_host=lambda host: "local",
             allocate_window_session_name=lambda: "sess1",
@@ -127,6 +127,8 @@ class PyrecipeCoreTests(unittest.TestCase):
         prov_id = recipe._add_step(provider, depends_on=[start])
         self.assertEqual(prov_id, "step_001")
         self.assertEqual(recipe.steps[-1].depends_on, ["start"])
+        self.assertEqual(provider.args, ("util", "empty"))
+        self.assertEqual(provider.args, provider.to_step_model().args)
 
         with self.assertRaises(PythonRecipeError):
             recipe._add_step(provider, depends_on=["missing"], step_id="x")
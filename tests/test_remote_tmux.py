@@ -54,6 +54,23 @@ class RemoteTmuxClientTests(unittest.TestCase):
         self.assertIn('cat > "$HOME/.tmux.conf" <<', seen[0][1])
         self.assertIn("set -g mouse on", seen[0][1])
 
+    def test_write_and_source_uses_one_ssh_call(self):
+        seen = []
+
+        def fake_builder(host, command=None, tty=False, set_term=False):
+            seen.append(command)
+            return ["ssh", host, command or ""]
+
+        client = RemoteTmuxClient("gpu-host", fake_builder)
+        with patch("subprocess.run", return_value=_Completed(returncode=0)):
+            result = client.write_and_source("~/.tmux.conf", "set -g mouse on")
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(len(seen), 1)
+        self.assertIn('cat > "$HOME/.tmux.conf" <<', seen[0])
+        self.assertIn("|| exit 97\n", seen[0])
+        self.assertIn('tmux source-file "$HOME/.tmux.conf" && exit 0', seen[0])
+
     def test_build_attach_command_uses_status_mode_and_tty(self):
         seen = []
 
@@ -1,4 +1,5 @@
 import io
+import threading
 import unittest
 from contextlib import redirect_stdout
 from types import SimpleNamespace
@@ -210,6 +211,20 @@ class RunpodControlHelperTests(unittest.TestCase):
         )
         return executor, RunpodControlHelper(executor, lambda *args, **kwargs: ["ssh"], lambda seconds: f"{int(seconds)}s")
 
+    def test_wait_returns_when_executor_is_stopped(self):
+        executor, helper = self._helper()
+        executor._stop_event = threading.Event()
+        executor._stop_event.set()
+        pod = SimpleNamespace(desired_status="CREATED", is_running=False)
+        client = SimpleNamespace(get_pod=lambda pod_id: pod, stop_pod=MagicMock())
+        with patch("trainsh.services.runpod_api.get_runpod_client", return_value=client), patch(
+            "trainsh.services.runpod_connection.runpod_ssh_targets", return_value=[]
+        ), patch("trainsh.core.executor_runpod.time.sleep") as sleep:
+            ok, msg = helper.cmd_runpod_wait(["pod-1", "timeout=10m", "poll=10s"])
+        self.assertEqual((ok, msg), (False, "Wait interrupted"))
+        sleep.assert_not_called()
+        client.stop_pod.assert_not_called()
+
     def test_helper_paths(self):
         executor, helper = self._helper()
         ready_pod = RunpodPod(
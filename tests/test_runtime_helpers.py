@@ -1,4 +1,6 @@
 import sqlite3
+import subprocess
+import sys
 import tempfile
 import unittest
 from concurrent.futures import Future
@@ -13,6 +15,8 @@ from trainsh.core.executor_execute import ExecuteHelper
 from trainsh.core.executor_tmux import TmuxControlHelper
 from trainsh.core.executor_wait import WaitHelper
 from trainsh.core.local_tmux import TmuxCmdResult
+from trainsh.core.recipe_models import RecipeModel, RecipeStepModel, StepType
+from trainsh.core.remote_tmux import RemoteTmuxClient
 from trainsh.core.scheduler import DagRunState, DagScheduler
 from trainsh.core.tmux_session import TmuxSession, kill_session, list_sessions, session_exists
 
@@ -62,6 +66,11 @@ class FakeTmuxClient:
         self.sessions.add(name)
         return ok("")
 
+    def ensure_session(self, name):
+        if name in self.sessions:
+            return ok("")
+        return self.new_session(name)
+
     def kill_session(self, name):
         self.sessions.discard(name)
         return ok("")
@@ -253,7 +262,8 @@ class ExecuteHelperTests(unittest.TestCase):
         tmux = FakeTmuxClient()
         executor = SimpleNamespace(
             _interpolate=lambda text: text.replace("$NAME", "demo"),
-            logger=SimpleNamespace(log_detail=lambda *a, **k: None, log_ssh=lambda *a, **k: None),
+            logger=SimpleNamespace(log_detail=lambda *a, **k: None, log_ssh=lambda *a, **k: None, step_output=lambda *a, **k: None),
+            _current_step_num=lambda: 1,
             _resolve_window=lambda name: None,
             _exec_via_bridge=lambda **kwargs: None,
             get_tmux_client=lambda host: tmux,
@@ -285,6 +295,11 @@ class ExecuteHelperTests(unittest.TestCase):
         executor.is_resuming = True
         ok_run, msg = helper.exec_execute(step)
         self.assertTrue(ok_run)
+        self.assertIn("Command completed", msg)
+        self.assertIn("tmux wait-for -S", tmux.sent[-1][1])
+        tmux.wait = TmuxCmdResult(1, "", "")
+        ok_run, msg = helper.exec_execute(step)
+        self.assertTrue(ok_run)
         self.assertEqual(msg, "idle")
 
         executor.is_resuming = False
@@ -297,17 +312,17 @@ class ExecuteHelperTests(unittest.TestCase):
         self.assertFalse(ok_run)
 
         executor._resolve_window = lambda name: SimpleNamespace(host="local", remote_session="")
-        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")):
+        with patch.object(helper, "_run_streamed", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")):
             self.assertEqual(helper.exec_execute(step), (True, "ok"))
-        with patch("subprocess.run", side_effect=__import__("subprocess").TimeoutExpired("cmd", 1)):
+        with patch.object(helper, "_run_streamed", side_effect=__import__("subprocess").TimeoutExpired("cmd", 1)):
             ok_run, msg = helper.exec_execute(step)
         self.assertFalse(ok_run)
         self.assertIn("timed out", msg)
 
         executor._resolve_window = lambda name: SimpleNamespace(host="gpu", remote_session="")
-        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")):
+        with patch.object(helper, "_run_streamed", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")):
             self.assertEqual(helper.exec_execute(step), (True, "ok"))
-        with patch("subprocess.run", side_effect=__import__("subprocess").TimeoutExpired("cmd", 1)):
+        with patch.object(helper, "_run_streamed", side_effect=__import__("subprocess").TimeoutExpired("cmd", 1)):
             ok_run, msg = helper.exec_execute(step)
         self.assertFalse(ok_run)
         self.assertIn("timed out", msg)
@@ -334,18 +349,48 @@ class ExecuteHelperTests(unittest.TestCase):
 
         resume_calls = []
         executor.is_resuming = True
+        tmux.wait = TmuxCmdResult(1, "", "")
         executor._wait_for_idle = lambda window, timeout: resume_calls.append(timeout) or (True, "idle")
         ok_run, msg = helper.exec_execute(step)
         self.assertTrue(ok_run)
         self.assertEqual(msg, "idle")
         self.assertIsNone(resume_calls[-1])
 
+        # A timed-out wait-for leaves only the rest of the budget for idle polling.
+        step.timeout = 30
+        with patch("trainsh.core.executor_execute.time.monotonic_ns", side_effect=[0, 10 * 10**9, 10 * 10**9]):
+            self.assertTrue(helper.exec_execute(step)[0])
+        self.assertEqual(resume_calls[-1], 20)
+        with patch("trainsh.core.executor_execute.time.monotonic_ns", side_effect=[0, 31 * 10**9]):
+            ok_run, msg = helper.exec_execute(step)
+        self.assertFalse(ok_run)
+        self.assertIn("timed out after 30s", msg)
+        self.assertEqual(len(resume_calls), 2)
+        step.timeout = 0
+
         executor.is_resuming = False
         executor._resolve_window = lambda name: SimpleNamespace(host="local", remote_session="")
-        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")) as mocked_run:
+        with patch.object(helper, "_run_streamed", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")) as mocked_run:
             self.assertEqual(helper.exec_execute(step), (True, "ok"))
         self.assertIsNone(mocked_run.call_args.kwargs["timeout"])
 
+    def test_run_streamed_collects_pipes_and_enforces_deadline(self):
+        helper, _executor, _tmux = self.make_helper()
+        script = "import sys; sys.stdout.write('x' * 300000 + 'a\\r\\nb'); sys.stderr.write('err')"
+        seen = {"stdout": [], "stderr": []}
+        helper.OUTPUT_TAIL_CHARS = 1000
+        result = helper._run_streamed(
+            [sys.executable, "-c", script], timeout=30, on_output=lambda stream, text: seen[stream].append(text)
+        )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(len("".join(seen["stdout"])), 300003)
+        self.assertEqual(len(result.stdout), 1000)
+        self.assertTrue(result.stdout.endswith("xa\nb"))
+        self.assertEqual(result.stderr, "err")
+
+        with self.assertRaises(subprocess.TimeoutExpired):
+            helper._run_streamed([sys.executable, "-c", "import time; time.sleep(30)"], timeout=1)
+
     def test_execute_capture_var_paths(self):
         helper, executor, tmux = self.make_helper()
         step = SimpleNamespace(
@@ -362,7 +407,7 @@ class ExecuteHelperTests(unittest.TestCase):
             capture_path = Path(tmpdir) / "capture.txt"
             capture_path.write_text("hello\n", encoding="utf-8")
             step.capture_path = str(capture_path)
-            with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="hello\n", stderr="")):
+            with patch.object(helper, "_run_streamed", return_value=SimpleNamespace(returncode=0, stdout="hello\n", stderr="")):
                 ok_run, msg = helper.exec_execute(step)
         self.assertTrue(ok_run)
         self.assertEqual(executor.ctx.variables["OUT"], "hello")
@@ -380,7 +425,7 @@ class ExecuteHelperTests(unittest.TestCase):
         mocked_cleanup.assert_called_once_with("gpu", str(step.capture_path))
 
         executor._resolve_window = lambda name: SimpleNamespace(host="gpu", remote_session="")
-        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")), patch.object(
+        with patch.object(helper, "_run_streamed", return_value=SimpleNamespace(returncode=0, stdout="ok", stderr="")), patch.object(
             helper,
             "_read_captured_output",
             return_value="ssh\n",
@@ -446,12 +491,13 @@ class WaitHelperTests(unittest.TestCase):
         ok_wait, msg = helper.exec_wait(SimpleNamespace(target="main", pattern="[", condition="", timeout=5))
         self.assertFalse(ok_wait)
         self.assertIn("Invalid wait pattern", msg)
+        self.assertIs(helper.compile_pattern("training"), helper.compile_pattern("training"))
 
         with patch("os.path.exists", return_value=True):
             ok_wait, msg = helper.exec_wait(SimpleNamespace(target="main", pattern="", condition="file:/tmp/ready", timeout=5))
         self.assertTrue(ok_wait)
 
-        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0)):
+        with patch("socket.create_connection", return_value=MagicMock()):
             ok_wait, msg = helper.exec_wait(SimpleNamespace(target="main", pattern="", condition="port:8080", timeout=5))
         self.assertTrue(ok_wait)
 
@@ -459,6 +505,21 @@ class WaitHelperTests(unittest.TestCase):
         ok_wait, msg = helper.exec_wait(SimpleNamespace(target="main", pattern="", condition="idle", timeout=5))
         self.assertTrue(ok_wait)
 
+    def test_snapshot_pane_feeds_idle_checks(self):
+        helper, _executor, tmux = self.make_helper()
+        tmux.run = MagicMock(return_value=ok("python\t123\nstep 1\n\nstep 2\n"))
+        snapshot = helper.snapshot_pane("local", "sess")
+        self.assertEqual(snapshot["current_command"], "python")
+        self.assertEqual(snapshot["pane_pid"], "123")
+        self.assertIn(";", tmux.run.call_args.args)
+        self.assertEqual(helper.get_pane_recent_output("local", "sess", lines=2, snapshot=snapshot), "step 1\nstep 2")
+        self.assertFalse(helper.is_pane_idle("local", "sess", snapshot=snapshot))
+
+        tmux.run = MagicMock(return_value=ok(""))
+        self.assertIsNone(helper.snapshot_pane("local", "sess"))
+        tmux.run = MagicMock(return_value=TmuxCmdResult(1, "", "no session"))
+        self.assertIsNone(helper.snapshot_pane("local", "sess"))
+
 
 class TmuxControlAndSessionTests(unittest.TestCase):
     def make_executor(self):
@@ -497,13 +558,83 @@ class TmuxControlAndSessionTests(unittest.TestCase):
         self.assertEqual(helper.cmd_tmux_close(["@missing"])[0], False)
 
         self.assertEqual(helper.cmd_tmux_config([]), (False, "Usage: tmux.config @host"))
-        with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.core.executor_tmux.load_config", return_value={"tmux": {"options": ["set -g mouse on"]}}), patch(
+        executor.config = {"tmux": {"options": ["set -g mouse on"]}}
+        with tempfile.TemporaryDirectory() as tmpdir, patch(
             "os.path.expanduser", return_value=str(Path(tmpdir) / ".tmux.conf")
         ):
             ok_cfg, msg = helper.cmd_tmux_config(["@local"])
         self.assertTrue(ok_cfg)
         self.assertIn("Applied tmux config to local", msg)
 
+    def test_tmux_config_renders_conf_once_per_run(self):
+        remote = SimpleNamespace(write_and_source=MagicMock(return_value=ok()))
+        executor = SimpleNamespace(
+            config={},
+            _resolve_host=lambda ref: ref[1:],
+            logger=None,
+            get_tmux_client=lambda host: remote,
+        )
+        helper = TmuxControlHelper(executor, SimpleNamespace)
+        with patch(
+            "trainsh.core.executor_tmux.get_default_config", return_value={"tmux": {"options": ["set -g mouse on"]}}
+        ) as mocked_defaults:
+            self.assertTrue(helper.cmd_tmux_config(["@gpu1"])[0])
+            self.assertTrue(helper.cmd_tmux_config(["@gpu2"])[0])
+        mocked_defaults.assert_called_once()
+        contents = [call.args[1] for call in remote.write_and_source.call_args_list]
+        self.assertEqual(contents[0], contents[1])
+        self.assertTrue(contents[0].endswith("set -g mouse on"))
+
+    def test_consecutive_remote_opens_share_one_round_trip(self):
+        def open_step(ref, name):
+            return RecipeStepModel(type=StepType.CONTROL, line_num=1, raw="", command="tmux.open", args=(ref, "as", name))
+
+        names = iter(f"train_demo_{i}" for i in range(10))
+        remote = SimpleNamespace(
+            ensure_session=MagicMock(return_value=ok()),
+            ensure_sessions=MagicMock(return_value=ok("train_demo_0\ntrain_demo_1\ntrain_demo_2\n")),
+            ensured_session_names=RemoteTmuxClient.ensured_session_names,
+            kill_sessions=MagicMock(return_value=ok()),
+            build_attach_command=MagicMock(return_value="attach"),
+        )
+        executor = SimpleNamespace(
+            recipe=RecipeModel(steps=[open_step("@gpu", "a"), open_step("@gpu", "b"), open_step("@gpu", "c"), open_step("@local", "d")]),
+            _current_step_num=lambda: 1,
+            _resolve_host=lambda ref: "local" if ref == "@local" else "gpu",
+            allocate_window_session_name=lambda: next(names),
+            logger=None,
+            ctx=SimpleNamespace(windows={}),
+            log=lambda msg: None,
+            _ensure_bridge_window=lambda window: None,
+            get_tmux_client=lambda host: remote,
+        )
+        helper = TmuxControlHelper(executor, SimpleNamespace)
+
+        self.assertTrue(helper.cmd_tmux_open(["@gpu", "as", "a"])[0])
+        remote.ensure_sessions.assert_called_once_with(["train_demo_0", "train_demo_1", "train_demo_2"])
+        executor._current_step_num = lambda: 2
+        self.assertTrue(helper.cmd_tmux_open(["@gpu", "as", "b"])[0])
+        self.assertEqual(remote.ensure_sessions.call_count, 1)
+        remote.ensure_session.assert_not_called()
+        self.assertEqual(executor.ctx.windows["b"].remote_session, "train_demo_1")
+
+        helper.discard_prepared_sessions()
+        remote.kill_sessions.assert_called_once_with(["train_demo_2"])
+
+        # A later session failing neither fails this step nor gets stashed.
+        remote.ensure_sessions.return_value = TmuxCmdResult(1, "train_demo_3\ntrain_demo_5\n", "boom")
+        executor._current_step_num = lambda: 1
+        self.assertTrue(helper.cmd_tmux_open(["@gpu", "as", "a"])[0])
+        self.assertEqual(helper._prepared_sessions["gpu"], ["train_demo_5"])
+
+        # The current session failing fails the step but keeps the created followers.
+        remote.ensure_sessions.return_value = TmuxCmdResult(1, "train_demo_7\n", "boom")
+        helper._prepared_sessions.clear()
+        ok_open, msg = helper.cmd_tmux_open(["@gpu", "as", "a"])
+        self.assertFalse(ok_open)
+        self.assertIn("boom", msg)
+        self.assertEqual(helper._prepared_sessions["gpu"], ["train_demo_7"])
+
     def test_tmux_session_and_convenience_functions(self):
         fake_tmux = FakeTmuxClient()
         def run_side_effect(*args, timeout=30):
@@ -1,8 +1,12 @@
 import subprocess
+import os
 import tempfile
+import threading
 import unittest
 import json
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from trainsh.core.execution_log import ExecutionLogReader, ExecutionLogger
@@ -47,6 +51,114 @@ class RuntimeDbHelpersTests(unittest.TestCase):
         self.assertEqual(to_jsonable(Stringy()), "stringy")
         self.assertEqual(json_dumps({"obj": CustomObject()}), '{"obj": {"path": "/tmp/demo.txt"}}')
 
+    def test_jsonl_line_encoding_with_and_without_orjson(self):
+        from trainsh.core import runtime_store
+
+        record = {"run_id": "r1", "text": "h\u00e9", "big": 2**70}
+        self.assertEqual(json.loads(runtime_store._encode_line(record)), record)
+        with patch.object(runtime_store, "orjson", None):
+            self.assertEqual(runtime_store._encode_line(record), json.dumps(record, ensure_ascii=False).encode("utf-8"))
+
+    def test_jsonl_decoding_reads_records_written_by_stdlib_json(self):
+        from trainsh.core import runtime_store
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = RuntimeStore(Path(tmpdir) / "runtime")
+            path = Path(tmpdir) / "old.jsonl"
+            lines = [
+                json.dumps({"run_id": "r1", "loss": float("nan"), "lr": float("inf")}),
+                json.dumps({"run_id": "r2", "big": 2**70}),
+                '{"run_id": "r3"}',
+            ]
+            path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            records = list(store._iter_jsonl(path))
+            self.assertEqual([record["run_id"] for record in records], ["r1", "r2", "r3"])
+            self.assertNotEqual(records[0]["loss"], records[0]["loss"])
+            self.assertEqual(records[0]["lr"], float("inf"))
+            self.assertEqual(records[1]["big"], 2**70)
+            with patch.object(runtime_store, "orjson", None):
+                self.assertEqual(runtime_store._decode_line(b'{"big": 12345678901234567890123}'), {"big": 12345678901234567890123})
+
+    def test_runs_index_folds_only_appended_records(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = RuntimeStore(Path(tmpdir) / "runtime")
+            store.append_run({"run_id": "a", "status": "running", "updated_at": "2026-01-01T00:00:00"})
+            self.assertEqual(store.get_run("a")["status"], "running")
+            self.assertTrue(store.runs_index_path.exists())
+
+            store.append_run({"run_id": "a", "status": "success", "updated_at": "2026-01-01T00:01:00"})
+            store.append_run({"run_id": "b", "status": "running", "updated_at": "2026-01-01T00:02:00"})
+            with patch("trainsh.core.runtime_store._decode_line", wraps=json.loads) as decode:
+                self.assertEqual([run["run_id"] for run in store.list_runs()], ["b", "a"])
+            self.assertEqual(decode.call_count, 2)
+            self.assertEqual(store.get_run("a")["status"], "success")
+
+            store.runs_path.write_text('{"run_id": "c"}\n', encoding="utf-8")
+            self.assertEqual([run["run_id"] for run in store.list_runs()], ["c"])
+            store.runs_index_path.write_text("not-json", encoding="utf-8")
+            self.assertEqual(store.get_run("c"), {"run_id": "c"})
+
+            # Rewritten in place to the same length, or longer: same inode, new bytes.
+            with store.runs_path.open("r+b") as handle:
+                handle.write(b'{"run_id": "d"}\n')
+            self.assertEqual([run["run_id"] for run in store.list_runs()], ["d"])
+            with store.runs_path.open("r+b") as handle:
+                handle.write(b'{"run_id": "e"}\n{"run_id": "f"}\n')
+            self.assertEqual(sorted(run["run_id"] for run in store.list_runs()), ["e", "f"])
+            # Rotated: a new file replaces runs.jsonl.
+            rotated = store.root / "runs.rotated"
+            rotated.write_text('{"run_id": "g"}\n{"run_id": "h"}\n', encoding="utf-8")
+            os.replace(rotated, store.runs_path)
+            self.assertEqual(sorted(run["run_id"] for run in store.list_runs()), ["g", "h"])
+
+    def test_runs_index_updates_are_serialized_across_stores(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            stores = [RuntimeStore(Path(tmpdir) / "runtime") for _ in range(2)]
+
+            def worker(index):
+                store = stores[index % 2]
+                for n in range(20):
+                    store.append_run({"run_id": f"r{index}-{n}", "status": "running"})
+                    store.list_runs()
+
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(len(stores[0].list_runs()), 80)
+            self.assertEqual(
+                sorted(path.name for path in stores[0].root.iterdir()), ["runs.index.json", "runs.jsonl"]
+            )
+
+    def test_append_events_vectored_and_partial_writes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = RuntimeStore(Path(tmpdir) / "runtime")
+            store.append_events([{"run_id": "a", "n": n} for n in range(1100)])
+            self.assertEqual([event["n"] for event in store.list_events("a")], list(range(1100)))
+
+            short_writev = lambda fd, buffers: os.write(fd, buffers[0][:3])
+            with patch("trainsh.core.runtime_store.os.writev", side_effect=short_writev, create=True):
+                store.append_events([{"run_id": "b", "n": 1}, {"run_id": "b", "n": 2}])
+            self.assertEqual([event["n"] for event in store.list_events("b")], [1, 2])
+
+            real_write = os.write
+            short_write = lambda fd, data: real_write(fd, bytes(data[:5]))
+            with patch("trainsh.core.runtime_store.os.writev", None, create=True), patch(
+                "trainsh.core.runtime_store.os.write", side_effect=short_write
+            ):
+                store.append_events([{"run_id": "c", "n": 1}, {"run_id": "c", "n": 2}])
+            self.assertEqual([event["n"] for event in store.list_events("c")], [1, 2])
+
+    def test_iter_events_reversed_reads_from_tail(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = RuntimeStore(Path(tmpdir) / "runtime")
+            self.assertEqual(list(store.iter_events_reversed("a")), [])
+            store.append_events([{"run_id": "a", "n": 1}, {"run_id": "ab", "n": 2}, {"run_id": "a", "n": 3}])
+            with store.events_path.open("ab") as handle:
+                handle.write(b'{"run_id": "a", "n"')
+            self.assertEqual([event["n"] for event in store.iter_events_reversed("a")], [3, 1])
+
     def test_replace_and_load_run_bindings(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             conn = connect_runtime_db(Path(tmpdir) / "runtime.db")
@@ -167,6 +279,7 @@ class JobStateManagerTests(unittest.TestCase):
             called = mocked_run.call_args.args[0]
             self.assertIn("-p", called)
             self.assertIn("22", called)
+            self.assertEqual(called[-2], "root@example")
 
             mocked_run.return_value = type("Result", (), {"stdout": "NOTFOUND\n"})()
             ok, message = check_remote_condition("root@example", "file:/tmp/ready")
@@ -223,7 +336,11 @@ class ExecutionLogTests(unittest.TestCase):
             logger = ExecutionLogger("run-1", "demo", str(db_path))
             logger.start("demo", {"MODEL": "tiny"}, {"gpu": "ssh://gpu"}, "/tmp/demo.pyrecipe")
             logger.step_start(1, "echo hi", "execute", {})
+            logger.log_detail("buffered", "pending until step end")
+            self.assertEqual(RuntimeStore(db_path).list_events("run-1"), [])
             logger.step_end(1, True, 5, "ok", "")
+            logger.wait_pending()
+            self.assertEqual(len(RuntimeStore(db_path).list_events("run-1")), 1)
             logger.log_detail("category", "message", {"ok": True})
             logger.log_ssh("gpu", "echo hi", 0, "out", "", 3)
             logger.log_tmux("open", "main", {"detached": True}, True, "opened")
@@ -233,6 +350,8 @@ class ExecutionLogTests(unittest.TestCase):
             logger.log_variable("MODEL", "tiny", "test")
             logger.step_output(1, "hello")
             logger.step_output(2, "x" * 60001)
+            logger.step_output(3, "hello\n", "stdout")
+            logger.step_output(3, "hello\n", "result")
             logger.end(True, 100, {"MODEL": "tiny"})
             logger._write("ignored", payload="ignored")
 
@@ -247,6 +366,7 @@ class ExecutionLogTests(unittest.TestCase):
 
             self.assertEqual(reader.get_step_output("run-1", 1), "hello")
             self.assertEqual(reader.get_step_output("run-1", 2), "x" * 60001)
+            self.assertEqual(reader.get_step_output("run-1", 3), "hello\n")
 
             summary = reader.get_execution_summary("run-1")
             self.assertEqual(summary["hosts"]["gpu"], "ssh://gpu")
@@ -276,6 +396,44 @@ class ExecutionLogTests(unittest.TestCase):
             self.assertEqual(summary["variables"], {"MODE": "prod"})
             reader.close()
 
+    def test_logger_timestamp_matches_isoformat(self):
+        logger = ExecutionLogger("job-ts", "recipe", str(Path(tempfile.gettempdir()) / "runtime-ts"))
+        before = datetime.now()
+        stamp = logger._timestamp()
+        after = datetime.now()
+        self.assertRegex(stamp, r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}$")
+        self.assertLessEqual(before.replace(microsecond=0), datetime.fromisoformat(stamp))
+        self.assertLessEqual(datetime.fromisoformat(stamp), after)
+        self.assertEqual(logger._ts_cache[1], stamp[:19])
+
+    def test_unused_logger_does_not_create_state_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / "state"
+            logger = ExecutionLogger("job-idle", "recipe", str(root))
+            logger.close()
+            self.assertFalse(root.exists())
+
+    def test_step_flushes_coalesce_while_writer_is_busy(self):
+        logger = ExecutionLogger("job-batch", "recipe")
+        started, release = threading.Event(), threading.Event()
+        batches = []
+
+        def append_events(records):
+            batches.append(list(records))
+            started.set()
+            release.wait(5)
+
+        logger.store = SimpleNamespace(append_events=append_events)
+        logger.log_detail("a", "first")
+        logger.step_end(1, True, 0)
+        self.assertTrue(started.wait(5))
+        for step in range(2, 6):
+            logger.log_detail("a", f"step {step}")
+            logger.step_end(step, True, 0)
+        release.set()
+        logger.close()
+        self.assertEqual([len(batch) for batch in batches], [1, 4])
+
     def test_logger_destructor_is_safe(self):
         logger = ExecutionLogger.__new__(ExecutionLogger)
         logger._closed = False
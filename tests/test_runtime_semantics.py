@@ -61,6 +61,11 @@ class FakeLocalTmux:
         self.new_sessions.append(name)
         return TmuxCmdResult(0, "", "")
 
+    def ensure_session(self, name: str) -> TmuxCmdResult:
+        if name in self.sessions:
+            return TmuxCmdResult(0, "", "")
+        return self.new_session(name)
+
     def send_keys(self, target: str, text: str, enter: bool = True, literal: bool = True) -> TmuxCmdResult:
         self.sent.append((target, text, enter, literal))
         if "python train.py" in text:
@@ -300,7 +305,7 @@ class SessionLifecycleTests(unittest.TestCase):
                 executor.wait_helper,
                 "is_pane_idle",
                 side_effect=[True, True, True],
-            ), patch("trainsh.core.executor_wait.time.sleep", side_effect=lambda *_args, **_kwargs: None):
+            ), patch.object(executor.wait_helper, "_pause", return_value=False):
                 ok = executor.execute()
 
         self.assertTrue(ok)
@@ -27,6 +27,13 @@ class StorageResolutionTests(unittest.TestCase):
     def test_legacy_s3_inline_spec_is_no_longer_supported(self):
         self.assertIsNone(build_storage_from_spec("s3:old-bucket"))
 
+    def test_inline_spec_remainder_maps_to_provider_config_key(self):
+        self.assertEqual(build_storage_from_spec("b2:/logs/").config, {"bucket": "logs"})
+        self.assertEqual(build_storage_from_spec("drive:team").config, {"remote_name": "team"})
+        self.assertEqual(build_storage_from_spec("file:/data/").config, {"path": "/data/"})
+        self.assertEqual(build_storage_from_spec("sftp:box").config, {"host": "box"})
+        self.assertEqual(build_storage_from_spec("gcs:").config, {})
+
     def test_executor_transfer_rejects_inline_s3_endpoint(self):
         with isolated_executor(RecipeModel(name="reject-inline-s3")) as (executor, _config_dir):
             ok, message = executor.transfer_helper.transfer("./local", "@s3:logs-bucket:/checkpoints")
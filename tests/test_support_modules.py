@@ -280,17 +280,15 @@ class ProviderDispatchAndConditionsTests(unittest.TestCase):
 class TmuxAndRemoteTests(unittest.TestCase):
     def test_tmux_control_and_remote_tmux_paths(self):
         local_tmux = SimpleNamespace(
-            has_session=MagicMock(return_value=True),
-            new_session=MagicMock(return_value=TmuxCmdResult(1, "", "fail")),
+            ensure_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             kill_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
             run=MagicMock(return_value=TmuxCmdResult(0, "", "")),
         )
         remote_tmux = SimpleNamespace(
-            has_session=MagicMock(return_value=False),
-            new_session=MagicMock(return_value=TmuxCmdResult(1, "", "fail")),
+            ensure_session=MagicMock(return_value=TmuxCmdResult(1, "", "fail")),
             build_attach_command=MagicMock(return_value="attach"),
             kill_session=MagicMock(return_value=TmuxCmdResult(0, "", "")),
-            write_text=MagicMock(return_value=TmuxCmdResult(1, "", "write fail")),
+            write_and_source=MagicMock(return_value=TmuxCmdResult(97, "", "write fail")),
             run=MagicMock(return_value=TmuxCmdResult(1, "", "source fail")),
             list_sessions=MagicMock(return_value=[]),
         )
@@ -310,20 +308,20 @@ class TmuxAndRemoteTests(unittest.TestCase):
         ok, msg = helper.cmd_tmux_open(["@local", "as", "main"])
         self.assertTrue(ok)
         self.assertIn("Created local tmux session", msg)
-        local_tmux.has_session.return_value = False
+        local_tmux.ensure_session.return_value = TmuxCmdResult(1, "", "fail")
         ok, msg = helper.cmd_tmux_open(["@local", "as", "main2"])
         self.assertFalse(ok)
         self.assertIn("Failed to create local tmux session", msg)
-        local_tmux.has_session.side_effect = RuntimeError("boom")
+        local_tmux.ensure_session.side_effect = RuntimeError("boom")
         ok, msg = helper.cmd_tmux_open(["@local", "as", "main3"])
         self.assertFalse(ok)
         self.assertIn("boom", msg)
-        local_tmux.has_session.side_effect = None
+        local_tmux.ensure_session.side_effect = None
 
         ok, msg = helper.cmd_tmux_open(["@gpu", "as", "remote"])
         self.assertFalse(ok)
         self.assertIn("Failed to create remote tmux session", msg)
-        remote_tmux.new_session.return_value = TmuxCmdResult(0, "", "")
+        remote_tmux.ensure_session.return_value = TmuxCmdResult(0, "", "")
         ok, msg = helper.cmd_tmux_open(["@gpu", "as", "remote2"])
         self.assertTrue(ok)
 
@@ -345,24 +343,29 @@ class TmuxAndRemoteTests(unittest.TestCase):
         remote_tmux.kill_session.side_effect = None
 
         self.assertEqual(helper.cmd_tmux_config([])[0], False)
+        executor.config = {"tmux": {"options": []}}
         with tempfile.TemporaryDirectory() as tmpdir:
             tmux_conf = Path(tmpdir) / ".tmux.conf"
-            with patch("trainsh.core.executor_tmux.load_config", return_value={"tmux": {"options": []}}), patch(
+            with patch(
                 "trainsh.core.executor_tmux.get_default_config", return_value={"tmux": {"options": ["set -g mouse on"]}}
             ), patch("os.path.expanduser", return_value=str(tmux_conf)):
                 ok, msg = helper.cmd_tmux_config(["@local"])
             self.assertTrue(ok)
             self.assertTrue(tmux_conf.exists())
 
-        with patch("trainsh.core.executor_tmux.load_config", return_value={"tmux": {"options": []}}), patch(
+        with patch(
             "trainsh.core.executor_tmux.get_default_config", return_value={"tmux": {"options": ["set -g mouse on"]}}
         ):
             ok, msg = helper.cmd_tmux_config(["@gpu"])
         self.assertFalse(ok)
         self.assertIn("Failed to write ~/.tmux.conf", msg)
-        remote_tmux.write_text.return_value = TmuxCmdResult(0, "", "")
+        remote_tmux.write_and_source.return_value = TmuxCmdResult(0, "", "")
         ok, msg = helper.cmd_tmux_config(["@gpu"])
         self.assertTrue(ok)
+        remote_tmux.write_and_source.return_value = TmuxCmdResult(0, "__trainsh_no_tmux_server__\n", "")
+        ok, msg = helper.cmd_tmux_config(["@gpu"])
+        self.assertTrue(ok)
+        self.assertIn("no active tmux server", msg)
 
         client = RemoteTmuxClient("gpu", lambda host, command=None, tty=False, set_term=False: ["ssh", host, command or ""])
         with patch("trainsh.core.remote_tmux.subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok\n", stderr="")):
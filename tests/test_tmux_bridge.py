@@ -101,6 +101,8 @@ class TmuxClientFactoryTests(unittest.TestCase):
         self.assertIs(local_client, executor.local_tmux)
         self.assertIsInstance(remote_a, RemoteTmuxClient)
         self.assertIs(remote_a, remote_b)
+        self.assertIs(executor.get_tmux_client(" user@host -p 22\n"), remote_a)
+        self.assertEqual(remote_a.host, "user@host -p 22")
 
 
 if __name__ == "__main__":
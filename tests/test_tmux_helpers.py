@@ -1,5 +1,11 @@
+import os
+import shutil
+import socket
 import subprocess
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -8,8 +14,13 @@ from trainsh.core.executor_utils import (
     _format_duration,
     _host_from_ssh_spec,
     _infer_window_hosts_from_recipe,
+    _lookup_vast_host,
+    _open_ssh_master,
+    _probe_in_order,
     _resolve_vast_host,
     _split_ssh_spec,
+    _ssh_banner_reachable,
+    _ssh_control_args,
     _test_ssh_connection,
 )
 from trainsh.core.local_tmux import LocalTmuxClient, TmuxCmdResult
@@ -76,6 +87,22 @@ class LocalTmuxClientTests(unittest.TestCase):
             with patch.object(client, "run", return_value=TmuxCmdResult(1, "", "bad")):
                 self.assertEqual(client.send_keys("%1", "echo hi").returncode, 1)
 
+    def test_ensure_session_uses_one_call_and_accepts_duplicates(self):
+        with patch("shutil.which", return_value="/usr/bin/tmux"):
+            client = LocalTmuxClient()
+        with patch.object(client, "run", return_value=TmuxCmdResult(1, "", "duplicate session: demo")) as mocked:
+            self.assertEqual(client.ensure_session("demo").returncode, 0)
+        mocked.assert_called_once_with("new-session", "-d", "-s", "demo")
+        with patch.object(client, "run", return_value=TmuxCmdResult(1, "", "no server")):
+            self.assertEqual(client.ensure_session("demo").returncode, 1)
+
+    def test_pane_title_and_layout_share_one_call(self):
+        with patch("shutil.which", return_value="/usr/bin/tmux"):
+            client = LocalTmuxClient()
+        with patch.object(client, "run", return_value=TmuxCmdResult(0, "", "")) as mocked:
+            client.set_pane_title_and_layout("%1", "train:main", "sess:win", "tiled")
+        mocked.assert_called_once_with("select-pane", "-t", "%1", "-T", "train:main", ";", "select-layout", "-t", "sess:win", "tiled")
+
 
 class RemoteTmuxClientTests(unittest.TestCase):
     def test_remote_tmux_builders_and_wrappers(self):
@@ -118,21 +145,83 @@ class RemoteTmuxClientTests(unittest.TestCase):
             client.write_text("~", "hello")
         self.assertEqual(mocked.call_count, 2)
 
+    def test_large_stderr_keeps_only_the_tail(self):
+        client = RemoteTmuxClient("gpu", lambda host, command=None, tty=False, set_term=False: ["ssh", host, command or ""])
+        noisy = "warning\n" * 2000 + "no server running"
+        with patch("subprocess.run", return_value=SimpleNamespace(returncode=1, stdout="out" * 5000, stderr=noisy)):
+            result = client.run("list-sessions")
+        self.assertEqual(len(result.stdout), 15000)
+        self.assertTrue(result.stderr.endswith("no server running"))
+        self.assertLess(len(result.stderr), len(noisy))
+
+    def test_ensure_session_is_one_ssh_round_trip(self):
+        client = RemoteTmuxClient("gpu", lambda host, command=None, tty=False, set_term=False: ["ssh", host, command or ""])
+        with patch.object(client, "_run_shell", return_value=TmuxCmdResult(0, "", "")) as mocked:
+            self.assertEqual(client.ensure_session("demo 1").returncode, 0)
+        mocked.assert_called_once_with(
+            "tmux has-session -t 'demo 1' 2>/dev/null || tmux new-session -d -s 'demo 1'"
+        )
+
+    def test_batched_session_commands_use_one_ssh_call(self):
+        client = RemoteTmuxClient("gpu", lambda host, command=None, tty=False, set_term=False: ["ssh", host, command or ""])
+        with patch.object(client, "_run_shell", return_value=TmuxCmdResult(0, "", "")) as mocked:
+            client.ensure_sessions(["a", "b"])
+            client.kill_sessions(["a", "b"])
+        self.assertEqual(
+            mocked.call_args_list[0].args[0],
+            "{ tmux has-session -t a 2>/dev/null || tmux new-session -d -s a; } && printf '%s\\n' a; "
+            "{ tmux has-session -t b 2>/dev/null || tmux new-session -d -s b; } && printf '%s\\n' b",
+        )
+        self.assertEqual(client.ensured_session_names(TmuxCmdResult(1, "b\n", "boom"), ["a", "b"]), ["b"])
+        self.assertEqual(client.ensured_session_names(TmuxCmdResult(1, "", "boom"), ["a"]), [])
+        self.assertEqual(
+            mocked.call_args_list[1].args[0],
+            "tmux kill-session -t a 2>/dev/null; tmux kill-session -t b 2>/dev/null; true",
+        )
+
 
 class ExecutorUtilsTests(unittest.TestCase):
     def test_ssh_spec_split_build_and_host_parsing(self):
         host, options = _split_ssh_spec("root@example -p 2200 -J jump")
         self.assertEqual(host, "root@example")
         self.assertIn("-p", options)
+        options.append("-v")
+        self.assertEqual(_split_ssh_spec("root@example -p 2200 -J jump")[1], ["-p", "2200", "-J", "jump"])
+        self.assertEqual(
+            _split_ssh_spec("root@example -o 'ProxyCommand=ssh -W %h:%p jump'"),
+            ("root@example", ["-o", "ProxyCommand=ssh -W %h:%p jump"]),
+        )
         args = _build_ssh_args("root@example -p 2200", command="echo hi", tty=True, set_term=True)
         self.assertIn("-t", args)
         self.assertIn("TERM=xterm-256color", args[-1])
+        self.assertFalse(any(arg.startswith("ControlMaster") for arg in args))
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.core.executor_utils.SSH_CONTROL_DIR", Path(tmpdir)):
+            args = _build_ssh_args("root@example -p 2200", command="echo hi")
+            self.assertIn("ControlMaster=auto", args)
+            self.assertIn(f"ControlPath={tmpdir}/%C", args)
+            self.assertEqual(args[-2:], ["root@example", "echo hi"])
+            args = _build_ssh_args("root@example -o ControlPath=none", command="echo hi")
+            self.assertNotIn("ControlMaster=auto", args)
+        control_dir = Path(tempfile.mkdtemp()) / "ssh"
+        self.addCleanup(shutil.rmtree, control_dir.parent, True)
+        with patch("trainsh.core.executor_utils.SSH_CONTROL_DIR", control_dir), patch(
+            "trainsh.core.executor_utils.os.makedirs", wraps=os.makedirs
+        ) as mocked_makedirs:
+            self.assertTrue(_ssh_control_args([]))
+            self.assertTrue(_ssh_control_args([]))
+        mocked_makedirs.assert_called_once_with(str(control_dir), mode=0o700, exist_ok=True)
+        self.assertTrue(control_dir.is_dir())
+        with patch("trainsh.core.executor_utils.SSH_CONTROL_DIR", Path("/" + "x" * 120)):
+            self.assertEqual(_ssh_control_args([]), [])
 
         parsed = _host_from_ssh_spec("root@example -p 2200 -i ~/.ssh/id_rsa -J jump -o ProxyCommand=proxy")
         self.assertEqual(parsed.hostname, "example")
         self.assertEqual(parsed.port, 2200)
         self.assertEqual(parsed.jump_host, "jump")
         self.assertEqual(parsed.env_vars["proxy_command"], "proxy")
+        flagged = _host_from_ssh_spec("root@example -v -p bad -A -L 8080:localhost:80 -i key")
+        self.assertEqual((flagged.port, flagged.ssh_key_path, flagged.env_vars), (22, "key", {}))
 
         configured = Host(
             name="gpu-box",
@@ -157,8 +246,13 @@ class ExecutorUtilsTests(unittest.TestCase):
         ):
             alias_args = _build_ssh_args("gpu-box", command="echo hi", tty=True, set_term=True)
             alias_host = _host_from_ssh_spec("gpu-box")
+            with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.core.executor_utils.SSH_CONTROL_DIR", Path(tmpdir)):
+                batch_args = _build_ssh_args("gpu-box", command="echo hi")
         self.assertEqual(alias_args[:2], ["ssh", "-t"])
         self.assertIn("TERM=xterm-256color", alias_args[-1])
+        self.assertFalse(any(arg.startswith("ControlMaster") for arg in alias_args))
+        self.assertEqual(batch_args[:3], ["ssh", "-o", "ControlMaster=auto"])
+        self.assertEqual(batch_args[-2:], ["root@gpu.example.com", "echo hi"])
         self.assertEqual(alias_host.hostname, "gpu.example.com")
         self.assertEqual(alias_host.port, 2200)
 
@@ -175,9 +269,26 @@ class ExecutorUtilsTests(unittest.TestCase):
             ],
         )
         self.assertEqual(_infer_window_hosts_from_recipe(recipe, 1), {"main": "root@example"})
+        self.assertEqual(_infer_window_hosts_from_recipe(recipe, -1), {})
+        recipe.steps.append(
+            RecipeStepModel(type=StepType.CONTROL, line_num=0, raw="tmux.open local as aux", command="tmux.open", args=["local", "as", "aux"])
+        )
+        self.assertEqual(_infer_window_hosts_from_recipe(recipe, 1), {"main": "root@example"})
+        self.assertEqual(_infer_window_hosts_from_recipe(recipe, 2), {"main": "root@example", "aux": "local"})
+        # Replacing a step in place is picked up on the next lookup.
+        recipe.steps[1] = RecipeStepModel(
+            type=StepType.CONTROL, line_num=0, raw="tmux.open @gpu as side", command="tmux.open", args=["@gpu", "as", "side"]
+        )
+        self.assertEqual(_infer_window_hosts_from_recipe(recipe, 1), {"main": "root@example", "side": "root@example"})
 
-        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok\n", stderr="")):
+        with patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout="ok\n", stderr="")) as mocked_run, patch(
+            "trainsh.core.executor_utils._ssh_control_args", return_value=["-o", "ControlMaster=auto"]
+        ):
             self.assertTrue(_test_ssh_connection("host", 22))
+            self.assertTrue(_test_ssh_connection("host", 2222, username="ubuntu"))
+        self.assertEqual(mocked_run.call_args_list[0].args[0][1:3], ["-o", "ControlMaster=auto"])
+        self.assertIn("root@host", mocked_run.call_args_list[0].args[0])
+        self.assertIn("ubuntu@host", mocked_run.call_args_list[1].args[0])
         with patch("subprocess.run", side_effect=RuntimeError("boom")):
             self.assertFalse(_test_ssh_connection("host", 22))
 
@@ -188,27 +299,85 @@ class ExecutorUtilsTests(unittest.TestCase):
             ssh_host="proxy",
             ssh_port=2222,
         )
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: instance)), patch(
-            "trainsh.core.executor_utils._test_ssh_connection", side_effect=[True]
-        ):
-            resolved = _resolve_vast_host("7")
+        client = SimpleNamespace(get_instance=lambda instance_id: instance)
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
+            "trainsh.core.executor_utils._ssh_banner_reachable", side_effect=lambda host, port: True
+        ), patch("trainsh.core.executor_utils._test_ssh_connection", return_value=True) as confirm:
+            resolved, verified = _lookup_vast_host("7")
             self.assertIn("1.2.3.4", resolved)
             self.assertIn("-p 2201", resolved)
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: instance)), patch(
-            "trainsh.core.executor_utils._test_ssh_connection", side_effect=[False, True]
-        ):
-            resolved = _resolve_vast_host("7")
+            self.assertTrue(verified)
+            confirm.assert_called_once_with("1.2.3.4", 2201, username="root")
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
+            "trainsh.core.executor_utils._ssh_banner_reachable", side_effect=lambda host, port: host == "proxy"
+        ), patch("trainsh.core.executor_utils._test_ssh_connection", return_value=False):
+            # A banner alone is not proof the instance behind the proxy accepts auth.
+            resolved, verified = _lookup_vast_host("7")
             self.assertIn("proxy", resolved)
             self.assertIn("-p 2222", resolved)
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=SimpleNamespace(get_instance=lambda instance_id: instance)), patch(
-            "trainsh.core.executor_utils._test_ssh_connection", side_effect=[False, False]
-        ):
+            self.assertFalse(verified)
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=client), patch(
+            "trainsh.core.executor_utils._ssh_banner_reachable", return_value=False
+        ), patch("trainsh.core.executor_utils._test_ssh_connection") as confirm:
             resolved = _resolve_vast_host("7")
             self.assertIn("1.2.3.4", resolved)
             self.assertIn("-p 2201", resolved)
+            confirm.assert_not_called()
         with patch("trainsh.services.vast_api.get_vast_client", side_effect=RuntimeError("boom")):
             self.assertEqual(_resolve_vast_host("7"), "vast-7")
 
+    def test_ssh_banner_probe_checks_greeting(self):
+        def serve(greeting):
+            server = socket.create_server(("127.0.0.1", 0))
+
+            def accept():
+                conn, _ = server.accept()
+                with conn:
+                    conn.sendall(greeting)
+                server.close()
+
+            threading.Thread(target=accept, daemon=True).start()
+            return server.getsockname()[1]
+
+        self.assertTrue(_ssh_banner_reachable("127.0.0.1", serve(b"SSH-2.0-OpenSSH\r\n")))
+        self.assertFalse(_ssh_banner_reachable("127.0.0.1", serve(b"HTTP/1.1 400\r\n")))
+        with patch("socket.create_connection", side_effect=ConnectionRefusedError()):
+            self.assertFalse(_ssh_banner_reachable("127.0.0.1", 22))
+
+    def test_probe_in_order_does_not_wait_for_slower_probes(self):
+        release = threading.Event()
+        daemons = []
+
+        def probe(item):
+            daemons.append(threading.current_thread().daemon)
+            if item == "slow":
+                release.wait(5)
+            return item != "down"
+
+        results = _probe_in_order(probe, ["fast", "slow"])
+        self.assertTrue(next(results))
+        self.assertFalse(release.is_set())
+        release.set()
+        self.assertEqual(list(results), [True])
+        self.assertEqual(daemons, [True, True])
+        self.assertEqual(list(_probe_in_order(probe, ["down", "fast"])), [False, True])
+        self.assertEqual(list(_probe_in_order(probe, ["down"])), [False])
+
+    def test_open_ssh_master_runs_batch_mode_and_needs_control_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.core.executor_utils.SSH_CONTROL_DIR", Path(tmpdir)), patch(
+            "trainsh.core.executor_utils.subprocess.run", return_value=SimpleNamespace(returncode=0)
+        ) as mocked_run:
+            self.assertTrue(_open_ssh_master("root@example -p 2200"))
+        args = mocked_run.call_args.args[0]
+        self.assertEqual(args[:5], ["ssh", "-o", "BatchMode=yes", "-o", "ConnectTimeout=10"])
+        self.assertIn("ControlMaster=auto", args)
+        self.assertIn("ControlPersist=60s", args)
+        self.assertEqual(args[-2:], ["root@example", "true"])
+
+        with patch("trainsh.core.executor_utils.subprocess.run") as mocked_run:
+            self.assertFalse(_open_ssh_master("root@example -o ControlPath=none"))
+        mocked_run.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
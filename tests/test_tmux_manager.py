@@ -13,6 +13,7 @@ class FakeLocalTmux:
         self.pane_titles = {}
         self.split_result = ("%1", 0)
         self.killed = []
+        self.layouts = []
 
     def display_message(self, target, fmt):
         if fmt == "#{session_name}:#{window_name}":
@@ -33,6 +34,8 @@ class FakeLocalTmux:
         return list(self.window_names)
 
     def list_panes(self, target, fmt="#{pane_id}"):
+        if "#{pane_title}" in fmt:
+            return [f"{pane}\t{self.pane_titles.get(pane, '')}".strip() for pane in self.panes]
         return list(self.panes)
 
     def split_window(self, target, command, horizontal=True):
@@ -46,6 +49,10 @@ class FakeLocalTmux:
     def select_layout(self, target, layout):
         return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
 
+    def set_pane_title_and_layout(self, pane_id, title, target, layout):
+        self.layouts.append((target, layout))
+        return self.set_pane_title(pane_id, title)
+
     def kill_pane(self, pane_id):
         self.killed.append(pane_id)
         return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
@@ -68,6 +75,8 @@ class TmuxBridgeManagerTests(unittest.TestCase):
             self.assertIn("created", msg)
             pane_id = bridge.get_pane("main")
             self.assertEqual(pane_id, "%1")
+            self.assertEqual(fake.pane_titles["%1"], "train:main")
+            self.assertEqual(fake.layouts, [("sess:win", "tiled")])
 
             ok, msg = bridge.connect("main", "attach-cmd")
             self.assertTrue(ok)
@@ -1,4 +1,5 @@
 import tempfile
+import threading
 import unittest
 import subprocess
 import os
@@ -522,6 +523,8 @@ class SftpBrowserAndTransferHelperTests(unittest.TestCase):
             recipe=SimpleNamespace(hosts={"gpu": "ssh://gpu", "cloud": "vast:123"}, storages={"artifacts": "r2:bucket", "direct": {"type": "local", "config": {"path": "/tmp/out"}}}),
             _interpolate=lambda value: value.replace("$RUN", "demo"),
             logger=MagicMock(),
+            global_hosts={"shared": self._host()},
+            global_storages={"global": self._storage(name="global", type_=StorageType.S3)},
         )
         helper = TransferHelper(executor, resolve_vast_host=lambda inst: f"root@vast-{inst}", host_from_ssh_spec=lambda spec: Host(name=spec, type=HostType.SSH, hostname=spec))
 
@@ -541,10 +544,13 @@ class SftpBrowserAndTransferHelperTests(unittest.TestCase):
         self.assertIn("Unsupported transfer operation", msg)
 
         fake_result = SimpleNamespace(success=True, message="ok", bytes_transferred=42)
-        with patch("trainsh.services.transfer_engine.TransferEngine", return_value=MagicMock(transfer=MagicMock(return_value=fake_result))):
+        with patch("trainsh.services.transfer_engine.TransferEngine", return_value=MagicMock(transfer=MagicMock(return_value=fake_result))), patch(
+            "trainsh.core.executor_transfer.time.monotonic_ns", side_effect=[1_000_000, 3_500_000]
+        ):
             ok, msg = helper.transfer("./src", "./dst", operation="sync")
         self.assertTrue(ok)
         self.assertIn("42 bytes", msg)
+        self.assertEqual(executor.logger.log_transfer.call_args.args[4], 2)
 
         fake_result = SimpleNamespace(success=False, message="boom", bytes_transferred=0)
         with patch("trainsh.services.transfer_engine.TransferEngine", return_value=MagicMock(transfer=MagicMock(return_value=fake_result))):
@@ -552,29 +558,89 @@ class SftpBrowserAndTransferHelperTests(unittest.TestCase):
         self.assertFalse(ok)
         self.assertEqual(msg, "boom")
 
-        with patch("trainsh.commands.host.load_hosts", return_value={"shared": self._host()}):
-            endpoint = helper.parse_endpoint("@artifacts:/logs")
-            self.assertEqual(endpoint.type, "storage")
-            endpoint = helper.parse_endpoint("@gpu:/logs")
-            self.assertEqual(endpoint.type, "host")
-            endpoint = helper.parse_endpoint("@shared:/logs")
-            self.assertEqual(endpoint.host_id, "shared")
-            endpoint = helper.parse_endpoint("host:gpu:/logs")
-            self.assertEqual(endpoint.host_id, "gpu")
-            endpoint = helper.parse_endpoint("storage:artifacts:/logs")
-            self.assertEqual(endpoint.storage_id, "artifacts")
-            endpoint = helper.parse_endpoint("~/logs")
-            self.assertEqual(endpoint.type, "local")
-
-        with patch("trainsh.commands.host.load_hosts", return_value={"shared": self._host()}):
-            hosts = helper.build_transfer_hosts()
-            self.assertIn("gpu", hosts)
-            self.assertIn("vast:123", hosts)
-
-        with patch("trainsh.commands.storage.load_storages", return_value={"global": self._storage(name="global", type_=StorageType.S3)}):
-            storages = helper.build_transfer_storages()
-            self.assertIn("artifacts", storages)
-            self.assertIn("direct", storages)
+        endpoint = helper.parse_endpoint("@artifacts:/logs")
+        self.assertEqual(endpoint.type, "storage")
+        endpoint = helper.parse_endpoint("@gpu:/logs")
+        self.assertEqual(endpoint.type, "host")
+        endpoint = helper.parse_endpoint("@shared:/logs")
+        self.assertEqual(endpoint.host_id, "shared")
+        endpoint = helper.parse_endpoint("host:gpu:/logs")
+        self.assertEqual(endpoint.host_id, "gpu")
+        endpoint = helper.parse_endpoint("storage:artifacts:/logs")
+        self.assertEqual(endpoint.storage_id, "artifacts")
+        endpoint = helper.parse_endpoint("~/logs")
+        self.assertEqual(endpoint.type, "local")
+        with patch("os.path.expanduser", side_effect=AssertionError("no ~ to expand")):
+            self.assertEqual(helper.parse_endpoint("/data/run:1").path, "/data/run:1")
+            self.assertEqual(helper.parse_endpoint("out").type, "local")
+            self.assertEqual(helper.parse_endpoint("weird:name").type, "local")
+
+        hosts = helper.build_transfer_hosts()
+        self.assertIn("gpu", hosts)
+        self.assertIn("vast:123", hosts)
+        self.assertIn("shared", hosts)
+
+        storages = helper.build_transfer_storages()
+        self.assertIn("artifacts", storages)
+        self.assertIn("direct", storages)
+        self.assertIn("global", storages)
+
+    def test_transfer_hosts_resolve_cloud_instances_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def resolve(instance_id):
+            barrier.wait()
+            return f"root@vast-{instance_id}"
+
+        executor = SimpleNamespace(
+            recipe=SimpleNamespace(hosts={"a": "vast:1", "b": "vast:2", "c": "vast:1"}, storages={}),
+            global_hosts={},
+        )
+        helper = TransferHelper(executor, resolve_vast_host=resolve, host_from_ssh_spec=lambda spec: Host(name=spec, type=HostType.SSH, hostname=spec))
+        hosts = helper.build_transfer_hosts()
+        self.assertEqual(hosts["a"].hostname, "root@vast-1")
+        self.assertEqual(hosts["b"].hostname, "root@vast-2")
+        self.assertEqual(hosts["c"].hostname, "root@vast-1")
+
+    def test_transfer_hosts_are_not_memoized_with_unverified_cloud_hosts(self):
+        verified = set()
+        resolve = MagicMock(side_effect=lambda instance_id: f"root@vast-{instance_id}")
+        executor = SimpleNamespace(
+            recipe=SimpleNamespace(hosts={"gpu": "vast:1"}, storages={}),
+            global_hosts={},
+            _host_resolution_verified=lambda spec: spec in verified,
+        )
+        helper = TransferHelper(executor, resolve_vast_host=resolve, host_from_ssh_spec=lambda spec: Host(name=spec, type=HostType.SSH, hostname=spec))
+        helper.build_transfer_hosts()
+        helper.build_transfer_hosts()
+        self.assertEqual(resolve.call_count, 2)
+        verified.add("vast:1")
+        helper.build_transfer_hosts()
+        helper.build_transfer_hosts()
+        self.assertEqual(resolve.call_count, 3)
+
+    def test_transfer_storages_see_nested_spec_edits(self):
+        spec = {"type": "r2", "config": {"bucket": "first"}}
+        executor = SimpleNamespace(recipe=SimpleNamespace(hosts={}, storages={"out": spec}), global_storages={})
+        helper = TransferHelper(executor, resolve_vast_host=lambda _id: "", host_from_ssh_spec=lambda spec: Host(name=spec, type=HostType.SSH, hostname=spec))
+        self.assertEqual(helper.build_transfer_storages()["out"].type.value, "r2")
+        spec["type"] = "b2"
+        self.assertEqual(helper.build_transfer_storages()["out"].type.value, "b2")
+
+    def test_transfer_hosts_prefer_recipe_names_over_spec_aliases(self):
+        shared = Host(name="shared", type=HostType.SSH, hostname="global.example.com")
+        executor = SimpleNamespace(
+            recipe=SimpleNamespace(hosts={"gpu": "box", "box": "root@other"}, storages={}),
+            global_hosts={"shared": shared},
+        )
+        helper = TransferHelper(executor, resolve_vast_host=lambda _id: "", host_from_ssh_spec=lambda spec: Host(name=spec, type=HostType.SSH, hostname=spec))
+        hosts = helper.build_transfer_hosts()
+        self.assertEqual(hosts["box"].hostname, "root@other")
+        self.assertEqual(hosts["root@other"].hostname, "root@other")
+        self.assertIs(hosts["shared"], shared)
+        hosts["extra"] = shared
+        self.assertNotIn("extra", helper.build_transfer_hosts())
+        self.assertNotIn("extra", executor.global_hosts)
 
     def _host(self):
         return Host(name="shared", type=HostType.SSH, hostname="shared.example.com")
@@ -1,6 +1,7 @@
 import io
 import subprocess
 import tempfile
+import time
 import unittest
 from contextlib import redirect_stdout
 from datetime import datetime, timedelta
@@ -28,6 +29,24 @@ def capture_output(fn, *args, **kwargs):
 
 
 class VastApiClientTests(unittest.TestCase):
+    def test_instance_reads_are_cached_until_ttl_or_write(self):
+        client = VastAPIClient("token")
+        response = MagicMock()
+        response.read.return_value = b'{"instances": {"id": 5, "actual_status": "running"}}'
+        response.__enter__.return_value = response
+        with patch("trainsh.services.vast_api.urlopen", return_value=response) as mocked_urlopen:
+            client.get_instance(5)
+            client.get_instance(5)
+            self.assertEqual(mocked_urlopen.call_count, 1)
+
+            client.stop_instance(5)
+            client.get_instance(5)
+            self.assertEqual(mocked_urlopen.call_count, 3)
+
+            with patch("trainsh.services.vast_api.time.monotonic", return_value=time.monotonic() + client.READ_CACHE_TTL + 1):
+                client.get_instance(5)
+            self.assertEqual(mocked_urlopen.call_count, 4)
+
     def test_request_and_parse_helpers(self):
         client = VastAPIClient("token")
 
@@ -54,6 +73,18 @@ class VastApiClientTests(unittest.TestCase):
         self.assertEqual(instances[0].id, 1)
         self.assertTrue(instances[0].is_running)
 
+        rows = [
+            {"id": 1, "gpu_name": "A100", "num_gpus": 2, "gpu_ram": 81920, "dph_total": 1.5},
+            {"id": 2, "gpu_name": "T4", "num_gpus": 2, "gpu_ram": 16384, "dph_total": 0.2},
+            {"id": 3, "gpu_name": "A100", "num_gpus": 1, "gpu_ram": 40960, "dph_total": 0.9},
+        ]
+        filtered = VastAPIClient("token")
+        with patch.object(filtered, "_request", return_value={"instances": rows}) as mocked:
+            self.assertEqual([i.id for i in filtered.list_instances(gpu_name="a100")], [1, 3])
+            self.assertEqual([i.id for i in filtered.list_instances(num_gpus=2, max_dph=1.0)], [2])
+            self.assertEqual([i.id for i in filtered.list_instances(min_gpu_ram=40)], [1, 3])
+        mocked.assert_called_once_with("instances")
+
         with patch.object(client, "_request", return_value={"instances": {"id": 2, "ssh_host": "h", "ssh_port": 22}}):
             inst = client.get_instance(2)
         self.assertEqual(client.get_ssh_command(inst), "ssh -p 22 root@h")
@@ -384,6 +415,7 @@ class VastControlHelperTests(unittest.TestCase):
         picker_client = SimpleNamespace(
             list_instances=lambda: [VastInstance(id=8, actual_status="running", gpu_name="A100", num_gpus=1, dph_total=0.5)],
         )
+        helper._client = None
         with patch("trainsh.services.vast_api.get_vast_client", return_value=picker_client), patch(
             "trainsh.utils.vast_formatter.get_currency_settings",
             return_value=SimpleNamespace(display_currency="USD", rates=SimpleNamespace(convert=lambda amount, _from, _to: amount)),
@@ -409,10 +441,9 @@ class VastControlHelperTests(unittest.TestCase):
             list_ssh_keys=lambda: [],
             add_ssh_key=lambda content, label="tmux-trainsh": None,
         )
-        with patch("trainsh.services.vast_api.get_vast_client", return_value=waiter_client), patch(
-            "trainsh.config.load_config",
-            return_value={"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}},
-        ), patch.object(helper, "verify_ssh_connection", return_value=True), patch("subprocess.run", return_value=SimpleNamespace(returncode=0)):
+        helper.executor.config = {"vast": {"auto_attach_ssh_key": False}, "defaults": {"ssh_key_path": "~/.ssh/id_rsa"}}
+        helper._client = None
+        with patch("trainsh.services.vast_api.get_vast_client", return_value=waiter_client), patch.object(helper, "verify_ssh_connection", return_value=True), patch("subprocess.run", return_value=SimpleNamespace(returncode=0)):
             ok, msg = helper.cmd_vast_wait(["1", "timeout=10m", "poll=10"])
         self.assertTrue(ok)
         self.assertIn("ready", msg)
@@ -422,7 +453,7 @@ class VastControlHelperTests(unittest.TestCase):
         with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("ssh", 1)):
             self.assertFalse(helper.verify_ssh_connection("root@example.com"))
 
-        with tempfile.TemporaryDirectory() as tmpdir:
+        with tempfile.TemporaryDirectory() as tmpdir, patch("trainsh.services.vast_connection.STATE_DIR", Path(tmpdir)):
             key_path = Path(tmpdir) / "id_rsa.pub"
             key_path.write_text("ssh-ed25519 AAA demo\n", encoding="utf-8")
             helper.ensure_ssh_key_attached(client, str(key_path))
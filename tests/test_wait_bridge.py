@@ -1,3 +1,5 @@
+import subprocess
+import threading
 import unittest
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
@@ -49,6 +51,16 @@ class BridgeExecEdgeTests(unittest.TestCase):
 
         helper.restore_tmux_bridge([SimpleNamespace(name="main", host="local", remote_session="sess")])
         self.assertGreaterEqual(bridge.connect.call_count, 3)
+        bridge.connect.reset_mock()
+        helper.restore_tmux_bridge([
+            SimpleNamespace(name="a", host="gpu", remote_session="sa"),
+            SimpleNamespace(name="skip", host="gpu", remote_session=None),
+            SimpleNamespace(name="b", host="local", remote_session="sb"),
+        ])
+        self.assertEqual(
+            [c.args for c in bridge.connect.call_args_list],
+            [("a", "remote-attach"), ("b", "local-attach")],
+        )
 
         helper._tmux_send_keys_local_target("%1", "echo hi")
         tmux.send_keys.assert_called_with("%1", "echo hi", enter=True, literal=True)
@@ -100,6 +112,25 @@ class BridgeExecEdgeTests(unittest.TestCase):
         self.assertTrue(ok)
         self.assertEqual(code, 0)
 
+        tmux.capture_pane.side_effect = [
+            TmuxCmdResult(0, "", ""),
+            TmuxCmdResult(0, "", ""),
+            TmuxCmdResult(0, "__done__3\n", ""),
+        ]
+        with patch("trainsh.core.bridge_exec.time.time", return_value=0), patch(
+            "trainsh.core.bridge_exec.time.sleep"
+        ) as mocked_sleep:
+            ok, code = helper._wait_bridge_marker("%1", "__done__", 5)
+        tmux.capture_pane.side_effect = None
+        self.assertEqual((ok, code), (True, 3))
+        self.assertEqual([call.args[0] for call in mocked_sleep.call_args_list], [0.1, 0.2])
+
+        helper.stop_event = threading.Event()
+        helper.stop_event.set()
+        helper._is_bridge_pane_idle = MagicMock(return_value=True)
+        self.assertEqual(helper.wait_for_bridge_idle("main", "%1", 600), (False, "Wait interrupted"))
+        helper._is_bridge_pane_idle.assert_not_called()
+
         bridge.get_pane.return_value = None
         self.assertIsNone(helper.exec_via_bridge(SimpleNamespace(name="main", remote_session="sess"), "echo hi", 5, False, 0))
         bridge.get_pane.return_value = "%1"
@@ -128,6 +159,17 @@ class BridgeExecEdgeTests(unittest.TestCase):
         self.assertTrue(ok)
         self.assertIn("completed", msg)
 
+        with patch.object(helper, "_tmux_send_keys_local_target") as mocked_send, patch.object(
+            helper, "_wait_bridge_marker", return_value=(True, 0)
+        ) as mocked_wait, patch("trainsh.core.bridge_exec.time.time", side_effect=[0, 3]):
+            helper.exec_via_bridge(SimpleNamespace(name="main", remote_session="sess"), "exit 3", 5, False, 0)
+        sent = mocked_send.call_args.args[1]
+        marker = mocked_wait.call_args.args[1]
+        # The pane echoes the command line; only the command's output may carry the marker.
+        self.assertNotIn(marker, sent)
+        output = subprocess.run(["sh", "-c", sent], capture_output=True, text=True).stdout
+        self.assertEqual(output, f"{marker}3\n")
+
         with patch.object(helper, "_tmux_send_keys_local_target"), patch.object(
             helper, "_wait_bridge_marker", return_value=(True, 2)
         ), patch("trainsh.core.bridge_exec.time.time", side_effect=[0, 3]):
@@ -183,6 +225,14 @@ class WaitHelperEdgeTests(unittest.TestCase):
         mocked_run.assert_called_once()
         self.assertEqual(helper.run_tmux_cmd("local", "list-sessions"), "run")
 
+        with patch("trainsh.core.executor_wait.time.sleep") as mocked_sleep:
+            self.assertFalse(helper._pause(3))
+        mocked_sleep.assert_called_once_with(3)
+        helper.stop_event = threading.Event()
+        helper.stop_event.set()
+        self.assertTrue(helper._pause(3))
+        helper.stop_event = None
+
         self.assertEqual(helper.get_pane_recent_output("local", "sess"), "a\nb")
         tmux.capture_pane.return_value = TmuxCmdResult(1, "", "err")
         self.assertEqual(helper.get_pane_recent_output("local", "sess"), "")
@@ -293,17 +343,22 @@ class WaitHelperEdgeTests(unittest.TestCase):
         self.assertIn("last SSH error", msg)
 
         executor._resolve_window.return_value = window
-        with patch("trainsh.core.executor_wait.subprocess.run", return_value=SimpleNamespace(returncode=0)):
+        with patch("trainsh.core.executor_wait.socket.create_connection", return_value=MagicMock()) as mocked_connect:
             ok, msg = helper.exec_wait(SimpleNamespace(target="main", pattern="", condition="port:8080", timeout=5))
         self.assertTrue(ok)
         self.assertIn("Port 8080 is open", msg)
+        mocked_connect.assert_called_once_with(("localhost", 8080), timeout=2)
 
         executor._resolve_window.return_value = window_remote
         with patch.object(helper, "host_from_ssh_spec", return_value=SimpleNamespace(hostname="remote")), patch(
-            "trainsh.core.executor_wait.subprocess.run", return_value=SimpleNamespace(returncode=0)
-        ):
+            "trainsh.core.executor_wait.socket.create_connection", return_value=MagicMock()
+        ) as mocked_connect:
             ok, msg = helper.exec_wait(SimpleNamespace(target="gpu", pattern="", condition="port:8080", timeout=5))
         self.assertTrue(ok)
+        mocked_connect.assert_called_once_with(("remote", 8080), timeout=2)
+
+        with patch("trainsh.core.executor_wait.socket.create_connection", side_effect=ConnectionRefusedError()):
+            self.assertFalse(helper.probe_port("localhost", 8080))
 
         executor._resolve_window.return_value = window_remote
         ok, msg = helper.exec_wait(SimpleNamespace(target="gpu", pattern="", condition="idle", timeout=5))
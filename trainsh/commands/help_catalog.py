@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
@@ -928,11 +929,13 @@ def _render_command_section(doc: CommandDoc) -> list[str]:
     return lines
 
 
+@lru_cache(maxsize=32)
 def render_command_help(command: str) -> str:
     doc = _command_doc(command)
     return "\n".join(_render_command_section(doc)).rstrip()
 
 
+@lru_cache(maxsize=1)
 def render_top_level_help() -> str:
     examples = _joined(_bundled_examples())
     version = _package_version()
@@ -1119,6 +1122,7 @@ def render_top_level_help() -> str:
     )
     return "\n".join(lines).rstrip()
 
+@lru_cache(maxsize=1)
 def render_readme_overview() -> str:
     examples = ", ".join(_bundled_examples())
     return (
@@ -12,6 +12,7 @@ from typing import List, Optional
 from ..constants import RECIPE_FILE_EXTENSION
 from ..core.job_state import generate_job_id
 from ..core.tmux_naming import get_live_session_name
+from ..runtime_executors import normalize_executor_name
 from .recipe import find_recipe
 from .recipe_shared import (
     EXECUTOR_OPTIONS_FLAGS,
@@ -259,7 +260,7 @@ def _parse_runtime_options(rest_args: List[str]) -> tuple[dict, dict, list[str],
             pick_hosts.append(rest_args[i])
         elif arg.startswith("--executor="):
             executor = arg.split("=", 1)[1].strip()
-            normalized_executor = "".join(ch for ch in str(executor).lower() if ch.isalnum())
+            normalized_executor = normalize_executor_name(executor)
             if normalized_executor in UNSUPPORTED_EXECUTORS:
                 print("Error: kubernetes executor is not supported in this runtime.")
                 raise SystemExit(1)
@@ -269,7 +270,7 @@ def _parse_runtime_options(rest_args: List[str]) -> tuple[dict, dict, list[str],
                 raise SystemExit(1)
             i += 1
             executor = rest_args[i]
-            normalized_executor = "".join(ch for ch in str(executor).lower() if ch.isalnum())
+            normalized_executor = normalize_executor_name(executor)
             if normalized_executor in UNSUPPORTED_EXECUTORS:
                 print("Error: kubernetes executor is not supported in this runtime.")
                 raise SystemExit(1)
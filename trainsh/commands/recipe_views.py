@@ -241,6 +241,7 @@ def _show_attach_commands(job) -> None:
         return
 
     local_tmux = LocalTmuxClient()
+    remote_clients = {}
     if not printed:
         print("\nAttach Commands:")
 
@@ -250,10 +251,10 @@ def _show_attach_commands(job) -> None:
             if host_spec == "local":
                 attach_cmd = local_tmux.build_attach_command(session_name, nested=False)
             else:
-                attach_cmd = RemoteTmuxClient(host_spec, _build_ssh_args).build_attach_command(
-                    session_name,
-                    status_mode="keep",
-                )
+                client = remote_clients.get(host_spec)
+                if client is None:
+                    client = remote_clients[host_spec] = RemoteTmuxClient(host_spec, _build_ssh_args)
+                attach_cmd = client.build_attach_command(session_name, status_mode="keep")
             print(f"  @{window_name}: {attach_cmd}")
         except Exception:
             print(f"  @{window_name}: tmux attach -t {session_name}")
@@ -1,7 +1,8 @@
 # tmux-trainsh configuration loading
 
+import copy
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 import yaml
 
 from .constants import CONFIG_DIR, CONFIG_FILE
@@ -12,6 +13,10 @@ def ensure_config_dir() -> None:
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Last parsed config, keyed by (path, mtime_ns, size) of the file it came from.
+_config_cache: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
+
+
 def load_config() -> Dict[str, Any]:
     """
     Load the main configuration file.
@@ -19,17 +24,24 @@ def load_config() -> Dict[str, Any]:
     Returns:
         Configuration dictionary
     """
+    global _config_cache
     ensure_config_dir()
 
-    if not CONFIG_FILE.exists():
+    try:
+        stat = CONFIG_FILE.stat()
+    except FileNotFoundError:
         return get_default_config()
 
-    with open(CONFIG_FILE, "r") as f:
-        config = yaml.safe_load(f) or {}
+    # Reparse only when the file changed; callers get their own copy to mutate.
+    key = (str(CONFIG_FILE), stat.st_mtime_ns, stat.st_size)
+    if _config_cache is None or _config_cache[0] != key:
+        with open(CONFIG_FILE, "r") as f:
+            config = yaml.safe_load(f) or {}
 
-    # Merge with defaults
-    defaults = get_default_config()
-    return merge_dicts(defaults, config)
+        # Merge with defaults
+        defaults = get_default_config()
+        _config_cache = (key, merge_dicts(defaults, config))
+    return copy.deepcopy(_config_cache[1])
 
 
 def save_config(config: Dict[str, Any]) -> None:
@@ -39,7 +51,9 @@ def save_config(config: Dict[str, Any]) -> None:
     Args:
         config: Configuration dictionary
     """
+    global _config_cache
     ensure_config_dir()
+    _config_cache = None
 
     with open(CONFIG_FILE, "w") as f:
         yaml.dump(config, f, default_flow_style=False, sort_keys=False)
@@ -84,6 +98,10 @@ def get_default_config() -> Dict[str, Any]:
                 "bind -n MouseDown1Status select-window -t =",
             ],
         },
+        "ssh": {
+            # Open shared SSH master connections to recipe hosts when a run starts
+            "prewarm_masters": True,
+        },
         "notifications": {
             # Enable/disable notifications globally.
             "enabled": True,
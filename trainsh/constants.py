@@ -21,6 +21,7 @@ STORAGES_FILE = CONFIG_DIR / "storages.yaml"
 RECIPES_DIR = DATA_DIR / "recipes"
 LOGS_DIR = DATA_DIR / "logs"
 RUNTIME_STATE_DIR = STATE_DIR / "runtime"
+SSH_CONTROL_DIR = STATE_DIR / "ssh"
 RECIPE_FILE_EXTENSION = ".pyrecipe"
 RECIPE_FILE_EXTENSIONS = (RECIPE_FILE_EXTENSION,)
 
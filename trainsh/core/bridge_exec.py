@@ -1,15 +1,22 @@
 # tmux-trainsh bridge execution helpers
 # Encapsulates local tmux bridge behavior to keep DSLExecutor focused on orchestration.
 
+import os
 import re
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, Iterable, Optional
 
 
 class BridgeExecutionHelper:
     """Bridge-pane attach, command execution, and idle wait."""
 
+    MARKER_POLL_MIN = 0.1
+    MARKER_POLL_MAX = 1.0
+    RESTORE_MAX_WORKERS = 8
+
     def __init__(
         self,
         tmux_bridge: Any,
@@ -19,6 +26,7 @@ class BridgeExecutionHelper:
         log: Callable[[str], None],
         log_detail: Callable[[str, str, Dict[str, Any]], None],
         format_duration: Callable[[float], str],
+        stop_event: Optional[threading.Event] = None,
     ):
         self.tmux_bridge = tmux_bridge
         self.prefer_bridge_exec = prefer_bridge_exec
@@ -27,6 +35,14 @@ class BridgeExecutionHelper:
         self.log = log
         self.log_detail = log_detail
         self.format_duration = format_duration
+        self.stop_event = stop_event
+
+    def _pause(self, seconds: float) -> bool:
+        """Sleep between polls; return True when the executor has been asked to stop."""
+        if self.stop_event is None:
+            time.sleep(seconds)
+            return False
+        return self.stop_event.wait(seconds)
 
     def build_bridge_attach_command(self, window: Any) -> str:
         """Build local shell command used by bridge pane to attach a window."""
@@ -47,7 +63,10 @@ class BridgeExecutionHelper:
         if not window.remote_session:
             return
 
-        attach_cmd = self.build_bridge_attach_command(window)
+        self._connect_bridge_window(window, self.build_bridge_attach_command(window))
+
+    def _connect_bridge_window(self, window: Any, attach_cmd: str) -> None:
+        """Split or reuse the local bridge pane for a window."""
         ok, msg = self.tmux_bridge.connect(window.name, attach_cmd)
         if ok:
             self.log(f"  Bridge @{window.name}: {msg}")
@@ -59,9 +78,21 @@ class BridgeExecutionHelper:
         )
 
     def restore_tmux_bridge(self, windows: Iterable[Any]) -> None:
-        """Rebuild bridge panes for restored windows."""
-        for window in windows:
-            self.ensure_bridge_window(window)
+        """Rebuild bridge panes for restored windows.
+
+        Attach commands may resolve cloud hosts and SSH settings, so they are
+        built concurrently; pane splits stay sequential because they share
+        layout state in the bridge window.
+        """
+        windows = [window for window in windows if window.remote_session]
+        if len(windows) < 2:
+            for window in windows:
+                self.ensure_bridge_window(window)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.RESTORE_MAX_WORKERS, len(windows))) as pool:
+            attach_cmds = list(pool.map(self.build_bridge_attach_command, windows))
+        for window, attach_cmd in zip(windows, attach_cmds):
+            self._connect_bridge_window(window, attach_cmd)
 
     def _tmux_send_keys_local_target(self, target: str, text: str) -> None:
         """Send literal text + Enter to local tmux target."""
@@ -141,7 +172,8 @@ class BridgeExecutionHelper:
             self.log(f"  Long wait ({self.format_duration(timeout)})")
             self.log("  If you disconnect, run 'train recipe resume <name>' to continue later")
 
-        time.sleep(5)
+        if self._pause(5):
+            return False, "Wait interrupted"
 
         while time.time() - start < timeout:
             remaining = int(timeout - (time.time() - start))
@@ -152,7 +184,8 @@ class BridgeExecutionHelper:
                     if consecutive_idle >= confirm_count:
                         return True, "Pane is idle (confirmed)"
                     self.log(f"  Idle detected, confirming... ({consecutive_idle}/{confirm_count})")
-                    time.sleep(confirm_interval)
+                    if self._pause(confirm_interval):
+                        return False, "Wait interrupted"
                     continue
                 if consecutive_idle > 0:
                     self.log("  Not idle, resetting confirmation counter")
@@ -175,7 +208,8 @@ class BridgeExecutionHelper:
                 for line in output.split("\n"):
                     self.log(f"      {line[:80]}")
 
-            time.sleep(poll_interval)
+            if self._pause(poll_interval):
+                return False, "Wait interrupted"
 
         return False, f"Timeout after {self.format_duration(timeout)}"
 
@@ -184,10 +218,15 @@ class BridgeExecutionHelper:
         start = time.time()
         deadline = None if timeout is None or timeout <= 0 else start + timeout
         pattern = re.compile(re.escape(marker) + r"(-?\d+)")
+        # Short commands usually finish within a few hundred ms; start with a
+        # tight poll and back off instead of always paying a full second.
+        interval = self.MARKER_POLL_MIN
         while True:
             result = self.tmux_bridge.tmux.capture_pane(pane_id, start="-300")
-            if result.returncode == 0:
-                matches = pattern.findall(result.stdout or "")
+            output = result.stdout or ""
+            # Plain substring scan first; most polls happen before the marker prints.
+            if result.returncode == 0 and marker in output:
+                matches = pattern.findall(output)
                 if matches:
                     try:
                         return True, int(matches[-1])
@@ -195,7 +234,9 @@ class BridgeExecutionHelper:
                         return True, None
             if deadline is not None and time.time() >= deadline:
                 break
-            time.sleep(1)
+            if self._pause(interval):
+                break
+            interval = min(interval * 2, self.MARKER_POLL_MAX)
         return False, None
 
     def exec_via_bridge(
@@ -219,9 +260,11 @@ class BridgeExecutionHelper:
                 self._tmux_send_keys_local_target(pane_id, commands)
                 return True, "Command sent (background via bridge)"
 
-            import uuid
-            marker = f"__train_done_{uuid.uuid4().hex[:8]}__"
-            wrapped_cmd = f"( {commands} ); __train_rc=$?; echo {marker}$__train_rc"
+            token = f"{os.urandom(4).hex()}__"
+            marker = f"__train_done_{token}"
+            # printf joins the halves at runtime, so the echoed command line
+            # never contains the marker and cannot satisfy the wait early.
+            wrapped_cmd = f"( {commands} ); __train_rc=$?; printf '%s%s%s\\n' __train_done_ {token} \"$__train_rc\""
             self._tmux_send_keys_local_target(pane_id, wrapped_cmd)
 
             found, exit_code = self._wait_bridge_marker(pane_id, marker, timeout)
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import ast
+import io
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from ..constants import CONFIG_DIR
 from ..constants import RECIPE_FILE_EXTENSION
 from ..pyrecipe.loader import load_python_recipe
 
 
-_METADATA_KEYS = {
+_METADATA_KEYS = frozenset({
     "name",
     "schedule",
     "schedule_interval",
@@ -30,7 +34,7 @@ _METADATA_KEYS = {
     "executor",
     "executor_kwargs",
     "callbacks",
-}
+})
 
 _RECIPE_CALL_METADATA_KEYS = _METADATA_KEYS - {"owner", "tags"}
 
@@ -45,6 +49,9 @@ _INTERVAL_PRESETS = {
 _RE_METADATA = re.compile(r"^\s*#\s*([A-Za-z_][A-Za-z0-9_]*)\s*[:=]\s*(.+?)\s*$")
 _RE_EVERY = re.compile(r"^@?every\s+([0-9]+)\s*([smhd])$", re.IGNORECASE)
 _RE_SECONDS = re.compile(r"^([0-9]+)\s*([smhd])$")
+_RE_WHITESPACE = re.compile(r"\s")
+# Include patterns of the plain "[**/]*.ext" shape can skip glob matching.
+_RE_SUFFIX_PATTERN = re.compile(r"^(\*\*/)?\*(\.[A-Za-z0-9_]+)$")
 
 
 def _to_seconds(value: int, unit: str) -> int:
@@ -92,7 +99,7 @@ def parse_schedule(raw: Optional[str]) -> "DagSchedule":
 
     if lower.startswith("@"):
         return DagSchedule(raw=text, kind="manual", interval_seconds=None)
-    if re.search(r"\s", text):
+    if _RE_WHITESPACE.search(text):
         return DagSchedule(raw=text, kind="cron", interval_seconds=None)
     return DagSchedule(raw=text, kind="manual", interval_seconds=None)
 
@@ -164,29 +171,108 @@ class ParsedDag:
         return load_python_recipe(str(self.path))
 
 
+def _scan_suffix(root: Path, suffix: str, *, recursive: bool) -> Iterator[Path]:
+    """Yield files under ``root`` ending in ``suffix`` using one scandir pass per directory.
+
+    Mirrors ``Path.glob("**/*<suffix>")``: symlinked directories are not
+    descended into, and file checks use the directory entry's cached type.
+    """
+    pending = [os.fspath(root)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        if entry.name.endswith(suffix):
+                            yield Path(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                except OSError:
+                    continue
+
+
 class DagProcessor:
     """Discover and parse recipe DAG metadata."""
 
+    # Below this many files, worker start-up costs more than parsing serially.
+    PARALLEL_MIN_FILES = 32
+
     def __init__(
         self,
         dag_roots: Optional[Sequence[str]] = None,
         *,
         include_patterns: Optional[Sequence[str]] = None,
         recursive: bool = True,
+        max_workers: Optional[int] = None,
     ):
         self.dag_roots = [Path(p) for p in (dag_roots or [str(CONFIG_DIR / "recipes")])]
         self.include_patterns = list(include_patterns or [f"**/*{RECIPE_FILE_EXTENSION}"])
         self.recursive = recursive
+        self.max_workers = max_workers
+        # path -> (st_mtime_ns, st_size, parsed dag); reused across discover_dags calls.
+        self._dag_cache: Dict[Path, Tuple[int, int, ParsedDag]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes only need the configuration, not the parse cache.
+        state = dict(self.__dict__)
+        state["_dag_cache"] = {}
+        return state
 
     def discover_dags(self) -> List[ParsedDag]:
         dags: List[ParsedDag] = []
+        stale: List[Path] = []
+        stale_keys: List[Tuple[int, int]] = []
+        seen: Dict[Path, Tuple[int, int, ParsedDag]] = {}
         for path in self.discover_files():
-            dags.append(self.process_dag_file(path))
+            try:
+                stats = path.stat()
+            except OSError:
+                stale.append(path)
+                stale_keys.append((-1, -1))
+                continue
+            key = (stats.st_mtime_ns, stats.st_size)
+            cached = self._dag_cache.get(path)
+            if cached is not None and cached[:2] == key:
+                dags.append(cached[2])
+                seen[path] = cached
+                continue
+            stale.append(path)
+            stale_keys.append(key)
+
+        parsed: Optional[List[ParsedDag]] = None
+        if len(stale) >= self.PARALLEL_MIN_FILES:
+            parsed = self._process_dag_files_parallel(stale)
+        if parsed is None:
+            parsed = [self.process_dag_file(path) for path in stale]
+        for path, key, dag in zip(stale, stale_keys, parsed):
+            dags.append(dag)
+            if key[0] >= 0:
+                seen[path] = (key[0], key[1], dag)
+        # Drop entries for recipes that disappeared since the last scan.
+        self._dag_cache = seen
+
         dags.sort(key=lambda item: item.dag_id)
         return dags
 
+    def _process_dag_files_parallel(self, files: List[Path]) -> Optional[List[ParsedDag]]:
+        """Parse many DAG files in worker processes; None when no pool is available."""
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers <= 1:
+            return None
+        chunksize = max(1, len(files) // (4 * workers))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(self.process_dag_file, files, chunksize=chunksize))
+        except (OSError, BrokenProcessPool):
+            return None
+
     def discover_files(self) -> List[Path]:
         files: List[Path] = []
+        globbed: List[Path] = []
         for root in self.dag_roots:
             if not root:
                 continue
@@ -203,14 +289,18 @@ class DagProcessor:
                 continue
 
             if self.recursive:
-                for pattern in self.include_patterns:
-                    files.extend(path.glob(pattern))
+                patterns = self.include_patterns
             else:
                 patterns = [p.split("**/")[-1] for p in self.include_patterns]
-                for pattern in patterns:
-                    files.extend(path.glob(pattern))
+            for pattern in patterns:
+                match = _RE_SUFFIX_PATTERN.match(pattern)
+                if match is not None:
+                    files.extend(_scan_suffix(path, match.group(2), recursive=bool(match.group(1))))
+                else:
+                    globbed.extend(path.glob(pattern))
 
-        return sorted(set(p for p in files if p.is_file()))
+        files.extend(p for p in globbed if p.is_file())
+        return sorted(set(files))
 
     def process_dag_file(self, path: Path) -> ParsedDag:
         path = path.expanduser().resolve()
@@ -258,15 +348,22 @@ class DagProcessor:
 
     def _parse_comment_metadata(self, text: str) -> Dict[str, Any]:
         meta: Dict[str, Any] = {}
-        for raw_line in text.splitlines():
-            match = _RE_METADATA.match(raw_line)
+        match_metadata = _RE_METADATA.match
+        safe_literal = self._safe_literal
+        # Stream lines instead of materializing a list for the whole file.
+        for raw_line in io.StringIO(text):
+            # Only comment lines can carry metadata; skip code lines without
+            # running the regex.
+            if "#" not in raw_line:
+                continue
+            match = match_metadata(raw_line)
             if not match:
                 continue
             key = match.group(1).lower()
             if key not in _METADATA_KEYS:
                 continue
             raw_value = match.group(2).strip().strip("`\"'")
-            value = self._safe_literal(raw_value)
+            value = safe_literal(raw_value)
             if value is None:
                 value = raw_value
             meta[key] = value
@@ -286,6 +383,7 @@ class DagProcessor:
         if recipe_call is not None:
             parsed.update(self._parse_recipe_call_keywords(recipe_call))
 
+        safe_literal = self._safe_literal
         for node in tree.body:
             if isinstance(node, (ast.Assign, ast.AnnAssign)):
                 targets = node.targets if isinstance(node, ast.Assign) else [node.target] if node.target else []
@@ -296,7 +394,7 @@ class DagProcessor:
                     key = target.id
                     if key not in _METADATA_KEYS:
                         continue
-                    parsed_value = self._safe_literal(value)
+                    parsed_value = safe_literal(value)
                     if parsed_value is not None:
                         parsed[key] = parsed_value
         return parsed
@@ -3,35 +3,145 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 from .runtime_store import RuntimeStore
 
 
 class ExecutionLogger:
-    """Detailed execution logger backed by JSONL events."""
+    """Detailed execution logger backed by JSONL events.
+
+    Events are buffered in memory and appended in batches at step boundaries,
+    on close, or once ``FLUSH_THRESHOLD`` events are pending. Batches handed
+    off mid-run are written by one background thread so steps never wait on
+    disk I/O, and handoffs made while it is busy coalesce into one append;
+    ``close()`` drains it before returning.
+    """
+
+    FLUSH_THRESHOLD = 256
+    # Large outputs are split so no single JSONL line grows unbounded.
+    OUTPUT_CHUNK_SIZE = 50000
 
     def __init__(self, job_id: str, recipe_name: str, db_path: Optional[str] = None):
         self.job_id = job_id
         self.recipe_name = recipe_name
-        self.store = RuntimeStore(db_path)
+        self._db_path = db_path
+        self._store: Optional[RuntimeStore] = None
         self._step_count = 0
         self._closed = False
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        # (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") reused within one second.
+        self._ts_cache: tuple[int, str] = (-1, "")
+        # Bound once: _write runs for every output chunk and detail event.
+        self._append_pending = self._pending.append
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._last_write: Optional[Future] = None
+        self._drain_queued = False
+
+    @property
+    def store(self) -> RuntimeStore:
+        """Runtime store, opened on first use so unused loggers touch no disk."""
+        if self._store is None:
+            self._store = RuntimeStore(self._db_path)
+        return self._store
+
+    @store.setter
+    def store(self, store: RuntimeStore) -> None:
+        self._store = store
+
+    def _timestamp(self) -> str:
+        """Local ISO-8601 timestamp with microseconds; date formatting runs once per second."""
+        ns = time.time_ns()
+        second, remainder = divmod(ns, 1_000_000_000)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            self._ts_cache = (second, prefix)
+        return f"{prefix}.{remainder // 1000:06d}"
 
     def _write(self, event: str, *, step_num: Optional[int] = None, **payload: Any) -> None:
         if self._closed:
             return
-        self.store.append_event(
+        record = {
+            "run_id": self.job_id,
+            "event": event,
+            "event_name": event,
+            "step_num": step_num,
+            "payload": payload,
+            "ts": self._timestamp(),
+        }
+        with self._pending_lock:
+            self._append_pending(record)
+            full = len(self._pending) >= self.FLUSH_THRESHOLD
+        if full:
+            self._flush_async()
+
+    def _write_many(self, event: str, step_num: Optional[int], payloads: List[Dict[str, Any]]) -> None:
+        """Buffer several records of one event under a single timestamp and lock."""
+        if self._closed:
+            return
+        ts = self._timestamp()
+        records = [
             {
                 "run_id": self.job_id,
                 "event": event,
                 "event_name": event,
                 "step_num": step_num,
                 "payload": payload,
-                "ts": datetime.now().isoformat(),
+                "ts": ts,
             }
-        )
+            for payload in payloads
+        ]
+        with self._pending_lock:
+            self._pending.extend(records)
+            full = len(self._pending) >= self.FLUSH_THRESHOLD
+        if full:
+            self._flush_async()
+
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        with self._pending_lock:
+            pending = self._pending[:]
+            self._pending.clear()
+        return pending
+
+    def _flush_async(self) -> None:
+        """Hand buffered events to the background writer.
+
+        At most one drain is queued at a time; events buffered while a write
+        is in flight join the next drain instead of becoming their own append.
+        """
+        with self._pending_lock:
+            if not self._pending or self._drain_queued:
+                return
+            self._drain_queued = True
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trainsh-log")
+            self._last_write = self._writer.submit(self._drain_pending)
+
+    def _drain_pending(self) -> None:
+        with self._pending_lock:
+            self._drain_queued = False
+            pending = self._pending[:]
+            self._pending.clear()
+        if pending:
+            self.store.append_events(pending)
+
+    def wait_pending(self) -> None:
+        """Block until every batch handed to the background writer is on disk."""
+        last_write, self._last_write = self._last_write, None
+        if last_write is not None:
+            last_write.result()
+
+    def flush(self) -> None:
+        """Persist buffered events to the runtime store now."""
+        self.wait_pending()
+        pending = self._take_pending()
+        if pending:
+            self.store.append_events(pending)
 
     def start(
         self,
@@ -47,18 +157,18 @@ class ExecutionLogger:
         del raw, step_type, details
 
     def step_output(self, step_num: int, output: str, output_type: str = "result") -> None:
-        max_chunk = 50000
-        if len(output) > max_chunk:
-            total_chunks = (len(output) + max_chunk - 1) // max_chunk
-            for i in range(0, len(output), max_chunk):
-                self._write(
-                    "step_output",
-                    step_num=step_num,
-                    output_type=output_type,
-                    output=output[i:i + max_chunk],
-                    chunk=i // max_chunk,
-                    total_chunks=total_chunks,
-                )
+        size = self.OUTPUT_CHUNK_SIZE
+        if len(output) > size:
+            total_chunks = (len(output) + size - 1) // size
+            self._write_many("step_output", step_num, [
+                {
+                    "output_type": output_type,
+                    "output": output[offset:offset + size],
+                    "chunk": index,
+                    "total_chunks": total_chunks,
+                }
+                for index, offset in enumerate(range(0, len(output), size))
+            ])
             return
         self._write("step_output", step_num=step_num, output_type=output_type, output=output)
 
@@ -72,6 +182,7 @@ class ExecutionLogger:
     ) -> None:
         self._step_count = step_num
         del success, duration_ms, result, error
+        self._flush_async()
 
     def log_detail(self, category: str, message: str, data: Optional[Dict[str, Any]] = None) -> None:
         payload = {"category": category, "message": message}
@@ -162,14 +273,25 @@ class ExecutionLogger:
 
     def close(self) -> None:
         self._closed = True
+        try:
+            self.flush()
+        finally:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                writer.shutdown(wait=True)
 
     def __del__(self):
-        self.close()
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 class ExecutionLogReader:
     """Execution log reader backed by JSONL runtime state files."""
 
+    STREAM_OUTPUT_TYPES = frozenset({"stdout", "stderr"})
+
     def __init__(self, db_path: Optional[str] = None):
         self.store = RuntimeStore(db_path)
 
@@ -193,27 +315,45 @@ class ExecutionLogReader:
     def read_execution(self, job_id: str) -> List[dict]:
         entries: List[dict] = []
         for record in self.store.list_events(job_id):
-            entry = {
-                "event": str(record.get("event_name") or record.get("event") or ""),
-                "job_id": job_id,
-                "step_num": record.get("step_num"),
-                "ts": str(record.get("ts", "")),
-            }
-            payload = record.get("payload", {})
-            if isinstance(payload, dict):
-                entry.update(payload)
-            else:
-                entry["payload"] = payload
-            entries.append(entry)
+            entries.append(self._entry_from_record(job_id, record))
         return entries
 
+    @staticmethod
+    def _entry_from_record(job_id: str, record: Dict[str, Any]) -> dict:
+        entry = {
+            "event": str(record.get("event_name") or record.get("event") or ""),
+            "job_id": job_id,
+            "step_num": record.get("step_num"),
+            "ts": str(record.get("ts", "")),
+        }
+        payload = record.get("payload", {})
+        if isinstance(payload, dict):
+            entry.update(payload)
+        else:
+            entry["payload"] = payload
+        return entry
+
     def get_step_output(self, job_id: str, step_num: int) -> str:
         chunks = []
+        streamed = False
+        in_order = True
+        last_chunk = -1
         for entry in self.read_execution(job_id):
             if entry.get("event") == "step_output" and entry.get("step_num") == step_num:
-                chunks.append((entry.get("chunk", 0), entry.get("output", "")))
-        chunks.sort(key=lambda item: item[0])
-        return "".join(output for _, output in chunks)
+                output_type = entry.get("output_type", "result")
+                streamed = streamed or output_type in self.STREAM_OUTPUT_TYPES
+                chunk = entry.get("chunk", 0)
+                if in_order and chunk < last_chunk:
+                    in_order = False
+                last_chunk = chunk
+                chunks.append((chunk, output_type, entry.get("output", "")))
+        # Streamed stdout/stderr already carries what the "result" record repeats.
+        if streamed:
+            chunks = [item for item in chunks if item[1] != "result"]
+        # Chunks are logged in order, so sorting is only a fallback.
+        if not in_order:
+            chunks.sort(key=lambda item: item[0])
+        return "".join(output for _, _, output in chunks)
 
     def get_execution_summary(self, job_id: str) -> Optional[dict]:
         run_row = self.store.get_run(job_id)
@@ -269,7 +409,9 @@ class ExecutionLogReader:
     ) -> List[dict]:
         excluded = set(exclude_events or {"step_output", "wait_poll"})
         events = []
-        for entry in reversed(self.read_execution(job_id)):
+        # Walk the event log from its tail; recent events are near the end.
+        for record in self.store.iter_events_reversed(job_id):
+            entry = self._entry_from_record(job_id, record)
             if entry.get("event") in excluded:
                 continue
             events.append(entry)
@@ -1,17 +1,51 @@
 # tmux-trainsh execute helpers
 # Encapsulates @session command execution.
 
+import codecs
+import io
 import re
 import os
+import selectors
 import shlex
 import subprocess
 import time
+from collections import deque
+from pathlib import Path
 from typing import Any, Callable, Optional
 
 
+class _StreamTail:
+    """Incrementally decode one pipe and keep a bounded tail of its text."""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+        )
+        self._chunks: deque[str] = deque()
+        self._size = 0
+
+    def feed(self, data: bytes, final: bool = False) -> str:
+        text = self._decoder.decode(data, final=final)
+        if text:
+            self._chunks.append(text)
+            self._size += len(text)
+            while self._size - len(self._chunks[0]) >= self.limit:
+                self._size -= len(self._chunks.popleft())
+        return text
+
+    def text(self) -> str:
+        return "".join(self._chunks)[-self.limit:]
+
+
 class ExecuteHelper:
     """Helper for execute steps."""
 
+    STREAM_CHUNK_SIZE = 128 * 1024
+    # Full output is streamed to the execution log; results keep this much.
+    OUTPUT_TAIL_CHARS = 1024 * 1024
+
     def __init__(
         self,
         executor: Any,
@@ -33,6 +67,11 @@ class ExecuteHelper:
             return None
         return timeout_secs if timeout_secs > 0 else None
 
+    def _run_remote(self, host: str, command: str, timeout: Optional[int] = 10) -> subprocess.CompletedProcess:
+        """Run one non-interactive command on a remote host over SSH."""
+        ssh_args = self.build_ssh_args(host, command=command, tty=False)
+        return subprocess.run(ssh_args, capture_output=True, text=True, timeout=timeout)
+
     def _read_captured_output(self, host: str, path: str) -> str:
         """Read one captured-output file from local or remote host."""
         target = str(path or "").strip()
@@ -40,18 +79,11 @@ class ExecuteHelper:
             return ""
         if host == "local":
             try:
-                with open(os.path.expanduser(target), "r", encoding="utf-8", errors="replace") as handle:
-                    return handle.read()
+                return Path(target).expanduser().read_text(encoding="utf-8", errors="replace")
             except OSError:
                 return ""
         try:
-            ssh_args = self.build_ssh_args(host, command=f"cat {shlex.quote(target)}", tty=False)
-            result = subprocess.run(
-                ssh_args,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+            result = self._run_remote(host, f"cat {shlex.quote(target)}")
         except Exception:
             return ""
         if result.returncode != 0:
@@ -70,13 +102,7 @@ class ExecuteHelper:
                 return
             return
         try:
-            ssh_args = self.build_ssh_args(host, command=f"rm -f {shlex.quote(target)}", tty=False)
-            subprocess.run(
-                ssh_args,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+            self._run_remote(host, f"rm -f {shlex.quote(target)}")
         except Exception:
             return
 
@@ -90,6 +116,102 @@ class ExecuteHelper:
         self.executor.ctx.variables[capture_var] = output.rstrip("\r\n")
         self._cleanup_captured_output(host, capture_path)
 
+    def _run_streamed(
+        self,
+        args: Any,
+        *,
+        shell: bool = False,
+        timeout: Optional[int] = None,
+        on_output: Optional[Callable[[str, str], None]] = None,
+    ) -> subprocess.CompletedProcess:
+        """Run a command, draining both pipes as data arrives and killing it at the deadline.
+
+        Decoded text (with universal newlines, as ``text=True`` would give) is
+        handed to ``on_output(stream, text)`` as it arrives; the returned
+        result keeps only the last OUTPUT_TAIL_CHARS of each stream.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        proc = subprocess.Popen(args, shell=shell, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        streams = {
+            proc.stdout: _StreamTail("stdout", self.OUTPUT_TAIL_CHARS),
+            proc.stderr: _StreamTail("stderr", self.OUTPUT_TAIL_CHARS),
+        }
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(proc.stdout, selectors.EVENT_READ)
+                selector.register(proc.stderr, selectors.EVENT_READ)
+                while selector.get_map():
+                    wait = None
+                    if deadline is not None:
+                        wait = deadline - time.monotonic()
+                        if wait <= 0:
+                            raise subprocess.TimeoutExpired(args, timeout)
+                    for key, _ in selector.select(wait):
+                        data = os.read(key.fd, self.STREAM_CHUNK_SIZE)
+                        tail = streams[key.fileobj]
+                        if not data:
+                            selector.unregister(key.fileobj)
+                        text = tail.feed(data, final=not data)
+                        if text and on_output is not None:
+                            on_output(tail.name, text)
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            returncode = proc.wait(timeout=remaining)
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            proc.stdout.close()
+            proc.stderr.close()
+        return subprocess.CompletedProcess(
+            args,
+            returncode,
+            streams[proc.stdout].text(),
+            streams[proc.stderr].text(),
+        )
+
+    def _run_direct(
+        self,
+        step: Any,
+        host: str,
+        commands: str,
+        timeout: Optional[int],
+        start_ns: int,
+    ) -> tuple[bool, str]:
+        """Run a command without tmux, locally via the shell or over SSH."""
+        if host == "local":
+            args: Any = commands
+        else:
+            args = self.build_ssh_args(host, command=commands, tty=False)
+        on_output = None
+        logger = self.executor.logger
+        if logger:
+            step_num = self.executor._current_step_num()
+
+            def on_output(stream: str, text: str) -> None:
+                logger.step_output(step_num, text, stream)
+        try:
+            result = self._run_streamed(args, shell=host == "local", timeout=timeout, on_output=on_output)
+        except subprocess.TimeoutExpired:
+            return False, f"Command timed out after {timeout}s"
+        duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+        if self.executor.logger:
+            self.executor.logger.log_ssh(host, commands, result.returncode, result.stdout, result.stderr, duration_ms)
+        self._store_captured_output(step, host)
+        return result.returncode == 0, result.stdout or result.stderr
+
+    def _send_and_wait(self, tmux_client: Any, remote_session: str, commands: str, timeout: Optional[int]) -> Any:
+        """Send a command that signals a tmux wait-for channel on exit and block on it.
+
+        Returns the wait-for result, or None when the keys could not be sent.
+        """
+        signal = f"train_{os.urandom(4).hex()}"
+        wrapped_cmd = f"( {commands} ); tmux wait-for -S {signal}"
+        send_result = tmux_client.send_keys(remote_session, wrapped_cmd, enter=True, literal=True)
+        if send_result.returncode != 0:
+            return None
+        return tmux_client.wait_for(signal, timeout=timeout)
+
     def exec_execute(self, step: Any) -> tuple[bool, str]:
         """Execute command: @session > command."""
         window_name = step.host
@@ -117,7 +239,7 @@ class ExecuteHelper:
         if bridge_result is not None:
             return bridge_result
 
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         host = window.host
         remote_session = window.remote_session
 
@@ -135,14 +257,23 @@ class ExecuteHelper:
                 return result.returncode == 0, "Command sent (background)"
 
             if self.executor.is_resuming:
-                result = tmux_client.send_keys(remote_session, commands, enter=True, literal=True)
-                if result.returncode != 0:
+                wait_result = self._send_and_wait(tmux_client, remote_session, commands, timeout)
+                if wait_result is None:
                     return False, "Failed sending command to tmux session"
-                time.sleep(0.5)
-                window_info = self.window_cls(name=window_name, host=host, remote_session=remote_session)
-                ok, msg = self.executor._wait_for_idle(window_info, timeout)
+                if wait_result.returncode == 0:
+                    ok, msg = True, f"Command completed ({(time.monotonic_ns() - start_ns) // 1_000_000_000}s)"
+                else:
+                    # wait-for did not confirm completion; fall back to pane idle
+                    # polling within whatever is left of the step's timeout.
+                    remaining = timeout
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic_ns() - start_ns) // 1_000_000_000
+                    if remaining is not None and remaining <= 0:
+                        return False, f"Command timed out after {timeout}s"
+                    window_info = self.window_cls(name=window_name, host=host, remote_session=remote_session)
+                    ok, msg = self.executor._wait_for_idle(window_info, remaining)
                 self._store_captured_output(step, host)
-                elapsed = int(time.time() - start_time)
+                elapsed = (time.monotonic_ns() - start_ns) // 1_000_000_000
                 if self.executor.logger:
                     self.executor.logger.log_detail("execute_complete", f"Command completed on {window_name}", {
                         "elapsed_sec": elapsed,
@@ -150,16 +281,11 @@ class ExecuteHelper:
                     })
                 return ok, msg
 
-            import uuid
-            signal = f"train_{uuid.uuid4().hex[:8]}"
-            wrapped_cmd = f"( {commands} ); tmux wait-for -S {signal}"
-            send_result = tmux_client.send_keys(remote_session, wrapped_cmd, enter=True, literal=True)
-            if send_result.returncode != 0:
+            wait_result = self._send_and_wait(tmux_client, remote_session, commands, timeout)
+            if wait_result is None:
                 return False, "Failed sending command to tmux session"
-
-            wait_result = tmux_client.wait_for(signal, timeout=timeout)
             self._store_captured_output(step, host)
-            elapsed = int(time.time() - start_time)
+            elapsed = (time.monotonic_ns() - start_ns) // 1_000_000_000
             if self.executor.logger:
                 self.executor.logger.log_detail("execute_complete", f"Command completed on {window_name}", {
                     "elapsed_sec": elapsed,
@@ -169,39 +295,8 @@ class ExecuteHelper:
             if wait_result.returncode == 0:
                 return True, f"Command completed ({elapsed}s)"
             return False, "Command failed or wait-for timed out"
-        else:
-            if host == "local":
-                try:
-                    result = subprocess.run(
-                        commands,
-                        shell=True,
-                        capture_output=True,
-                        text=True,
-                        timeout=timeout,
-                    )
-                    duration_ms = int((time.time() - start_time) * 1000)
-                    if self.executor.logger:
-                        self.executor.logger.log_ssh("local", commands, result.returncode, result.stdout, result.stderr, duration_ms)
-                    self._store_captured_output(step, "local")
-                    return result.returncode == 0, result.stdout or result.stderr
-                except subprocess.TimeoutExpired:
-                    return False, f"Command timed out after {timeout}s"
-
-            ssh_args = self.build_ssh_args(host, command=commands, tty=False)
-            try:
-                result = subprocess.run(
-                    ssh_args,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
-                duration_ms = int((time.time() - start_time) * 1000)
-                if self.executor.logger:
-                    self.executor.logger.log_ssh(host, commands, result.returncode, result.stdout, result.stderr, duration_ms)
-                self._store_captured_output(step, host)
-                return result.returncode == 0, result.stdout or result.stderr
-            except subprocess.TimeoutExpired:
-                return False, f"Command timed out after {timeout}s"
+
+        return self._run_direct(step, host, commands, timeout, start_ns)
 
     def tmux_send_keys(self, host: str, session: str, text: str) -> None:
         """Send literal text + Enter to tmux session locally or via SSH."""
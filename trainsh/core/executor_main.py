@@ -7,19 +7,20 @@ import time
 import re
 import os
 import shutil
+import signal
 import urllib.request
 import urllib.error
 import concurrent.futures
 import threading
 import shlex
 import socket
-import queue
 from collections import defaultdict
+from functools import cached_property
 from typing import Optional, Dict, List, Callable, Sequence, Any, Tuple
 from datetime import datetime
 
 from .executor_dependencies import _DeferredEvent
-from .executor_runtime import _StepNode, ExecutionContext, WindowInfo
+from .executor_runtime import _StepNode, ExecutionContext, VariableMap, WindowInfo
 from .executor_scheduler import ExecutorSchedulingMixin
 from .executor_support import ExecutorSupportMixin
 from .provider_mixin import ExecutorProviderMixin
@@ -27,7 +28,7 @@ from .provider_mixin import ExecutorProviderMixin
 from ..config import load_config
 from ..constants import RECIPE_FILE_EXTENSION
 from ..constants import CONFIG_DIR, RUNTIME_STATE_DIR
-from .recipe_models import RecipeModel, RecipeStepModel, StepType
+from .recipe_models import RecipeModel
 from .bridge_exec import BridgeExecutionHelper
 from .executor_execute import ExecuteHelper
 from .executor_tmux import TmuxControlHelper
@@ -38,7 +39,7 @@ from .executor_wait import WaitHelper
 from .execution_log import ExecutionLogger
 from .local_tmux import LocalTmuxClient
 from .remote_tmux import RemoteTmuxClient
-from .secrets import get_secrets_manager
+from .secrets import SecretsManager, get_secrets_manager
 from .models import Host, Storage, StorageType
 from .tmux_bridge import TmuxBridgeManager
 from .job_state import (
@@ -54,12 +55,9 @@ from .executor_utils import (
     _build_ssh_args,
     _format_duration,
     _host_from_ssh_spec,
-    _resolve_runpod_host,
-    _resolve_vast_host,
 )
 from ..utils.notifier import Notifier, normalize_channels, parse_bool
 from ..runtime import CallbackManager, CallbackEvent
-from ..pyrecipe.models import ProviderStep
 from .task_state import TaskInstanceState, FINISHED_STATES
 from .ti_dependencies import TIDependencyEvaluator, DependencyContext
 from .pool_manager import RuntimeStatePoolManager
@@ -125,6 +123,10 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
         # Job state management
         self.state_manager = JobStateManager(str(RUNTIME_STATE_DIR))
         self.job_state: Optional[JobState] = None
+        self._last_checkpoint_signature: Optional[tuple] = None
+        self._variables_snapshot_cache: Optional[Tuple[Any, int, Dict[str, str]]] = None
+        self._recipe_path_abs: Optional[Tuple[str, str]] = None
+        self._host_resolve_cache: Dict[str, str] = {}
         from ..runtime import _coerce_max_workers, normalize_executor_name
 
         self.executor_name = normalize_executor_name(executor_name or "sequential")
@@ -133,6 +135,8 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
         self._pool_limits = self._parse_pool_limits(self.executor_kwargs.get("pools", self.executor_kwargs.get("pool_slots")))
         self.run_type = str(run_type or "manual").strip().lower() or "manual"
         self._thread_lock = threading.RLock()
+        # Set on interrupt so helper polling loops and sleep steps return promptly.
+        self._stop_event = threading.Event()
         self._ti_dependency_evaluator = TIDependencyEvaluator()
         self._triggerer = Triggerer()
         self._pool_manager = RuntimeStatePoolManager(
@@ -149,15 +153,14 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
         # Runtime state
         self.ctx = ExecutionContext(
             recipe=recipe,
-            variables=dict(recipe.variables),
+            variables=VariableMap(recipe.variables),
             exec_id=self._generate_id(),
             job_id=job_id,
             start_time=datetime.now(),
             log_callback=self.log_callback,
         )
-
-        # Secrets manager
-        self.secrets = get_secrets_manager()
+        # Wall-clock start_time is kept for persistence; durations use this.
+        self._start_ns = time.monotonic_ns()
 
         # Execution logger
         self.logger: Optional[ExecutionLogger] = None
@@ -168,7 +171,7 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
         self.ssh_retry_max_interval = 300  # 5 minutes
 
         # Local tmux bridge for auto split/attach
-        config = load_config()
+        self.config = config = load_config()
         tmux_cfg = config.get("tmux", {})
         self.tmux_bridge = TmuxBridgeManager(
             job_id=self.ctx.job_id,
@@ -192,15 +195,19 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
             log=self.log,
             log_detail=self._log_detail,
             format_duration=_format_duration,
+            stop_event=self._stop_event,
         )
         self.tmux_control = TmuxControlHelper(self, WindowInfo)
-        self.transfer_helper = TransferHelper(self, _resolve_vast_host, _resolve_runpod_host, _host_from_ssh_spec)
-        self.wait_helper = WaitHelper(self, _build_ssh_args, _host_from_ssh_spec, _format_duration)
+        self.wait_helper = WaitHelper(
+            self,
+            _build_ssh_args,
+            _host_from_ssh_spec,
+            _format_duration,
+            stop_event=self._stop_event,
+        )
         self.local_tmux = LocalTmuxClient()
         self._remote_tmux_clients: Dict[str, RemoteTmuxClient] = {}
         self.execute_helper = ExecuteHelper(self, _build_ssh_args, WindowInfo)
-        self.vast_control = VastControlHelper(self, _build_ssh_args, _format_duration)
-        self.runpod_control = RunpodControlHelper(self, _build_ssh_args, _format_duration)
 
         # Notifications
         notify_cfg = config.get("notifications", {})
@@ -232,25 +239,92 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
         except ValueError:
             self.notify_default_fail_on_error = False
 
-        self.notifier = Notifier(log_callback=self.log, app_name=self.notify_app_name)
+        # SSH multiplexing warmup for recipe hosts
+        ssh_cfg = config.get("ssh", {})
+        try:
+            self.prewarm_ssh_masters = parse_bool(ssh_cfg.get("prewarm_masters", True))
+        except ValueError:
+            self.prewarm_ssh_masters = True
+
         self.callback_manager = CallbackManager(callback_sinks or [])
         self._closed = False
 
+    @cached_property
+    def secrets(self) -> SecretsManager:
+        return get_secrets_manager()
+
+    # Provider and notification helpers are only built when a step needs them.
+    @cached_property
+    def transfer_helper(self) -> TransferHelper:
+        # Route cloud lookups through _resolve_host so transfers share its per-run cache.
+        return TransferHelper(
+            self,
+            lambda instance_id: self._resolve_host(f"vast:{instance_id}"),
+            lambda pod_id: self._resolve_host(f"runpod:{pod_id}"),
+            _host_from_ssh_spec,
+        )
+
+    @cached_property
+    def vast_control(self) -> VastControlHelper:
+        return VastControlHelper(self, _build_ssh_args, _format_duration)
+
+    @cached_property
+    def runpod_control(self) -> RunpodControlHelper:
+        return RunpodControlHelper(self, _build_ssh_args, _format_duration)
+
+    @cached_property
+    def notifier(self) -> Notifier:
+        return Notifier(log_callback=self.log, app_name=self.notify_app_name)
+
+    # Global host/storage files are read once per run rather than per transfer.
+    @cached_property
+    def global_hosts(self) -> Dict[str, Any]:
+        from ..commands.host import load_hosts
+
+        return load_hosts()
+
+    @cached_property
+    def global_storages(self) -> Dict[str, Any]:
+        from ..commands.storage import load_storages
+
+        return load_storages()
+
     def get_tmux_client(self, host: str):
         """Get tmux client for local/remote host with caching."""
         if host == "local":
             return self.local_tmux
 
-        client = self._remote_tmux_clients.get(host)
+        # Key on the normalized spec so every reference to one destination
+        # shares a client (and the SSH master connection behind it).
+        key = host.strip()
+        client = self._remote_tmux_clients.get(key)
         if client is None:
-            client = RemoteTmuxClient(host, _build_ssh_args)
-            self._remote_tmux_clients[host] = client
+            client = RemoteTmuxClient(key, _build_ssh_args)
+            self._remote_tmux_clients[key] = client
         return client
 
     def _generate_id(self) -> str:
         """Generate unique execution ID."""
-        import uuid
-        return str(uuid.uuid4())[:8]
+        return os.urandom(4).hex()
+
+    def _checkpoint_recipe_path(self) -> str:
+        """Absolute recipe path for checkpoints, normalized once per recipe_path value."""
+        cached = self._recipe_path_abs
+        if cached is None or cached[0] != self.recipe_path:
+            cached = (self.recipe_path, os.path.abspath(os.path.expanduser(self.recipe_path)))
+            self._recipe_path_abs = cached
+        return cached[1]
+
+    def _variables_snapshot(self) -> Dict[str, str]:
+        """Plain copy of ctx.variables, shared between checkpoints until a variable changes."""
+        variables = self.ctx.variables
+        version = getattr(variables, "version", None)
+        cached = self._variables_snapshot_cache
+        if version is not None and cached is not None and cached[0] is variables and cached[1] == version:
+            return cached[2]
+        snapshot = dict(variables)
+        self._variables_snapshot_cache = None if version is None else (variables, version, snapshot)
+        return snapshot
 
     def _save_checkpoint(self, step_num: int, status: str = "running") -> None:
         """Save current execution state for resume capability."""
@@ -266,6 +340,21 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
             if window.remote_session:
                 window_sessions[name] = window.remote_session
 
+        bridge_session = self.tmux_bridge.get_state_session()
+        variables = self._variables_snapshot()
+        # Re-saving an unchanged running checkpoint would only append a duplicate record.
+        signature = (
+            step_num,
+            status,
+            variables,
+            tuple(hosts.items()),
+            tuple(window_sessions.items()),
+            self.ctx.next_window_index,
+            bridge_session,
+        )
+        if status == "running" and signature == self._last_checkpoint_signature:
+            return
+
         # Get vast instance tracking info
         vast_instance_id = self.ctx.variables.get("VAST_ID") or self.ctx.variables.get("_vast_instance_id")
         vast_start_time = self.ctx.variables.get("_vast_start_time")
@@ -274,17 +363,17 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
 
         self.job_state = JobState(
             job_id=self.ctx.job_id,
-            recipe_path=os.path.abspath(os.path.expanduser(self.recipe_path)),
+            recipe_path=self._checkpoint_recipe_path(),
             recipe_name=self.recipe.name,
             current_step=step_num,
             total_steps=len(self.recipe.steps),
             status=status,
-            variables=dict(self.ctx.variables),
+            variables=variables,
             hosts=hosts,
             storages=self._storage_snapshot(),
             window_sessions=window_sessions,
             next_window_index=self.ctx.next_window_index,
-            bridge_session=self.tmux_bridge.get_state_session(),
+            bridge_session=bridge_session,
             vast_instance_id=vast_instance_id,
             vast_start_time=vast_start_time,
             runpod_pod_id=runpod_pod_id,
@@ -295,6 +384,7 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
             "",
         )
         self.state_manager.save(self.job_state)
+        self._last_checkpoint_signature = signature
 
     def allocate_window_session_name(self) -> str:
         """Allocate next tmux session name for tmux.open in this job."""
@@ -314,7 +404,7 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
 
     def log(self, msg: str) -> None:
         """Log a message."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = time.strftime("%H:%M:%S")
         with self._thread_lock:
             self.log_callback(f"[{timestamp}] {msg}")
 
@@ -406,19 +496,24 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
             storages=self._storage_snapshot(),
         )
 
+        self._prewarm_ssh()
+
         from ..runtime import PARALLEL_EXECUTOR_ALIASES
 
         parallel_executors = PARALLEL_EXECUTOR_ALIASES
+        previous_sigint = self._install_interrupt_handler()
         try:
             if self.executor_name in parallel_executors:
                 success = self._execute_with_dependencies(resume_from=resume_from)
             else:
                 success = self._execute_sequential(resume_from=resume_from)
         finally:
+            if previous_sigint is not None:
+                signal.signal(signal.SIGINT, previous_sigint)
             self._pool_manager.close()
 
         # Finalize
-        total_ms = int((datetime.now() - self.ctx.start_time).total_seconds() * 1000)
+        total_ms = (time.monotonic_ns() - self._start_ns) // 1_000_000
         if self.logger:
             self.logger.end(success, total_ms, dict(self.ctx.variables))
         self._emit_event(
@@ -439,11 +534,35 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
 
         return success
 
+    def _install_interrupt_handler(self) -> Any:
+        """Wake pending sleeps on Ctrl-C, then defer to the previous SIGINT handler.
+
+        Returns the handler to restore, or None when nothing was installed.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        previous = signal.getsignal(signal.SIGINT)
+        if previous is signal.SIG_IGN:
+            return None
+
+        def _on_interrupt(signum, frame):
+            self._stop_event.set()
+            if callable(previous):
+                previous(signum, frame)
+            else:
+                raise KeyboardInterrupt
+
+        signal.signal(signal.SIGINT, _on_interrupt)
+        return previous if previous is not None else signal.SIG_DFL
+
     def close(self) -> None:
         """Release executor-owned resources."""
         if self._closed:
             return
         self._closed = True
+        self._stop_event.set()
+        self.tmux_control.discard_prepared_sessions()
+        self._remote_tmux_clients.clear()
         logger = getattr(self, "logger", None)
         if logger is not None:
             close = getattr(logger, "close", None)
@@ -479,68 +598,6 @@ class DSLExecutor(ExecutorSchedulingMixin, ExecutorProviderMixin, ExecutorSuppor
     def __del__(self):
         self.close()
 
-    def _execute_step(self, step) -> tuple[bool, str]:
-        """Execute a single step."""
-        step = self._coerce_step(step)
-
-        if isinstance(step, ProviderStep):
-            return self._exec_provider(step)
-
-        if getattr(step, "command", "") == "provider":
-            return self._exec_provider(step)
-
-        handlers = {
-            StepType.CONTROL: self._exec_control,
-            StepType.EXECUTE: self._exec_execute,
-            StepType.TRANSFER: self._exec_transfer,
-            StepType.WAIT: self._exec_wait,
-        }
-
-        handler = handlers.get(step.type)
-        if handler:
-            return handler(step)
-
-        return False, f"Unknown step type: {step.type}"
-
-    def _exec_control(self, step: RecipeStepModel) -> tuple[bool, str]:
-        """Execute control command."""
-        cmd = step.command
-        args = step.args
-
-        # Parse command
-        if cmd == "tmux.open":
-            return self._cmd_tmux_open(args)
-        elif cmd == "tmux.close":
-            return self._cmd_tmux_close(args)
-        elif cmd == "tmux.config":
-            return self._cmd_tmux_config(args)
-        elif cmd == "notify":
-            return self._cmd_notify(args)
-        elif cmd == "vast.start":
-            return self._cmd_vast_start(args)
-        elif cmd == "vast.stop":
-            return self._cmd_vast_stop(args)
-        elif cmd == "vast.pick":
-            return self._cmd_vast_pick(args)
-        elif cmd == "vast.wait":
-            return self._cmd_vast_wait(args)
-        elif cmd == "vast.cost":
-            return self._cmd_vast_cost(args)
-        elif cmd == "runpod.start":
-            return self._cmd_runpod_start(args)
-        elif cmd == "runpod.stop":
-            return self._cmd_runpod_stop(args)
-        elif cmd == "runpod.pick":
-            return self._cmd_runpod_pick(args)
-        elif cmd == "runpod.wait":
-            return self._cmd_runpod_wait(args)
-        elif cmd == "runpod.cost":
-            return self._cmd_runpod_cost(args)
-        elif cmd == "sleep":
-            return self._cmd_sleep(args)
-        else:
-            return False, f"Unknown control command: {cmd}"
-
 
 def run_recipe(
     path: str,
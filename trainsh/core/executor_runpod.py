@@ -5,7 +5,9 @@ from __future__ import annotations
 
 import time
 from datetime import datetime
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from .executor_utils import _parse_pick_args
 
 
 class RunpodControlHelper:
@@ -21,6 +23,14 @@ class RunpodControlHelper:
         self.build_ssh_args = build_ssh_args
         self.format_duration = format_duration
 
+    def _pause(self, seconds: float) -> bool:
+        """Sleep between polls; return True when the executor has been asked to stop."""
+        stop_event = getattr(self.executor, "_stop_event", None)
+        if stop_event is None:
+            time.sleep(seconds)
+            return False
+        return stop_event.wait(seconds)
+
     def _resolve_pod_id(self, value: Any) -> Optional[str]:
         """Resolve a RunPod Pod ID from a direct id or a recipe host alias."""
         text = str(value or "").strip()
@@ -109,74 +119,29 @@ class RunpodControlHelper:
         from ..constants import DEFAULT_RUNPOD_IMAGE, DEFAULT_RUNPOD_VOLUME_GB
         from ..services.runpod_api import RunpodAPIError, get_runpod_client
 
-        host_name = None
-        gpu_name = None
-        num_gpus = None
-        min_gpu_ram = None
-        max_dph = None
-        limit = 20
-        skip_if_set = True
-        auto_select = False
-        create_if_missing = False
-        image = DEFAULT_RUNPOD_IMAGE
-        disk_gb = 50.0
-        volume_gb = float(DEFAULT_RUNPOD_VOLUME_GB)
-        label = None
-        cloud_type = "SECURE"
-
-        for arg in args:
-            if "=" in arg:
-                key, _, value = arg.partition("=")
-                value = self.executor._interpolate(value)
-                if key in ("host", "host_name"):
-                    host_name = value
-                elif key in ("gpu", "gpu_name"):
-                    gpu_name = value
-                elif key in ("num_gpus", "gpus"):
-                    try:
-                        num_gpus = int(value)
-                    except ValueError:
-                        return False, f"Invalid num_gpus: {value}"
-                elif key in ("min_gpu_ram", "min_vram_gb"):
-                    try:
-                        min_gpu_ram = float(value)
-                    except ValueError:
-                        return False, f"Invalid min_gpu_ram: {value}"
-                elif key in ("max_dph", "max_price"):
-                    try:
-                        max_dph = float(value)
-                    except ValueError:
-                        return False, f"Invalid max_dph: {value}"
-                elif key == "limit":
-                    try:
-                        limit = int(value)
-                    except ValueError:
-                        return False, f"Invalid limit: {value}"
-                elif key == "skip_if_set":
-                    skip_if_set = value.lower() in ("1", "true", "yes", "y")
-                elif key == "auto_select":
-                    auto_select = value.lower() in ("1", "true", "yes", "y")
-                elif key == "create_if_missing":
-                    create_if_missing = value.lower() in ("1", "true", "yes", "y")
-                elif key == "image":
-                    image = value or image
-                elif key in ("disk_gb", "disk"):
-                    try:
-                        disk_gb = float(value)
-                    except ValueError:
-                        return False, f"Invalid disk_gb: {value}"
-                elif key == "volume_gb":
-                    try:
-                        volume_gb = float(value)
-                    except ValueError:
-                        return False, f"Invalid volume_gb: {value}"
-                elif key == "label":
-                    label = value or None
-                elif key == "cloud_type":
-                    cloud_type = value.strip().upper() or cloud_type
-                continue
-            if host_name is None:
-                host_name = self.executor._interpolate(arg)
+        options: Dict[str, Any] = {
+            "host_name": None,
+            "gpu_name": None,
+            "num_gpus": None,
+            "min_gpu_ram": None,
+            "max_dph": None,
+            "limit": 20,
+            "skip_if_set": True,
+            "auto_select": False,
+            "create_if_missing": False,
+            "image": DEFAULT_RUNPOD_IMAGE,
+            "disk_gb": 50.0,
+            "volume_gb": float(DEFAULT_RUNPOD_VOLUME_GB),
+            "label": None,
+            "cloud_type": "SECURE",
+        }
+        error = _parse_pick_args(args, self.executor._interpolate, options)
+        if error:
+            return False, error
+        (
+            host_name, gpu_name, num_gpus, min_gpu_ram, max_dph, limit, skip_if_set,
+            auto_select, create_if_missing, image, disk_gb, volume_gb, label, cloud_type,
+        ) = options.values()
 
         if host_name:
             if host_name.startswith("@"):
@@ -399,7 +364,8 @@ class RunpodControlHelper:
                             self.executor.ctx.variables["_runpod_start_time"] = datetime.now().isoformat()
                         return True, f"Pod is SSH-ready: {pod_id}"
 
-                time.sleep(max(poll_interval, 1))
+                if self._pause(max(poll_interval, 1)):
+                    return False, "Wait interrupted"
 
             message = (
                 f"RunPod Pod {pod_id} did not become SSH-ready within {timeout}s "
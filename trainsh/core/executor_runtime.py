@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Callable, Dict, List, Optional
@@ -9,7 +10,59 @@ from typing import Callable, Dict, List, Optional
 from .recipe_models import RecipeModel
 
 
-@dataclass
+class VariableMap(dict):
+    """Recipe variables that count their mutations so snapshots can be reused."""
+
+    __slots__ = ("version", "_version_lock")
+
+    def __init__(self, *args, **kwargs):
+        self._version_lock = threading.Lock()
+        self.version = 0
+        super().__init__(*args, **kwargs)
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def _bump(self) -> None:
+        # Parallel steps may set variables; a lost increment would reuse a stale snapshot.
+        with self._version_lock:
+            self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._bump()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._bump()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._bump()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._bump()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._bump()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._bump()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._bump()
+
+
+@dataclass(slots=True)
 class WindowInfo:
     """Tracks a remote tmux session."""
 
@@ -18,7 +71,7 @@ class WindowInfo:
     remote_session: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionContext:
     """Runtime context for recipe execution."""
 
@@ -32,7 +85,7 @@ class ExecutionContext:
     log_callback: Optional[Callable[[str], None]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class _StepNode:
     """Runtime step node used for dependency scheduling."""
 
@@ -54,7 +107,7 @@ class _StepNode:
     deferrable: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class _DeferredEvent:
     task_id: str
     started_at: float
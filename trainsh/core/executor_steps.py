@@ -5,7 +5,6 @@ from __future__ import annotations
 import concurrent.futures
 import time
 from collections import defaultdict
-from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..pyrecipe.models import ProviderStep
@@ -337,9 +336,9 @@ class ExecutorStepRuntimeMixin:
         step = self._coerce_step(step)
         step_id = step_id or ""
         step_num = int(step_num)
-        step_details = self._build_step_details(step)
 
         if emit_events:
+            step_details = self._build_step_details(step)
             self._emit_event(
                 "step_start",
                 step_num=step_num,
@@ -356,7 +355,7 @@ class ExecutorStepRuntimeMixin:
         if track_checkpoint:
             self._save_checkpoint(step_num - 1)
 
-        start = datetime.now()
+        start_ns = time.monotonic_ns()
         try:
             timeout_secs = max(0, int(execution_timeout))
             ok, output = self._execute_step_with_timeout(
@@ -366,7 +365,7 @@ class ExecutorStepRuntimeMixin:
                 step_num=step_num,
                 try_number=try_number,
             )
-            duration_ms = int((datetime.now() - start).total_seconds() * 1000)
+            duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
             state = TaskInstanceState.SUCCESS if ok else TaskInstanceState.FAILED
             if emit_events:
@@ -1,20 +1,127 @@
-"""Bridge, delegation, and interpolation helpers for the DSL executor."""
+"""Dispatch, bridge, delegation, and interpolation helpers for the DSL executor."""
 
 from __future__ import annotations
 
+import queue
 import re
 import shlex
 import subprocess
-import time
-from typing import Any, Dict, List, Optional
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
 
+from ..pyrecipe.models import ProviderStep
 from .executor_runtime import WindowInfo
-from .executor_utils import _resolve_runpod_host, _resolve_vast_host
+from .executor_utils import _lookup_runpod_host, _lookup_vast_host, _open_ssh_master
 from .models import Host
+from .recipe_models import RecipeStepModel, StepType
 from .runtime_store import to_jsonable
 
 
+# ${VAR} / ${secret:NAME} or the $VAR shorthand, matched in one scan.
+_RE_INTERPOLATE = re.compile(r'\$\{([^}]+)\}|\$(\w+)')
+
+# 10, 10s, 5m, 1h (case-insensitive, surrounding whitespace allowed).
+_RE_DURATION = re.compile(r'^\s*([+-]?\d+)\s*([smh]?)\s*$', re.IGNORECASE)
+
+_DURATION_UNITS = {"": 1, "h": 3600, "m": 60, "s": 1}
+
+
+@lru_cache(maxsize=1024)
+def _split_template(text: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[Optional[str], Optional[str]], ...]]:
+    """Split text once into literal runs and (${ref}, $name) references."""
+    parts = _RE_INTERPOLATE.split(text)
+    return tuple(parts[0::3]), tuple(zip(parts[1::3], parts[2::3]))
+
+
 class ExecutorSupportMixin:
+    SSH_PREWARM_MAX_WORKERS = 8
+    # Step type / control command -> handler method name; resolved per call so patched handlers apply.
+    _STEP_HANDLERS = {
+        StepType.CONTROL: "_exec_control",
+        StepType.EXECUTE: "_exec_execute",
+        StepType.TRANSFER: "_exec_transfer",
+        StepType.WAIT: "_exec_wait",
+    }
+    _CONTROL_HANDLERS = {
+        "tmux.open": "_cmd_tmux_open",
+        "tmux.close": "_cmd_tmux_close",
+        "tmux.config": "_cmd_tmux_config",
+        "notify": "_cmd_notify",
+        "vast.start": "_cmd_vast_start",
+        "vast.stop": "_cmd_vast_stop",
+        "vast.pick": "_cmd_vast_pick",
+        "vast.wait": "_cmd_vast_wait",
+        "vast.cost": "_cmd_vast_cost",
+        "runpod.start": "_cmd_runpod_start",
+        "runpod.stop": "_cmd_runpod_stop",
+        "runpod.pick": "_cmd_runpod_pick",
+        "runpod.wait": "_cmd_runpod_wait",
+        "runpod.cost": "_cmd_runpod_cost",
+        "sleep": "_cmd_sleep",
+    }
+
+    def _execute_step(self, step) -> tuple[bool, str]:
+        """Execute a single step."""
+        step = self._coerce_step(step)
+
+        if isinstance(step, ProviderStep):
+            return self._exec_provider(step)
+
+        if getattr(step, "command", "") == "provider":
+            return self._exec_provider(step)
+
+        handler = self._STEP_HANDLERS.get(step.type)
+        if handler:
+            return getattr(self, handler)(step)
+
+        return False, f"Unknown step type: {step.type}"
+
+    def _exec_control(self, step: RecipeStepModel) -> tuple[bool, str]:
+        """Execute control command."""
+        handler = self._CONTROL_HANDLERS.get(step.command)
+        if handler is None:
+            return False, f"Unknown control command: {step.command}"
+        return getattr(self, handler)(step.args)
+
+    def _prewarm_ssh(self) -> List[threading.Thread]:
+        """Open SSH masters to the recipe's remote hosts in the background.
+
+        Handshakes then overlap instead of landing on the first step for each
+        host. Cloud hosts are skipped until a step resolves them; failures are
+        ignored and the first real command connects as usual. Workers are
+        daemon threads so an unreachable host never holds up process exit.
+        Returns the started threads.
+        """
+        if not self.prewarm_ssh_masters:
+            return []
+        hosts = set()
+        for spec in self.recipe.hosts.values():
+            spec = str(spec or "").strip()
+            if spec and spec != "local" and not spec.startswith(("vast:", "runpod:")):
+                hosts.add(spec)
+        if not hosts:
+            return []
+        pending: queue.SimpleQueue[str] = queue.SimpleQueue()
+        for host in sorted(hosts):
+            pending.put(host)
+
+        def _drain() -> None:
+            while True:
+                try:
+                    host = pending.get_nowait()
+                except queue.Empty:
+                    return
+                _open_ssh_master(host)
+
+        threads = [
+            threading.Thread(target=_drain, name=f"trainsh-ssh-prewarm_{index}", daemon=True)
+            for index in range(min(self.SSH_PREWARM_MAX_WORKERS, len(hosts)))
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
     def _log_detail(self, event: str, message: str, data: Dict[str, object]) -> None:
         """Safe logger detail helper for composed helpers."""
         if self.logger:
@@ -87,18 +194,22 @@ class ExecutorSupportMixin:
 
     def _cmd_vast_start(self, args: List[str]) -> tuple[bool, str]:
         """Handle vast.start via helper."""
+        self._invalidate_host_caches()
         return self.vast_control.cmd_vast_start(args)
 
     def _cmd_vast_stop(self, args: List[str]) -> tuple[bool, str]:
         """Handle vast.stop via helper."""
+        self._invalidate_host_caches()
         return self.vast_control.cmd_vast_stop(args)
 
     def _cmd_vast_pick(self, args: List[str]) -> tuple[bool, str]:
         """Handle vast.pick via helper."""
+        self._invalidate_host_caches()
         return self.vast_control.cmd_vast_pick(args)
 
     def _cmd_vast_wait(self, args: List[str]) -> tuple[bool, str]:
         """Handle vast.wait via helper."""
+        self._invalidate_host_caches()
         return self.vast_control.cmd_vast_wait(args)
 
     def _verify_ssh_connection(self, ssh_spec: str, timeout: int = 10) -> bool:
@@ -115,18 +226,22 @@ class ExecutorSupportMixin:
 
     def _cmd_runpod_start(self, args: List[str]) -> tuple[bool, str]:
         """Handle runpod.start via helper."""
+        self._invalidate_host_caches()
         return self.runpod_control.cmd_runpod_start(args)
 
     def _cmd_runpod_stop(self, args: List[str]) -> tuple[bool, str]:
         """Handle runpod.stop via helper."""
+        self._invalidate_host_caches()
         return self.runpod_control.cmd_runpod_stop(args)
 
     def _cmd_runpod_pick(self, args: List[str]) -> tuple[bool, str]:
         """Handle runpod.pick via helper."""
+        self._invalidate_host_caches()
         return self.runpod_control.cmd_runpod_pick(args)
 
     def _cmd_runpod_wait(self, args: List[str]) -> tuple[bool, str]:
         """Handle runpod.wait via helper."""
+        self._invalidate_host_caches()
         return self.runpod_control.cmd_runpod_wait(args)
 
     def _cmd_runpod_cost(self, args: List[str]) -> tuple[bool, str]:
@@ -141,7 +256,8 @@ class ExecutorSupportMixin:
         # Interpolate the duration argument
         duration_str = self._interpolate(args[0])
         duration = self._parse_duration(duration_str)
-        time.sleep(duration)
+        if self._stop_event.wait(duration):
+            return False, "Sleep interrupted"
         return True, f"Slept for {duration}s"
 
     def _exec_execute(self, step: RecipeStepModel) -> tuple[bool, str]:
@@ -193,10 +309,31 @@ class ExecutorSupportMixin:
             host = host_ref
 
         if host.startswith("vast:"):
-            return _resolve_vast_host(host[5:])
-        if host.startswith("runpod:"):
-            return _resolve_runpod_host(host[7:])
-        return host
+            lookup, ident = _lookup_vast_host, host[5:]
+        elif host.startswith("runpod:"):
+            lookup, ident = _lookup_runpod_host, host[7:]
+        else:
+            return host
+
+        # Cloud lookups hit the provider API and probe SSH; reuse verified ones
+        # until a provider command may have changed the instance. Fallback
+        # specs are retried on the next reference.
+        resolved = self._host_resolve_cache.get(host)
+        if resolved is None:
+            resolved, verified = lookup(ident)
+            if verified:
+                self._host_resolve_cache[host] = resolved
+        return resolved
+
+    def _host_resolution_verified(self, host: str) -> bool:
+        """Whether a vast:/runpod: spec currently resolves to a verified, cached target."""
+        return host in self._host_resolve_cache
+
+    def _invalidate_host_caches(self) -> None:
+        """Forget cloud host resolutions after a provider command may have changed an instance."""
+        self._host_resolve_cache.clear()
+        if "transfer_helper" in self.__dict__:
+            self.transfer_helper.invalidate_caches()
 
     def _resolve_window(self, name: str) -> Optional[WindowInfo]:
         """Resolve a window name to an existing tmux session or host fallback."""
@@ -214,36 +351,45 @@ class ExecutorSupportMixin:
         Runs multiple passes so chained references resolve correctly:
         e.g. var TOKEN = ${secret:GH}  →  var REPO = https://${TOKEN}@…
         """
-        for _ in range(10):  # guard against infinite loops
-            prev = text
-
-            # Handle ${VAR} and ${secret:NAME}
-            def replace_braced(match):
-                ref = match.group(1)
-                if ref.startswith('secret:'):
-                    secret_name = ref[7:]
-                    return self.secrets.get(secret_name) or ""
-                return self.ctx.variables.get(ref, match.group(0))
+        if "$" not in text:
+            return text
 
-            text = re.sub(r'\$\{([^}]+)\}', replace_braced, text)
+        if not self.ctx.variables and "${secret:" not in text:
+            # Nothing could be substituted; references stay as written.
+            return text
 
-            # Handle $VAR shorthand in control command arguments
-            def replace_simple(match):
-                name = match.group(1)
-                return self.ctx.variables.get(name, match.group(0))
-
-            text = re.sub(r'\$(\w+)', replace_simple, text)
+        for _ in range(10):  # guard against infinite loops
+            prev = text
+            text = self._render_template(text)
 
-            if text == prev:
+            if text == prev or "$" not in text:
                 break  # nothing changed, fully resolved
 
         return text
 
+    def _render_template(self, text: str) -> str:
+        """Substitute one pass of ${...} and $VAR references using the cached split."""
+        literals, refs = _split_template(text)
+        if not refs:
+            return text
+        variables = self.ctx.variables
+        out = [literals[0]]
+        for (ref, name), literal in zip(refs, literals[1:]):
+            if ref is None:
+                # $VAR shorthand in control command arguments
+                out.append(variables.get(name, "$" + name))
+            elif ref.startswith('secret:'):
+                out.append(self.secrets.get(ref[7:]) or "")
+            else:
+                out.append(variables.get(ref, "${" + ref + "}"))
+            out.append(literal)
+        return "".join(out)
+
     def _parse_endpoint(self, spec: str) -> 'TransferEndpoint':
         """Parse transfer endpoint via helper."""
         return self.transfer_helper.parse_endpoint(spec)
 
-    def _build_transfer_hosts(self) -> Dict[str, Host]:
+    def _build_transfer_hosts(self) -> MutableMapping[str, Host]:
         """Build transfer hosts via helper."""
         return self.transfer_helper.build_transfer_hosts()
 
@@ -261,11 +407,8 @@ class ExecutorSupportMixin:
 
     def _parse_duration(self, value: str) -> int:
         """Parse duration: 10s, 5m, 1h"""
-        value = value.strip().lower()
-        if value.endswith('h'):
-            return int(value[:-1]) * 3600
-        elif value.endswith('m'):
-            return int(value[:-1]) * 60
-        elif value.endswith('s'):
-            return int(value[:-1])
-        return int(value)
+        match = _RE_DURATION.match(value)
+        if match is None:
+            raise ValueError(f"Invalid duration: {value!r}")
+        amount, unit = match.groups()
+        return int(amount) * _DURATION_UNITS[unit.lower()]
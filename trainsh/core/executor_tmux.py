@@ -2,10 +2,15 @@
 # Keeps tmux.open/tmux.close/tmux.config logic out of DSLExecutor.
 
 import os
+import threading
+from functools import cached_property
 from pathlib import Path
-from typing import Any, List, Type
+from typing import Any, Dict, List, Optional, Type
 
-from ..config import get_default_config, load_config
+from ..config import get_default_config
+from .local_tmux import TmuxCmdResult
+from .recipe_models import StepType
+from .remote_tmux import NO_SERVER_MARKER, WRITE_FAILED_RC
 
 
 class TmuxControlHelper:
@@ -18,6 +23,62 @@ class TmuxControlHelper:
     ):
         self.executor = executor
         self.window_cls = window_cls
+        # Sessions created ahead of later tmux.open steps, per resolved host.
+        self._prepared_sessions: Dict[str, List[str]] = {}
+        self._prepare_lock = threading.Lock()
+        # Rendered tmux.conf and option count; executor.config is fixed for the run.
+        self._tmux_conf_cache: Optional[tuple[str, int]] = None
+
+    def _following_opens(self, host: str) -> int:
+        """Count the unconditional tmux.open steps right after this one that target host."""
+        recipe = getattr(self.executor, "recipe", None)
+        current = getattr(self.executor, "_current_step_num", None)
+        if recipe is None or current is None:
+            return 0
+        count = 0
+        for step in recipe.steps[current():]:
+            if getattr(step, "type", None) != StepType.CONTROL or step.command != "tmux.open":
+                break
+            if step.condition or len(step.args) < 3 or step.args[1] != "as":
+                break
+            if self.executor._resolve_host(step.args[0]) != host:
+                break
+            count += 1
+        return count
+
+    def _open_remote_session(self, host: str, remote_tmux: Any) -> tuple[str, Any]:
+        """Take a prepared session for host, or create this one plus the following opens in one call.
+
+        Later sessions that could not be created are simply not stashed; their
+        steps create their own when they run.
+        """
+        with self._prepare_lock:
+            prepared = self._prepared_sessions.get(host)
+            if prepared:
+                return prepared.pop(0), None
+            name = self.executor.allocate_window_session_name()
+            following = self._following_opens(host)
+            if not following:
+                return name, remote_tmux.ensure_session(name)
+            names = [name] + [self.executor.allocate_window_session_name() for _ in range(following)]
+            result = remote_tmux.ensure_sessions(names)
+            ensured = remote_tmux.ensured_session_names(result, names)
+            self._prepared_sessions[host] = [n for n in ensured if n != name]
+            if name in ensured:
+                return name, TmuxCmdResult(0, "", "")
+            return name, TmuxCmdResult(result.returncode or 1, "", result.stderr)
+
+    def discard_prepared_sessions(self) -> None:
+        """Kill sessions created ahead of tmux.open steps that never ran (best effort)."""
+        with self._prepare_lock:
+            prepared, self._prepared_sessions = self._prepared_sessions, {}
+        for host, names in prepared.items():
+            if not names:
+                continue
+            try:
+                self.executor.get_tmux_client(host).kill_sessions(names)
+            except Exception:
+                pass
 
     def cmd_tmux_open(self, args: List[str]) -> tuple[bool, str]:
         """Handle: tmux.open @host as name"""
@@ -28,7 +89,18 @@ class TmuxControlHelper:
         window_name = args[2]
 
         host = self.executor._resolve_host(host_ref)
-        remote_session_name = self.executor.allocate_window_session_name()
+        if host == "local":
+            remote_session_name = self.executor.allocate_window_session_name()
+        else:
+            remote_tmux = self.executor.get_tmux_client(host)
+            try:
+                remote_session_name, result = self._open_remote_session(host, remote_tmux)
+            except Exception as e:
+                if self.executor.logger:
+                    self.executor.logger.log_detail("tmux_error", f"Failed to create session: {e}", {})
+                return False, str(e)
+            if result is not None and result.returncode != 0:
+                return False, f"Failed to create remote tmux session: {result.stderr}"
 
         if self.executor.logger:
             self.executor.logger.log_detail("tmux_open", f"Creating remote tmux session {window_name}", {
@@ -46,13 +118,9 @@ class TmuxControlHelper:
 
         if host == "local":
             try:
-                if not self.executor.local_tmux.has_session(remote_session_name):
-                    result = self.executor.local_tmux.new_session(
-                        remote_session_name,
-                        detached=True,
-                    )
-                    if result.returncode != 0:
-                        return False, f"Failed to create local tmux session: {result.stderr}"
+                result = self.executor.local_tmux.ensure_session(remote_session_name)
+                if result.returncode != 0:
+                    return False, f"Failed to create local tmux session: {result.stderr}"
                 self.executor.ctx.windows[window_name] = window_info
                 self.executor.log(f"  Local tmux session: {remote_session_name}")
                 self.executor.log(f"  Attach with: tmux attach -t {remote_session_name}")
@@ -61,13 +129,7 @@ class TmuxControlHelper:
             except Exception as e:
                 return False, str(e)
 
-        remote_tmux = self.executor.get_tmux_client(host)
         try:
-            if not remote_tmux.has_session(remote_session_name):
-                result = remote_tmux.new_session(remote_session_name, detached=True)
-                if result.returncode != 0:
-                    return False, f"Failed to create remote tmux session: {result.stderr}"
-
             self.executor.ctx.windows[window_name] = window_info
             attach_cmd = remote_tmux.build_attach_command(remote_session_name, status_mode="keep")
             self.executor.log(f"  Remote tmux session: {remote_session_name}")
@@ -128,6 +190,26 @@ class TmuxControlHelper:
         except Exception as e:
             return False, str(e)
 
+    @cached_property
+    def _local_tmux_conf_path(self) -> Path:
+        """Local ~/.tmux.conf, resolved on first tmux.config @local."""
+        return Path(os.path.expanduser("~/.tmux.conf"))
+
+    def _tmux_conf(self) -> tuple[str, int]:
+        """Render tmux.conf content from the executor config once per run."""
+        if self._tmux_conf_cache is None:
+            tmux_options = self.executor.config.get("tmux", {}).get("options", [])
+            if not tmux_options:
+                tmux_options = get_default_config().get("tmux", {}).get("options", [])
+            lines = [
+                "# Generated by tmux-trainsh",
+                "# Applied via: tmux.config @host",
+                "",
+            ]
+            lines.extend(tmux_options)
+            self._tmux_conf_cache = ("\n".join(lines), len(tmux_options))
+        return self._tmux_conf_cache
+
     def cmd_tmux_config(self, args: List[str]) -> tuple[bool, str]:
         """Handle: tmux.config @host"""
         if not args:
@@ -136,29 +218,17 @@ class TmuxControlHelper:
         host_ref = args[0]
         host = self.executor._resolve_host(host_ref)
 
-        config = load_config()
-        tmux_config = config.get("tmux", {})
-        tmux_options = tmux_config.get("options", [])
-        if not tmux_options:
-            tmux_options = get_default_config().get("tmux", {}).get("options", [])
-
-        lines = [
-            "# Generated by tmux-trainsh",
-            "# Applied via: tmux.config @host",
-            "",
-        ]
-        lines.extend(tmux_options)
-        tmux_conf_content = "\n".join(lines)
+        tmux_conf_content, options_count = self._tmux_conf()
 
         if self.executor.logger:
             self.executor.logger.log_detail("tmux_config", f"Applying tmux config to {host}", {
                 "host_ref": host_ref,
                 "resolved_host": host,
-                "options_count": len(tmux_options),
+                "options_count": options_count,
             })
 
         if host == "local":
-            tmux_conf_path = Path(os.path.expanduser("~/.tmux.conf"))
+            tmux_conf_path = self._local_tmux_conf_path
             tmux_conf_path.write_text(tmux_conf_content)
             try:
                 self.executor.local_tmux.run("source-file", str(tmux_conf_path), timeout=10)
@@ -168,14 +238,12 @@ class TmuxControlHelper:
 
         try:
             remote_tmux = self.executor.get_tmux_client(host)
-            write_result = remote_tmux.write_text("~/.tmux.conf", tmux_conf_content)
-            if write_result.returncode != 0:
-                return False, f"Failed to write ~/.tmux.conf: {write_result.stderr}"
-
-            source_result = remote_tmux.run("source-file", "~/.tmux.conf", timeout=30)
-            if source_result.returncode != 0:
-                if remote_tmux.list_sessions("#{session_name}"):
-                    return False, f"Failed to source ~/.tmux.conf: {source_result.stderr}"
+            result = remote_tmux.write_and_source("~/.tmux.conf", tmux_conf_content)
+            if result.returncode == WRITE_FAILED_RC:
+                return False, f"Failed to write ~/.tmux.conf: {result.stderr}"
+            if result.returncode != 0:
+                return False, f"Failed to source ~/.tmux.conf: {result.stderr}"
+            if NO_SERVER_MARKER in result.stdout:
                 return True, f"Applied tmux config file to {host} (no active tmux server to reload)"
 
             return True, f"Applied tmux config to {host}"
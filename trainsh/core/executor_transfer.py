@@ -1,10 +1,15 @@
 # tmux-trainsh transfer helpers
 # Extracts transfer and endpoint parsing logic from DSLExecutor.
 
+import copy
 import os
-from typing import Any, Callable, Dict, Iterable, List, Optional
+import time
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, MutableMapping, Optional
 
-from .models import Host
+from ..services import transfer_engine
+from .models import Host, Storage, TransferEndpoint
 from .storage_specs import (
     build_storage_from_spec,
     parse_inline_storage_endpoint,
@@ -15,6 +20,8 @@ from .storage_specs import (
 class TransferHelper:
     """Helper for transfer steps and endpoint parsing."""
 
+    RESOLVE_MAX_WORKERS = 8
+
     def __init__(
         self,
         executor: Any,
@@ -28,6 +35,14 @@ class TransferHelper:
         if host_from_ssh_spec is None:
             raise TypeError("host_from_ssh_spec is required")
         self.host_from_ssh_spec = host_from_ssh_spec
+        # (recipe specs snapshot, built mapping); reused while the specs are unchanged.
+        self._hosts_cache: Optional[tuple[Dict[str, Any], tuple[Dict[str, Host], Dict[str, Host]]]] = None
+        self._storages_cache: Optional[tuple[Dict[str, Any], Dict[str, Any]]] = None
+
+    def invalidate_caches(self) -> None:
+        """Drop memoized transfer host/storage mappings."""
+        self._hosts_cache = None
+        self._storages_cache = None
 
     def exec_transfer(self, step: Any) -> tuple[bool, str]:
         """Execute file transfer: source -> dest"""
@@ -65,8 +80,6 @@ class TransferHelper:
         if operation == "sync":
             delete = True
 
-        from ..services.transfer_engine import TransferEngine
-
         source = self.executor._interpolate(str(source or "").strip())
         destination = self.executor._interpolate(str(destination or "").strip())
 
@@ -91,9 +104,8 @@ class TransferHelper:
         src_endpoint = self.parse_endpoint(source)
         dst_endpoint = self.parse_endpoint(destination)
 
-        import time
-        start_time = time.time()
-        engine = TransferEngine()
+        start_ns = time.monotonic_ns()
+        engine = transfer_engine.TransferEngine()
         hosts = self.build_transfer_hosts()
         storages = self.build_transfer_storages()
         result = engine.transfer(
@@ -104,7 +116,7 @@ class TransferHelper:
             delete=bool(delete),
             exclude=list(exclude or []),
         )
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
         if self.executor.logger:
             self.executor.logger.log_transfer(
@@ -147,19 +159,17 @@ class TransferHelper:
 
     def parse_endpoint(self, spec: str) -> Any:
         """Parse transfer endpoint: @host:/path, @storage:/path, or /local/path"""
-        from ..commands.host import load_hosts
-        from ..commands.storage import load_storages
-        from ..core.models import TransferEndpoint
+        # Plain paths cannot name a host, storage or inline provider.
+        if spec[:1] in ("/", ".", "~") or (":" not in spec and not spec.startswith("@")):
+            return TransferEndpoint(type="local", path=os.path.expanduser(spec) if spec[:1] == "~" else spec)
 
         if spec.startswith("@"):
             if ":" in spec:
                 name_part, path = spec.split(":", 1)
                 name = name_part[1:]
-                global_storages = load_storages()
-
                 if name in self.executor.recipe.storages:
                     return TransferEndpoint(type="storage", path=path, storage_id=name)
-                if name in global_storages:
+                if name in self.executor.global_storages:
                     return TransferEndpoint(type="storage", path=path, storage_id=name)
 
                 inline_storage = parse_inline_storage_endpoint(f"{name}:{path}")
@@ -171,10 +181,6 @@ class TransferHelper:
                     host = self.executor.recipe.hosts[name]
                     return TransferEndpoint(type="host", path=path, host_id=host)
 
-                global_hosts = load_hosts()
-                if name in global_hosts:
-                    return TransferEndpoint(type="host", path=path, host_id=name)
-
                 return TransferEndpoint(type="host", path=path, host_id=name)
 
             return TransferEndpoint(type="host", path="/", host_id=spec[1:])
@@ -201,36 +207,60 @@ class TransferHelper:
             storage_id, storage_path = inline_storage
             return TransferEndpoint(type="storage", path=storage_path, storage_id=storage_id)
 
-        return TransferEndpoint(type="local", path=os.path.expanduser(spec))
-
-    def build_transfer_hosts(self) -> Dict[str, Host]:
-        """Build host mapping for transfers from recipe host specs and global config."""
-        from ..commands.host import load_hosts
-
-        global_hosts = load_hosts()
-        hosts: Dict[str, Host] = dict(global_hosts)
-
-        for name, spec in self.executor.recipe.hosts.items():
-            if spec == "local":
-                continue
-            resolved_spec = spec
-            if spec.startswith("vast:"):
-                resolved_spec = self.resolve_vast_host(spec[5:])
-            elif spec.startswith("runpod:"):
-                resolved_spec = self.resolve_runpod_host(spec[7:])
-            hosts[name] = self.host_from_ssh_spec(resolved_spec)
-            hosts[spec] = hosts[name]
-        return hosts
+        return TransferEndpoint(type="local", path=spec)
+
+    def build_transfer_hosts(self) -> MutableMapping[str, Host]:
+        """Build host mapping for transfers from recipe host specs and global config.
+
+        Recipe host names win over their specs, which win over global hosts;
+        spec keys stay resolvable because parse_endpoint emits them as host ids.
+        """
+        specs = self.executor.recipe.hosts
+        cached = self._hosts_cache
+        if cached is not None and cached[0] == specs:
+            maps = cached[1]
+        else:
+            resolved = self._resolve_cloud_specs(specs.values())
+            by_name: Dict[str, Host] = {}
+            by_spec: Dict[str, Host] = {}
+            for name, spec in specs.items():
+                if spec == "local":
+                    continue
+                by_name[name] = by_spec[spec] = self.host_from_ssh_spec(resolved.get(spec, spec))
+            maps = (by_name, by_spec)
+            # Unverified cloud fallbacks must be looked up again on the next build.
+            verified = getattr(self.executor, "_host_resolution_verified", None)
+            if verified is None or all(verified(spec) for spec in resolved):
+                self._hosts_cache = (dict(specs), maps)
+            else:
+                self._hosts_cache = None
+        # Fresh front layer keeps caller writes out of the cached maps.
+        return ChainMap({}, *maps, self.executor.global_hosts)
+
+    def _resolve_cloud_host(self, spec: str) -> str:
+        if spec.startswith("vast:"):
+            return self.resolve_vast_host(spec[5:])
+        return self.resolve_runpod_host(spec[7:])
+
+    def _resolve_cloud_specs(self, specs: Iterable[str]) -> Dict[str, str]:
+        """Resolve vast:/runpod: specs, probing several instances concurrently."""
+        cloud = list(dict.fromkeys(spec for spec in specs if spec.startswith(("vast:", "runpod:"))))
+        if len(cloud) < 2:
+            return {spec: self._resolve_cloud_host(spec) for spec in cloud}
+        with ThreadPoolExecutor(max_workers=min(self.RESOLVE_MAX_WORKERS, len(cloud))) as pool:
+            return dict(zip(cloud, pool.map(self._resolve_cloud_host, cloud)))
 
     def build_transfer_storages(self) -> Dict[str, Any]:
         """Build storage mapping for transfers from recipe storage specs."""
-        from ..commands.storage import load_storages
-        from ..core.models import Storage
+        specs = self.executor.recipe.storages
+        cached = self._storages_cache
+        if cached is not None and cached[0] == specs:
+            return dict(cached[1])
 
-        global_storages = load_storages()
+        global_storages = self.executor.global_storages
         storages: Dict[str, Any] = dict(global_storages)
 
-        for name, spec in self.executor.recipe.storages.items():
+        for name, spec in specs.items():
             if isinstance(spec, Storage):
                 storages[name] = spec
                 continue
@@ -247,4 +277,6 @@ class TransferHelper:
             resolved = build_storage_from_spec(spec, storage_name=name)
             if resolved is not None:
                 storages[name] = resolved
-        return storages
+        # Deep snapshot, so in-place edits to nested dict specs invalidate it.
+        self._storages_cache = (copy.deepcopy(specs), storages)
+        return dict(storages)
@@ -1,15 +1,22 @@
 # tmux-trainsh executor utility functions
 # Shared parsing, SSH args, and managed host resolution helpers.
 
+import os
 import shlex
+import socket
 import subprocess
-from typing import Dict, List, Optional, Tuple
-
-from .recipe_models import RecipeModel, StepType
+import threading
+from bisect import bisect_right
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..constants import SSH_CONTROL_DIR
+from .recipe_models import RecipeModel
 from .models import Host, HostType
 
 
-SSH_OPTION_ARGS = {
+SSH_OPTION_ARGS = frozenset({
     "-p",
     "-i",
     "-J",
@@ -19,7 +26,70 @@ SSH_OPTION_ARGS = {
     "-L",
     "-R",
     "-D",
-}
+})
+
+_SHELL_SPLIT_CHARS = frozenset(" \t\r\n'\"\\")
+_SHELL_QUOTE_CHARS = frozenset("'\"\\")
+
+# Unix socket paths are limited to ~104 bytes; %C expands to 40 hex chars.
+SSH_CONTROL_PATH_MAX = 100
+SSH_CONTROL_PERSIST = "60s"
+
+# Control directories already created this process; SSH args are built per call.
+_control_dirs_ready: set[str] = set()
+
+
+def _ssh_control_args(options: List[str]) -> List[str]:
+    """Return OpenSSH master-connection options shared across executor calls."""
+    for index, option in enumerate(options):
+        if option == "-S":
+            return []
+        if option == "-o" and index + 1 < len(options):
+            key = options[index + 1].split("=", 1)[0].strip().lower()
+            if key in {"controlmaster", "controlpath"}:
+                return []
+
+    control_dir = str(SSH_CONTROL_DIR)
+    if len(control_dir) + 41 > SSH_CONTROL_PATH_MAX:
+        return []
+    if control_dir not in _control_dirs_ready:
+        try:
+            os.makedirs(control_dir, mode=0o700, exist_ok=True)
+        except OSError:
+            return []
+        _control_dirs_ready.add(control_dir)
+    return [
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={os.path.join(control_dir, '%C')}",
+        "-o",
+        f"ControlPersist={SSH_CONTROL_PERSIST}",
+    ]
+
+
+def _open_ssh_master(spec: str, timeout: int = 30) -> bool:
+    """Open a persistent SSH master connection for a host spec (best effort)."""
+    args = _build_ssh_args(spec, command="true", tty=False)
+    if "ControlMaster=auto" not in args:
+        return False
+    try:
+        ssh_index = args.index("ssh")
+    except ValueError:
+        return False
+    # ssh keeps the first value given for an option, so these take precedence.
+    warm = ["-o", "BatchMode=yes", "-o", "ConnectTimeout=10"]
+    try:
+        result = subprocess.run(
+            [*args[: ssh_index + 1], *warm, *args[ssh_index + 1 :]],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+        )
+    except Exception:
+        return False
+    return result.returncode == 0
 
 
 def _configured_host_for_spec(spec: str) -> Optional[Host]:
@@ -28,12 +98,14 @@ def _configured_host_for_spec(spec: str) -> Optional[Host]:
     if not text or text == "local":
         return None
 
-    try:
-        tokens = shlex.split(text)
-    except ValueError:
-        return None
-    if len(tokens) != 1:
-        return None
+    # A bare alias has no whitespace or quoting; only tokenize when it might.
+    if not _SHELL_SPLIT_CHARS.isdisjoint(text):
+        try:
+            tokens = shlex.split(text)
+        except ValueError:
+            return None
+        if len(tokens) != 1:
+            return None
 
     try:
         from ..commands.host import load_hosts
@@ -59,7 +131,14 @@ def _insert_tty_flag(args: List[str]) -> List[str]:
 
 def _split_ssh_spec(spec: str) -> Tuple[str, List[str]]:
     """Split SSH spec into host and option args."""
-    tokens = shlex.split(spec) if spec else []
+    host, options = _split_ssh_spec_cached(spec)
+    return host, list(options)
+
+
+@lru_cache(maxsize=256)
+def _split_ssh_spec_cached(spec: str) -> Tuple[str, Tuple[str, ...]]:
+    # Without quotes or escapes shlex.split is plain whitespace splitting.
+    tokens = (spec.split() if _SHELL_QUOTE_CHARS.isdisjoint(spec) else shlex.split(spec)) if spec else []
     host = ""
     options: List[str] = []
     i = 0
@@ -79,7 +158,7 @@ def _split_ssh_spec(spec: str) -> Tuple[str, List[str]]:
         i += 1
     if not host:
         host = spec
-    return host, options
+    return host, tuple(options)
 
 
 def _build_ssh_args(spec: str, command: Optional[str] = None, tty: bool = False, set_term: bool = False) -> List[str]:
@@ -98,12 +177,22 @@ def _build_ssh_args(spec: str, command: Optional[str] = None, tty: bool = False,
 
         client = SSHClient.from_host(configured_host)
         args = client._build_ssh_args(resolved_command, interactive=tty)
-        return _insert_tty_flag(args) if tty else args
+        if tty:
+            return _insert_tty_flag(args)
+        try:
+            ssh_index = args.index("ssh")
+        except ValueError:
+            return args
+        # Share one master connection for repeated non-interactive calls to this host.
+        control = _ssh_control_args(args[ssh_index + 1 :])
+        return [*args[: ssh_index + 1], *control, *args[ssh_index + 1 :]]
 
     host, options = _split_ssh_spec(spec)
     args = ["ssh"]
     if tty:
         args.append("-t")
+    else:
+        args.extend(_ssh_control_args(options))
     args.extend(options)
     args.append(host)
 
@@ -120,6 +209,37 @@ def _build_ssh_args(spec: str, command: Optional[str] = None, tty: bool = False,
     return args
 
 
+def _set_spec_port(fields: Dict[str, object], value: str) -> None:
+    try:
+        fields["port"] = int(value)
+    except ValueError:
+        fields["port"] = 22
+
+
+def _set_spec_key(fields: Dict[str, object], value: str) -> None:
+    fields["ssh_key_path"] = value
+
+
+def _set_spec_jump(fields: Dict[str, object], value: str) -> None:
+    fields["jump_host"] = value
+
+
+def _set_spec_option(fields: Dict[str, object], value: str) -> None:
+    if value.startswith("ProxyCommand="):
+        proxy_command = value.split("=", 1)[1]
+        if proxy_command:
+            fields["env_vars"]["proxy_command"] = proxy_command
+
+
+# Option flag -> handler applied to its value while building a Host from a spec.
+_SSH_SPEC_OPTION_HANDLERS = {
+    "-p": _set_spec_port,
+    "-i": _set_spec_key,
+    "-J": _set_spec_jump,
+    "-o": _set_spec_option,
+}
+
+
 def _host_from_ssh_spec(spec: str) -> Host:
     """Parse SSH spec into a Host object for rsync/ssh."""
     configured_host = _configured_host_for_spec(spec)
@@ -132,56 +252,72 @@ def _host_from_ssh_spec(spec: str) -> Host:
     if "@" in host_token:
         username, hostname = host_token.split("@", 1)
 
-    port = 22
-    key_path = None
-    jump_host = None
-    proxy_command = None
+    fields: Dict[str, object] = {"port": 22, "env_vars": {}}
     i = 0
     while i < len(options):
         opt = options[i]
-        if opt == "-p" and i + 1 < len(options):
-            try:
-                port = int(options[i + 1])
-            except ValueError:
-                port = 22
-            i += 2
-            continue
-        if opt == "-i" and i + 1 < len(options):
-            key_path = options[i + 1]
-            i += 2
-            continue
-        if opt == "-J" and i + 1 < len(options):
-            jump_host = options[i + 1]
-            i += 2
-            continue
-        if opt == "-o" and i + 1 < len(options):
-            opt_value = options[i + 1]
-            if opt_value.startswith("ProxyCommand="):
-                proxy_command = opt_value.split("=", 1)[1]
-            i += 2
-            continue
         if opt in SSH_OPTION_ARGS:
+            if i + 1 < len(options):
+                handler = _SSH_SPEC_OPTION_HANDLERS.get(opt)
+                if handler is not None:
+                    handler(fields, options[i + 1])
             i += 2
             continue
         i += 1
 
-    env_vars = {}
-    if proxy_command:
-        env_vars["proxy_command"] = proxy_command
-
     return Host(
         id=spec,
         name=spec,
         type=HostType.SSH,
         hostname=hostname,
-        port=port,
+        port=fields["port"],
         username=username,
-        ssh_key_path=key_path,
-        jump_host=jump_host,
-        env_vars=env_vars,
+        ssh_key_path=fields.get("ssh_key_path"),
+        jump_host=fields.get("jump_host"),
+        env_vars=fields["env_vars"],
     )
 
 
+# vast.pick / runpod.pick option aliases and value parsers.
+_PICK_ALIASES = {"host": "host_name", "gpu": "gpu_name", "gpus": "num_gpus", "min_vram_gb": "min_gpu_ram", "max_price": "max_dph", "disk": "disk_gb"}
+_PICK_NUMBERS = {"num_gpus": int, "limit": int, "min_gpu_ram": float, "max_dph": float, "disk_gb": float, "volume_gb": float}
+_PICK_FLAGS = {"skip_if_set", "auto_select", "create_if_missing", "direct"}
+
+
+def _parse_pick_args(args: List[str], interpolate: Callable[[str], str], options: Dict[str, Any]) -> Optional[str]:
+    """Fill ``options`` from ``key=value`` pick args; return an error message on bad input.
+
+    The first bare argument is the host alias. Keys missing from ``options``
+    are ignored, so each provider only accepts the options it defaults.
+    """
+    for arg in args:
+        if "=" not in arg:
+            if options["host_name"] is None:
+                options["host_name"] = interpolate(arg)
+            continue
+        key, _, value = arg.partition("=")
+        key = _PICK_ALIASES.get(key, key)
+        value = interpolate(value)
+        if key not in options:
+            continue
+        if key in _PICK_NUMBERS:
+            try:
+                options[key] = _PICK_NUMBERS[key](value)
+            except ValueError:
+                return f"Invalid {key}: {value}"
+        elif key in _PICK_FLAGS:
+            options[key] = value.lower() in ("1", "true", "yes", "y")
+        elif key == "label":
+            options[key] = value or None
+        elif key == "cloud_type":
+            options[key] = value.strip().upper() or options[key]
+        elif key == "image":
+            options[key] = value or options[key]
+        else:
+            options[key] = value
+    return None
+
+
 def _format_duration(seconds: float) -> str:
     """Format seconds into a compact duration string."""
     total_seconds = int(seconds)
@@ -196,18 +332,9 @@ def _format_duration(seconds: float) -> str:
 
 def _infer_window_hosts_from_recipe(recipe: RecipeModel, upto_step: int) -> Dict[str, str]:
     """Infer window->host mapping from tmux.open steps up to a step index."""
+    indices, entries = recipe.tmux_open_index()
     mapping: Dict[str, str] = {}
-    for idx, step in enumerate(recipe.steps):
-        if idx > upto_step:
-            break
-        if step.type != StepType.CONTROL or step.command != "tmux.open":
-            continue
-        if len(step.args) < 3 or step.args[1] != "as":
-            continue
-
-        host_ref = step.args[0]
-        window_name = step.args[2]
-
+    for host_ref, window_name in entries[: bisect_right(indices, upto_step)]:
         if host_ref.startswith("@"):
             host_name = host_ref[1:]
             mapping[window_name] = recipe.hosts.get(host_name, host_name)
@@ -217,12 +344,17 @@ def _infer_window_hosts_from_recipe(recipe: RecipeModel, upto_step: int) -> Dict
     return mapping
 
 
-def _test_ssh_connection(host: str, port: int, timeout: int = 5) -> bool:
-    """Test if SSH connection works."""
+def _test_ssh_connection(host: str, port: int, timeout: int = 5, username: str = "root") -> bool:
+    """Test if SSH connection works.
+
+    The probe opens the shared master connection, so the first real command
+    to the resolved host reuses it instead of paying a second handshake.
+    """
     try:
         result = subprocess.run(
             [
                 "ssh",
+                *_ssh_control_args([]),
                 "-o",
                 "BatchMode=yes",
                 "-o",
@@ -231,7 +363,7 @@ def _test_ssh_connection(host: str, port: int, timeout: int = 5) -> bool:
                 "StrictHostKeyChecking=no",
                 "-p",
                 str(port),
-                f"root@{host}",
+                f"{username}@{host}",
                 "echo ok",
             ],
             capture_output=True,
@@ -243,8 +375,120 @@ def _test_ssh_connection(host: str, port: int, timeout: int = 5) -> bool:
         return False
 
 
-def _resolve_vast_host(instance_id: str) -> str:
-    """Resolve vast.ai instance ID to SSH host spec."""
+def _ssh_banner_reachable(host: str, port: int, timeout: float = 5) -> bool:
+    """Return True when host:port accepts TCP and greets with an SSH banner.
+
+    Reachability only: a proxy may greet before the instance behind it
+    accepts auth, so callers confirm the chosen target separately.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            return sock.recv(4) == b"SSH-"
+    except (OSError, ValueError):
+        return False
+
+
+def _probe_target(target: dict) -> bool:
+    return _ssh_banner_reachable(target["hostname"], int(target["port"]))
+
+
+def _settle(future: Future, probe: Callable[[Any], bool], item: Any) -> None:
+    try:
+        future.set_result(probe(item))
+    except BaseException as exc:
+        future.set_exception(exc)
+
+
+def _probe_in_order(probe: Callable[[Any], bool], items: List[Any]) -> Iterator[bool]:
+    """Run ``probe`` on every item concurrently, yielding results in item order.
+
+    Probes run on daemon threads, so a caller that stops at the first success
+    never waits for the slower ones, not even at interpreter exit.
+    """
+    if len(items) < 2:
+        yield from map(probe, items)
+        return
+    futures: List[Future] = []
+    for index, item in enumerate(items):
+        future: Future = Future()
+        threading.Thread(target=_settle, args=(future, probe, item), name=f"trainsh-ssh-probe_{index}", daemon=True).start()
+        futures.append(future)
+    for future in futures:
+        yield future.result()
+
+
+class _ProbeRuns:
+    """Subprocesses started by concurrent probes, so the losers can be killed."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._procs: List[subprocess.Popen] = []
+        self._cancelled = False
+
+    def run(self, args: List[str], timeout: float) -> subprocess.CompletedProcess:
+        with self._lock:
+            if self._cancelled:
+                return subprocess.CompletedProcess(args, -1, "", "cancelled")
+            proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            self._procs.append(proc)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+    def cancel(self) -> None:
+        """Kill probes still running and refuse to start new ones."""
+        with self._lock:
+            self._cancelled = True
+            procs = list(self._procs)
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+
+
+def _verify_in_order(verify: Callable[..., bool], specs: List[str]) -> Iterator[bool]:
+    """Verify SSH specs concurrently, yielding results in priority order.
+
+    The caller stops at the first success; closing the generator kills
+    the ssh probes still running for lower-priority candidates.
+    """
+    if len(specs) < 2:
+        yield from map(verify, specs)
+        return
+    runs = _ProbeRuns()
+    try:
+        yield from _probe_in_order(lambda spec: verify(spec, runs=runs), specs)
+    finally:
+        runs.cancel()
+
+
+def _confirm_target(target: dict) -> bool:
+    """Authenticate against a target, leaving its shared master open for the next call."""
+    return _test_ssh_connection(
+        str(target["hostname"]),
+        int(target["port"]),
+        username=str(target.get("username") or "root"),
+    )
+
+
+def _first_reachable_target(targets: List[dict]) -> Optional[dict]:
+    """Probe SSH targets concurrently and return the first reachable one in priority order."""
+    for target, reachable in zip(targets, _probe_in_order(_probe_target, targets)):
+        if reachable:
+            return target
+    return None
+
+
+def _lookup_vast_host(instance_id: str) -> Tuple[str, bool]:
+    """Resolve vast.ai instance ID to (SSH host spec, verified).
+
+    Targets are raced on their SSH banner and the winner is confirmed with
+    an authenticated probe. Otherwise the spec is a best-effort fallback and
+    the flag is False, so callers should not hold on to it.
+    """
     from ..services.vast_api import get_vast_client
     from ..services.vast_connection import ssh_target_to_spec, vast_ssh_targets
 
@@ -252,19 +496,25 @@ def _resolve_vast_host(instance_id: str) -> str:
         client = get_vast_client()
         instance = client.get_instance(int(instance_id))
         targets = vast_ssh_targets(instance)
-        for target in targets:
-            if _test_ssh_connection(target["hostname"], int(target["port"])):
-                return ssh_target_to_spec(target)
+        reachable = _first_reachable_target(targets)
+        if reachable is not None:
+            # The Vast proxy sends a banner before the instance accepts auth.
+            return ssh_target_to_spec(reachable), _confirm_target(reachable)
         if targets:
-            return ssh_target_to_spec(targets[0])
+            return ssh_target_to_spec(targets[0]), False
 
-        return f"vast-{instance_id}"
+        return f"vast-{instance_id}", False
     except Exception:
-        return f"vast-{instance_id}"
+        return f"vast-{instance_id}", False
 
 
-def _resolve_runpod_host(pod_id: str) -> str:
-    """Resolve RunPod Pod ID to SSH host spec."""
+def _resolve_vast_host(instance_id: str) -> str:
+    """Resolve vast.ai instance ID to SSH host spec."""
+    return _lookup_vast_host(instance_id)[0]
+
+
+def _lookup_runpod_host(pod_id: str) -> Tuple[str, bool]:
+    """Resolve RunPod Pod ID to (SSH host spec, verified reachable)."""
     from ..services.runpod_api import get_runpod_client
     from ..services.runpod_connection import runpod_ssh_targets, ssh_target_to_spec
 
@@ -272,11 +522,16 @@ def _resolve_runpod_host(pod_id: str) -> str:
         client = get_runpod_client()
         pod = client.get_pod(str(pod_id))
         targets = runpod_ssh_targets(pod)
-        for target in targets:
-            if _test_ssh_connection(target["hostname"], int(target["port"])):
-                return ssh_target_to_spec(target)
+        reachable = _first_reachable_target(targets)
+        if reachable is not None:
+            return ssh_target_to_spec(reachable), _confirm_target(reachable)
         if targets:
-            return ssh_target_to_spec(targets[0])
-        return f"runpod-{pod_id}"
+            return ssh_target_to_spec(targets[0]), False
+        return f"runpod-{pod_id}", False
     except Exception:
-        return f"runpod-{pod_id}"
+        return f"runpod-{pod_id}", False
+
+
+def _resolve_runpod_host(pod_id: str) -> str:
+    """Resolve RunPod Pod ID to SSH host spec."""
+    return _lookup_runpod_host(pod_id)[0]
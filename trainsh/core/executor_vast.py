@@ -4,8 +4,19 @@
 import os
 import subprocess
 import time
+from contextlib import closing
 from datetime import datetime
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from ..services import vast_api
+from ..services.vast_connection import (
+    attached_key_digest,
+    forget_attached_key,
+    load_attached_keys,
+    remember_attached_key,
+    vast_wait_delay,
+)
+from .executor_utils import _ProbeRuns, _parse_pick_args, _verify_in_order
 
 
 class VastControlHelper:
@@ -20,6 +31,23 @@ class VastControlHelper:
         self.executor = executor
         self.build_ssh_args = build_ssh_args
         self.format_duration = format_duration
+        self._client: Any = None
+        self._attached_key_digest: Optional[str] = None
+        self._ssh_auth_denied = False
+
+    def _pause(self, seconds: float) -> bool:
+        """Sleep between polls; return True when the executor has been asked to stop."""
+        stop_event = getattr(self.executor, "_stop_event", None)
+        if stop_event is None:
+            time.sleep(seconds)
+            return False
+        return stop_event.wait(seconds)
+
+    def _vast_client(self) -> Any:
+        """Vast API client, built once per helper instead of per command."""
+        if self._client is None:
+            self._client = vast_api.get_vast_client()
+        return self._client
 
     def _resolve_instance_id(self, value: Any) -> Optional[str]:
         """Resolve a Vast instance id from a direct id or a recipe host alias."""
@@ -44,13 +72,12 @@ class VastControlHelper:
 
     def cmd_vast_start(self, args: List[str]) -> tuple[bool, str]:
         """Handle: vast.start [instance_id]"""
-        from ..services.vast_api import VastAPIError, get_vast_client
-
         try:
             if not args:
                 return False, "No instance ID provided for vast.start"
-            client = get_vast_client()
-            instance_id = self._resolve_instance_id(self.executor._interpolate(args[0])) or self.executor._interpolate(args[0])
+            client = self._vast_client()
+            raw_id = self.executor._interpolate(args[0])
+            instance_id = self._resolve_instance_id(raw_id) or raw_id
 
             if instance_id:
                 try:
@@ -98,31 +125,30 @@ class VastControlHelper:
                         self.executor.logger.log_variable("_vast_instance_id", str(inst_id), "vast.start")
                         self.executor.logger.log_variable("_vast_start_time", self.executor.ctx.variables["_vast_start_time"], "vast.start")
                     return True, f"Started instance: {inst_id}"
-                except VastAPIError as e:
+                except vast_api.VastAPIError as e:
                     msg = f"Failed to start instance {inst_id}: {e}"
                     if self.executor.logger:
                         self.executor.logger.log_vast("start_instance", inst_id, {"instance_id": inst_id}, {"error": str(e)}, False)
                     try:
                         client.stop_instance(inst_id)
                         msg += "; instance stopped"
-                    except VastAPIError as stop_err:
+                    except vast_api.VastAPIError as stop_err:
                         msg += f"; failed to stop instance: {stop_err}"
                     return False, msg
 
-        except (VastAPIError, RuntimeError) as e:
+        except (vast_api.VastAPIError, RuntimeError) as e:
             if self.executor.logger:
                 self.executor.logger.log_vast("vast_start", None, {"args": args}, {"error": str(e)}, False)
             return False, str(e)
 
     def cmd_vast_stop(self, args: List[str]) -> tuple[bool, str]:
         """Handle: vast.stop <instance_id>"""
-        from ..services.vast_api import VastAPIError, get_vast_client
-
         try:
             if not args:
                 return False, "No instance ID provided for vast.stop"
-            client = get_vast_client()
-            instance_id = self._resolve_instance_id(self.executor._interpolate(args[0])) or self.executor._interpolate(args[0])
+            client = self._vast_client()
+            raw_id = self.executor._interpolate(args[0])
+            instance_id = self._resolve_instance_id(raw_id) or raw_id
             if not instance_id:
                 return False, "No instance ID provided for vast.stop"
 
@@ -136,75 +162,33 @@ class VastControlHelper:
 
             return True, f"Stopped instance: {instance_id}"
 
-        except (VastAPIError, RuntimeError) as e:
+        except (vast_api.VastAPIError, RuntimeError) as e:
             return False, str(e)
 
     def cmd_vast_pick(self, args: List[str]) -> tuple[bool, str]:
         """Handle: vast.pick @host ..."""
-        from ..services.vast_api import VastAPIError, get_vast_client
-
-        host_name = None
-        gpu_name = None
-        num_gpus = None
-        min_gpu_ram = None
-        max_dph = None
-        limit = 20
-        skip_if_set = True
-        auto_select = False
-        create_if_missing = False
-        image = "pytorch/pytorch:latest"
-        disk_gb = 50.0
-        label = None
-        direct = False
-
-        for arg in args:
-            if "=" in arg:
-                key, _, value = arg.partition("=")
-                value = self.executor._interpolate(value)
-                if key in ("host", "host_name"):
-                    host_name = value
-                elif key in ("gpu", "gpu_name"):
-                    gpu_name = value
-                elif key in ("num_gpus", "gpus"):
-                    try:
-                        num_gpus = int(value)
-                    except ValueError:
-                        return False, f"Invalid num_gpus: {value}"
-                elif key in ("min_gpu_ram", "min_vram_gb"):
-                    try:
-                        min_gpu_ram = float(value)
-                    except ValueError:
-                        return False, f"Invalid min_gpu_ram: {value}"
-                elif key in ("max_dph", "max_price"):
-                    try:
-                        max_dph = float(value)
-                    except ValueError:
-                        return False, f"Invalid max_dph: {value}"
-                elif key == "limit":
-                    try:
-                        limit = int(value)
-                    except ValueError:
-                        return False, f"Invalid limit: {value}"
-                elif key == "skip_if_set":
-                    skip_if_set = value.lower() in ("1", "true", "yes", "y")
-                elif key == "auto_select":
-                    auto_select = value.lower() in ("1", "true", "yes", "y")
-                elif key == "create_if_missing":
-                    create_if_missing = value.lower() in ("1", "true", "yes", "y")
-                elif key == "image":
-                    image = value or image
-                elif key in ("disk_gb", "disk"):
-                    try:
-                        disk_gb = float(value)
-                    except ValueError:
-                        return False, f"Invalid disk_gb: {value}"
-                elif key == "label":
-                    label = value or None
-                elif key == "direct":
-                    direct = value.lower() in ("1", "true", "yes", "y")
-                continue
-            if host_name is None:
-                host_name = self.executor._interpolate(arg)
+        options: Dict[str, Any] = {
+            "host_name": None,
+            "gpu_name": None,
+            "num_gpus": None,
+            "min_gpu_ram": None,
+            "max_dph": None,
+            "limit": 20,
+            "skip_if_set": True,
+            "auto_select": False,
+            "create_if_missing": False,
+            "image": "pytorch/pytorch:latest",
+            "disk_gb": 50.0,
+            "label": None,
+            "direct": False,
+        }
+        error = _parse_pick_args(args, self.executor._interpolate, options)
+        if error:
+            return False, error
+        (
+            host_name, gpu_name, num_gpus, min_gpu_ram, max_dph, limit, skip_if_set,
+            auto_select, create_if_missing, image, disk_gb, label, direct,
+        ) = options.values()
 
         if host_name:
             if host_name.startswith("@"):
@@ -214,21 +198,7 @@ class VastControlHelper:
         else:
             return False, "No host alias provided for vast.pick"
 
-        pick_filters = {
-            "host_name": host_name,
-            "gpu_name": gpu_name,
-            "num_gpus": num_gpus,
-            "min_gpu_ram": min_gpu_ram,
-            "max_dph": max_dph,
-            "limit": limit,
-            "skip_if_set": skip_if_set,
-            "auto_select": auto_select,
-            "create_if_missing": create_if_missing,
-            "image": image,
-            "disk_gb": disk_gb,
-            "label": label,
-            "direct": direct,
-        }
+        pick_filters = dict(options, host_name=host_name)
         if self.executor.logger:
             self.executor.logger.log_detail("vast_pick", "Picking Vast instance", pick_filters)
 
@@ -251,9 +221,24 @@ class VastControlHelper:
             return True, f"Using existing instance: {existing_id}"
 
         try:
-            client = get_vast_client()
-            instances = client.list_instances()
+            client = self._vast_client()
+            instance_filters = {
+                key: value
+                for key, value in (
+                    ("gpu_name", gpu_name),
+                    ("num_gpus", num_gpus),
+                    ("min_gpu_ram", min_gpu_ram),
+                    ("max_dph", max_dph),
+                )
+                if value
+            }
+            # The client drops non-matching rows before building instances.
+            instances = client.list_instances(**instance_filters)
             if not instances and not create_if_missing:
+                if instance_filters:
+                    if self.executor.logger:
+                        self.executor.logger.log_detail("vast_pick", "No instances match filters", pick_filters)
+                    return False, "No Vast.ai instances match filters"
                 return False, "No Vast.ai instances found"
             if not instances:
                 instances = []
@@ -272,18 +257,6 @@ class VastControlHelper:
                 ]
                 self.executor.logger.log_vast("list_instances", None, {}, {"instances": instances_info, "count": len(instances)}, True)
 
-            def matches_filters(instance: Any) -> bool:
-                if gpu_name and (instance.gpu_name or "").upper() != gpu_name.upper():
-                    return False
-                if num_gpus and (instance.num_gpus or 0) < num_gpus:
-                    return False
-                if min_gpu_ram and instance.gpu_memory_gb < min_gpu_ram:
-                    return False
-                if max_dph and (instance.dph_total or 0.0) > max_dph:
-                    return False
-                return True
-
-            instances = [i for i in instances if matches_filters(i)]
             if not instances:
                 if not create_if_missing:
                     if self.executor.logger:
@@ -430,15 +403,13 @@ class VastControlHelper:
 
             return True, f"Selected instance {selected.id}"
 
-        except (VastAPIError, RuntimeError) as e:
+        except (vast_api.VastAPIError, RuntimeError) as e:
             if self.executor.logger:
                 self.executor.logger.log_vast("pick_error", None, pick_filters, {"error": str(e)}, False)
             return False, str(e)
 
     def cmd_vast_wait(self, args: List[str]) -> tuple[bool, str]:
         """Handle: vast.wait <instance_id> timeout=10m ..."""
-        from ..config import load_config
-        from ..services.vast_api import VastAPIError, get_vast_client
         from ..services.vast_connection import ssh_target_to_command, ssh_target_to_spec, vast_ssh_targets
 
         instance_id = None
@@ -480,12 +451,14 @@ class VastControlHelper:
             self.executor.logger.log_detail("vast_wait", f"Waiting for instance {inst_id}", wait_config)
 
         try:
-            client = get_vast_client()
+            client = self._vast_client()
 
-            config = load_config()
+            config = self.executor.config
             auto_attach = config.get("vast", {}).get("auto_attach_ssh_key", True)
             ssh_key_path = config.get("defaults", {}).get("ssh_key_path", "~/.ssh/id_rsa")
 
+            self._attached_key_digest = None
+            key_rechecked = False
             if auto_attach and ssh_key_path:
                 self.ensure_ssh_key_attached(client, ssh_key_path)
 
@@ -532,17 +505,20 @@ class VastControlHelper:
                     working_target = None
                     working_ssh_spec = None
 
+                    self._ssh_auth_denied = False
+                    specs = [ssh_target_to_spec(target) for target in targets]
                     for target in targets:
-                        ssh_spec = ssh_target_to_spec(target)
-                        ssh_cmd = ssh_target_to_command(target)
                         source = str(target.get("source") or "ssh").replace("_", " ")
-                        self.executor.log(f"  Trying SSH ({source}): {ssh_cmd}")
-                        if self.verify_ssh_connection(ssh_spec):
-                            working_target = target
-                            working_ssh_spec = ssh_spec
-                            self.executor.log(f"  SSH connected successfully via {source}")
-                            break
-                        self.executor.log(f"  SSH candidate failed via {source}")
+                        self.executor.log(f"  Trying SSH ({source}): {ssh_target_to_command(target)}")
+                    with closing(_verify_in_order(self.verify_ssh_connection, specs)) as results:
+                        for target, ssh_spec, ok in zip(targets, specs, results):
+                            source = str(target.get("source") or "ssh").replace("_", " ")
+                            if ok:
+                                working_target = target
+                                working_ssh_spec = ssh_spec
+                                self.executor.log(f"  SSH connected successfully via {source}")
+                                break
+                            self.executor.log(f"  SSH candidate failed via {source}")
 
                     if working_target and working_ssh_spec:
                         self.executor.ctx.variables["_vast_ssh_host"] = str(working_target["hostname"])
@@ -586,6 +562,11 @@ class VastControlHelper:
                         return True, msg
                     else:
                         self.executor.log(f"Instance {inst_id} running but SSH not accessible yet...")
+                        if self._ssh_auth_denied and self._attached_key_digest and not key_rechecked:
+                            # The recorded key may have been removed from the account; check again.
+                            key_rechecked = True
+                            forget_attached_key(self._attached_key_digest)
+                            self.ensure_ssh_key_attached(client, ssh_key_path)
                         if self.executor.logger:
                             self.executor.logger.log_detail("vast_wait", "SSH not accessible yet", {
                                 "ssh_targets": targets,
@@ -596,7 +577,8 @@ class VastControlHelper:
                             })
 
                 self.executor.log(f"Waiting for instance {inst_id}... ({last_status})")
-                time.sleep(poll_interval)
+                if self._pause(vast_wait_delay(poll_count, poll_interval, instance.is_running)):
+                    return False, "Wait interrupted"
 
             msg = f"Instance {inst_id} not ready after {self.format_duration(timeout)} (status: {last_status})"
             if self.executor.logger:
@@ -612,20 +594,23 @@ class VastControlHelper:
                     msg += "; instance stopped"
                     if self.executor.logger:
                         self.executor.logger.log_vast("stop_instance", inst_id, {"reason": "wait_timeout"}, {"stopped": True}, True)
-                except VastAPIError as e:
+                except vast_api.VastAPIError as e:
                     msg += f"; failed to stop instance: {e}"
             self.executor.log(msg)
             return False, msg
 
-        except (VastAPIError, RuntimeError) as e:
+        except (vast_api.VastAPIError, RuntimeError) as e:
             msg = f"Vast wait failed: {e}"
             if self.executor.logger:
                 self.executor.logger.log_vast("wait_error", inst_id, wait_config, {"error": str(e)}, False)
             self.executor.log(msg)
             return False, msg
 
-    def verify_ssh_connection(self, ssh_spec: str, timeout: int = 10) -> bool:
-        """Verify SSH connectivity for a given host spec."""
+    def verify_ssh_connection(self, ssh_spec: str, timeout: int = 10, runs: Optional[_ProbeRuns] = None) -> bool:
+        """Verify SSH connectivity for a given host spec.
+
+        ``runs`` tracks the ssh process so a concurrent caller can kill it.
+        """
         try:
             ssh_args = self.build_ssh_args(ssh_spec, command="echo ok", tty=False)
             ssh_args.insert(1, "-o")
@@ -635,15 +620,20 @@ class VastControlHelper:
             ssh_args.insert(5, "-o")
             ssh_args.insert(6, "StrictHostKeyChecking=no")
 
-            result = subprocess.run(
-                ssh_args,
-                capture_output=True,
-                text=True,
-                timeout=timeout + 5,
-            )
+            if runs is not None:
+                result = runs.run(ssh_args, timeout=timeout + 5)
+            else:
+                result = subprocess.run(
+                    ssh_args,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout + 5,
+                )
 
             if self.executor.logger:
                 self.executor.logger.log_ssh(ssh_spec, "echo ok", result.returncode, result.stdout, result.stderr, 0)
+            if "Permission denied" in (result.stderr or ""):
+                self._ssh_auth_denied = True
             return result.returncode == 0 and "ok" in result.stdout
 
         except (subprocess.TimeoutExpired, Exception) as e:
@@ -678,6 +668,15 @@ class VastControlHelper:
         key_type = key_parts[0]
         key_data = key_parts[1]
 
+        digest = attached_key_digest(str(getattr(client, "api_key", "") or ""), key_type, key_data)
+        self._attached_key_digest = digest
+        if digest in load_attached_keys():
+            if self.executor.logger:
+                self.executor.logger.log_detail("ssh_key", "SSH key previously attached; skipping lookup", {
+                    "key_path": pub_key_path,
+                })
+            return
+
         try:
             existing_keys = client.list_ssh_keys()
             if self.executor.logger:
@@ -698,11 +697,14 @@ class VastControlHelper:
                         })
                     break
 
-            if not key_exists:
+            if key_exists:
+                remember_attached_key(digest)
+            else:
                 self.executor.log("Adding SSH key to Vast.ai account...")
                 try:
                     client.add_ssh_key(pub_key_content, label="tmux-trainsh")
                     self.executor.log("SSH key added successfully")
+                    remember_attached_key(digest)
                     if self.executor.logger:
                         self.executor.logger.log_detail("ssh_key", "SSH key added to Vast.ai", {
                             "key_type": key_type,
@@ -712,6 +714,7 @@ class VastControlHelper:
                     err_str = str(add_err).lower()
                     if "already exists" in err_str or "duplicate" in err_str:
                         self.executor.log("SSH key already exists on Vast.ai")
+                        remember_attached_key(digest)
                         if self.executor.logger:
                             self.executor.logger.log_detail("ssh_key", "SSH key already exists (ignored)", {
                                 "key_type": key_type,
@@ -727,11 +730,10 @@ class VastControlHelper:
     def cmd_vast_cost(self, args: List[str]) -> tuple[bool, str]:
         """Handle: vast.cost <instance_id>"""
         from ..services.pricing import format_currency, load_pricing_settings
-        from ..services.vast_api import VastAPIError, get_vast_client
-
         if not args:
             return False, "No instance ID provided for vast.cost"
-        instance_id = self._resolve_instance_id(self.executor._interpolate(args[0])) or self.executor._interpolate(args[0])
+        raw_id = self.executor._interpolate(args[0])
+        instance_id = self._resolve_instance_id(raw_id) or raw_id
         if not instance_id:
             return False, "No instance ID provided for vast.cost"
 
@@ -745,7 +747,7 @@ class VastControlHelper:
             return False, "Vast cost failed: no start time recorded in job state"
 
         try:
-            client = get_vast_client()
+            client = self._vast_client()
             inst = client.get_instance(inst_id)
             hourly_usd = inst.dph_total or 0.0
             if hourly_usd <= 0:
@@ -775,7 +777,7 @@ class VastControlHelper:
             self.executor.log(msg)
             return True, msg
 
-        except (VastAPIError, RuntimeError) as e:
+        except (vast_api.VastAPIError, RuntimeError) as e:
             msg = f"Vast cost failed: {e}"
             self.executor.log(msg)
             return False, msg
@@ -3,11 +3,16 @@
 
 import os
 import re
+import socket
 import subprocess
+import threading
 import time
 from typing import Any, Callable, Optional
 
 
+_SHELL_COMMANDS = frozenset({"bash", "zsh", "sh", "fish", "tcsh", "csh", "dash", "ksh"})
+
+
 class WaitHelper:
     """Helper for wait and tmux idle detection logic."""
 
@@ -17,17 +22,35 @@ class WaitHelper:
         build_ssh_args: Callable[..., list[str]],
         host_from_ssh_spec: Callable[[str], Any],
         format_duration: Callable[[float], str],
+        stop_event: Optional[threading.Event] = None,
     ):
         self.executor = executor
         self.build_ssh_args = build_ssh_args
         self.host_from_ssh_spec = host_from_ssh_spec
         self.format_duration = format_duration
+        self.stop_event = stop_event
+        self._pattern_cache: dict[str, re.Pattern[str]] = {}
+
+    def compile_pattern(self, pattern: str) -> re.Pattern[str]:
+        """Compile a wait pattern once and reuse it across polls and steps."""
+        regex = self._pattern_cache.get(pattern)
+        if regex is None:
+            regex = re.compile(pattern)
+            self._pattern_cache[pattern] = regex
+        return regex
 
     def _run_remote_shell(self, host: str, cmd: str, timeout: int = 10) -> Any:
         """Run a shell command via SSH on remote host."""
         ssh_args = self.build_ssh_args(host, command=cmd, tty=False)
         return subprocess.run(ssh_args, capture_output=True, text=True, timeout=timeout)
 
+    def _pause(self, seconds: float) -> bool:
+        """Sleep between polls; return True when the executor has been asked to stop."""
+        if self.stop_event is None:
+            time.sleep(seconds)
+            return False
+        return self.stop_event.wait(seconds)
+
     def run_tmux_cmd(self, host: str, cmd: str, timeout: int = 10) -> Any:
         """Run a raw tmux command on the target host."""
         tmux_client = self.executor.get_tmux_client(host)
@@ -49,26 +72,71 @@ class WaitHelper:
             *ssh_args[1:],
         ]
 
-    def get_pane_recent_output(self, host: str, session: str, lines: int = 5) -> str:
-        """Get recent output from a tmux pane."""
-        result = self.executor.get_tmux_client(host).capture_pane(session, start=f"-{lines * 10}")
-        if result.returncode == 0:
-            output_lines = [l for l in result.stdout.strip().split('\n') if l.strip()]
-            return '\n'.join(output_lines[-lines:]) if output_lines else ""
-        return ""
+    @staticmethod
+    def probe_port(host: str, port: int, timeout: float = 2) -> bool:
+        """Return whether a TCP connection to host:port succeeds."""
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
 
-    def is_pane_idle(self, host: str, session: str) -> bool:
-        """Check if tmux pane is idle using current command + child process count."""
-        tmux_client = self.executor.get_tmux_client(host)
-        result = tmux_client.display_message(session, "#{pane_current_command}")
+    def snapshot_pane(self, host: str, session: str, lines: int = 2) -> Optional[dict[str, str]]:
+        """Fetch current command, pane PID, and recent output in one tmux call.
+
+        Returns None when the combined query fails so callers can fall back
+        to the individual queries.
+        """
+        try:
+            result = self.executor.get_tmux_client(host).run(
+                "display-message", "-p", "-t", session, "#{pane_current_command}\t#{pane_pid}",
+                ";", "capture-pane", "-p", "-t", session, "-S", f"-{lines * 10}",
+            )
+        except Exception:
+            return None
         if result.returncode != 0:
-            return False
-        current_cmd = result.stdout.strip()
-        if current_cmd not in {"bash", "zsh", "sh", "fish", "tcsh", "csh", "dash", "ksh"}:
+            return None
+        header, _, output = result.stdout.partition("\n")
+        current_cmd, sep, pane_pid = header.partition("\t")
+        if not sep:
+            return None
+        return {"current_command": current_cmd.strip(), "pane_pid": pane_pid.strip(), "output": output}
+
+    def _first_pane_pid(self, host: str, session: str) -> str:
+        pane_pids = self.executor.get_tmux_client(host).list_panes(session, "#{pane_pid}")
+        return pane_pids[0] if pane_pids else ""
+
+    def get_pane_recent_output(
+        self,
+        host: str,
+        session: str,
+        lines: int = 5,
+        snapshot: Optional[dict[str, str]] = None,
+    ) -> str:
+        """Get recent output from a tmux pane."""
+        if snapshot is not None:
+            text = snapshot["output"]
+        else:
+            result = self.executor.get_tmux_client(host).capture_pane(session, start=f"-{lines * 10}")
+            if result.returncode != 0:
+                return ""
+            text = result.stdout
+        output_lines = [l for l in text.strip().split('\n') if l.strip()]
+        return '\n'.join(output_lines[-lines:]) if output_lines else ""
+
+    def is_pane_idle(self, host: str, session: str, snapshot: Optional[dict[str, str]] = None) -> bool:
+        """Check if tmux pane is idle using current command + child process count."""
+        if snapshot is not None:
+            current_cmd = snapshot["current_command"]
+        else:
+            result = self.executor.get_tmux_client(host).display_message(session, "#{pane_current_command}")
+            if result.returncode != 0:
+                return False
+            current_cmd = result.stdout.strip()
+        if current_cmd not in _SHELL_COMMANDS:
             return False
 
-        pane_pids = tmux_client.list_panes(session, "#{pane_pid}")
-        pane_pid = pane_pids[0] if pane_pids else ""
+        pane_pid = snapshot["pane_pid"] if snapshot is not None else self._first_pane_pid(host, session)
         if not pane_pid:
             return False
 
@@ -86,14 +154,20 @@ class WaitHelper:
         except ValueError:
             return False
 
-    def get_pane_process_info(self, host: str, session: str) -> tuple[str, str]:
+    def get_pane_process_info(
+        self,
+        host: str,
+        session: str,
+        snapshot: Optional[dict[str, str]] = None,
+    ) -> tuple[str, str]:
         """Get current command and process tree for a tmux pane."""
-        tmux_client = self.executor.get_tmux_client(host)
-        result = tmux_client.display_message(session, "#{pane_current_command}")
-        current_cmd = result.stdout.strip() if result.returncode == 0 else "unknown"
-
-        pane_pids = tmux_client.list_panes(session, "#{pane_pid}")
-        pane_pid = pane_pids[0] if pane_pids else ""
+        if snapshot is not None:
+            current_cmd = snapshot["current_command"] or "unknown"
+            pane_pid = snapshot["pane_pid"]
+        else:
+            result = self.executor.get_tmux_client(host).display_message(session, "#{pane_current_command}")
+            current_cmd = result.stdout.strip() if result.returncode == 0 else "unknown"
+            pane_pid = self._first_pane_pid(host, session)
         if not pane_pid:
             return current_cmd, ""
 
@@ -124,7 +198,8 @@ class WaitHelper:
 
         # Give commands a brief head start before polling for idle.
         head_start = 5 if timeout_secs is None else min(5, max(1, timeout_secs // 6))
-        time.sleep(head_start)
+        if self._pause(head_start):
+            return False, "Wait interrupted"
         consecutive_idle = 0
 
         while True:
@@ -132,13 +207,16 @@ class WaitHelper:
             if timeout_secs is not None and elapsed >= timeout_secs:
                 break
             remaining = None if timeout_secs is None else max(0, int(timeout_secs - elapsed))
+            # One combined tmux query per poll feeds all three checks below.
+            snapshot = self.snapshot_pane(host, session, lines=2)
             try:
-                if self.is_pane_idle(host, session):
+                if self.is_pane_idle(host, session, snapshot=snapshot):
                     consecutive_idle += 1
                     if consecutive_idle >= confirm_count:
                         return True, "Pane is idle (confirmed)"
                     self.executor.log(f"  Idle detected, confirming... ({consecutive_idle}/{confirm_count})")
-                    time.sleep(confirm_interval)
+                    if self._pause(confirm_interval):
+                        return False, "Wait interrupted"
                     continue
                 if consecutive_idle > 0:
                     self.executor.log("  Not idle, resetting confirmation counter")
@@ -147,7 +225,7 @@ class WaitHelper:
                 self.executor.log(f"  Idle check failed: {e}")
                 consecutive_idle = 0
 
-            current_cmd, process_tree = self.get_pane_process_info(host, session)
+            current_cmd, process_tree = self.get_pane_process_info(host, session, snapshot=snapshot)
             if remaining is None:
                 self.executor.log(f"  Waiting for @{window.name}... (timeout disabled)")
             else:
@@ -158,14 +236,15 @@ class WaitHelper:
                 for line in process_tree.split('\n')[:5]:
                     self.executor.log(f"      {line[:100]}")
             try:
-                output = self.get_pane_recent_output(host, session, lines=2)
+                output = self.get_pane_recent_output(host, session, lines=2, snapshot=snapshot)
                 if output:
                     self.executor.log("    Recent output:")
                     for line in output.split('\n'):
                         self.executor.log(f"      {line[:80]}")
             except Exception:
                 pass
-            time.sleep(poll_interval)
+            if self._pause(poll_interval):
+                return False, "Wait interrupted"
 
         return False, f"Timeout after {self.format_duration(timeout_secs)}"
 
@@ -189,6 +268,22 @@ class WaitHelper:
         if not window:
             return False, f"Unknown window: {target}"
 
+        regex = None
+        if pattern:
+            try:
+                regex = self.compile_pattern(pattern)
+            except re.error as exc:
+                return False, f"Invalid wait pattern: {exc}"
+
+        # Resolve per-wait constants once instead of on every poll.
+        remote_host = window.host if window.host != "local" else None
+        file_wait = bool(condition and condition.startswith("file:"))
+        filepath = self.executor._interpolate(condition[5:]) if file_wait else ""
+        port = int(condition[5:]) if condition and condition.startswith("port:") else 0
+        port_host = ""
+        if port:
+            port_host = self.host_from_ssh_spec(remote_host).hostname if remote_host else "localhost"
+
         start = time.time()
         poll_interval = 1 if pattern else 30
         ssh_failures = 0
@@ -208,43 +303,39 @@ class WaitHelper:
             if self.executor.logger:
                 self.executor.logger.log_wait(target or "", condition or pattern or "", elapsed, remaining, f"poll #{poll_count}")
 
-            if pattern:
+            if regex is not None:
                 if not window.remote_session:
                     return False, f"Window {target} has no tmux session"
-                try:
-                    pane = self.executor.get_tmux_client(window.host).capture_pane(
-                        window.remote_session,
-                        start="-400",
-                    )
-                    output = pane.stdout or ""
-                    if pane.returncode == 0 and re.search(pattern, output):
-                        if self.executor.logger:
-                            self.executor.logger.log_detail(
-                                "wait_pattern_found",
-                                f"Pattern matched in @{target}",
-                                {"pattern": pattern, "elapsed_sec": elapsed},
-                            )
-                        return True, f"Pattern found: {pattern}"
-                except re.error as exc:
-                    return False, f"Invalid wait pattern: {exc}"
+                pane = self.executor.get_tmux_client(window.host).capture_pane(
+                    window.remote_session,
+                    start="-400",
+                )
+                output = pane.stdout or ""
+                if pane.returncode == 0 and regex.search(output):
+                    if self.executor.logger:
+                        self.executor.logger.log_detail(
+                            "wait_pattern_found",
+                            f"Pattern matched in @{target}",
+                            {"pattern": pattern, "elapsed_sec": elapsed},
+                        )
+                    return True, f"Pattern found: {pattern}"
 
-            if condition and condition.startswith("file:"):
-                filepath = self.executor._interpolate(condition[5:])
-                if window.host != "local":
+            if file_wait:
+                if remote_host:
                     try:
                         check_cmd = f"test -f {filepath} && echo exists"
-                        ssh_args = self._build_wait_ssh_args(window.host, check_cmd)
-                        ssh_start = time.time()
+                        ssh_args = self._build_wait_ssh_args(remote_host, check_cmd)
+                        ssh_start_ns = time.monotonic_ns()
                         result = subprocess.run(
                             ssh_args,
                             capture_output=True,
                             text=True,
                             timeout=30,
                         )
-                        ssh_duration = int((time.time() - ssh_start) * 1000)
+                        ssh_duration = (time.monotonic_ns() - ssh_start_ns) // 1_000_000
 
                         if self.executor.logger:
-                            self.executor.logger.log_ssh(window.host, check_cmd, result.returncode, result.stdout, result.stderr, ssh_duration)
+                            self.executor.logger.log_ssh(remote_host, check_cmd, result.returncode, result.stdout, result.stderr, ssh_duration)
 
                         if "exists" in result.stdout:
                             if self.executor.logger:
@@ -277,7 +368,8 @@ class WaitHelper:
                             self.executor.ssh_retry_max_interval
                         )
                         self.executor.log(f"  Retrying in {backoff}s...")
-                        time.sleep(backoff)
+                        if self._pause(backoff):
+                            return False, "Wait interrupted"
                         continue
                 else:
                     if os.path.exists(os.path.expanduser(filepath)):
@@ -285,30 +377,18 @@ class WaitHelper:
                             self.executor.logger.log_detail("wait_file_found", f"Local file found: {filepath}", {"elapsed_sec": elapsed})
                         return True, f"File found: {filepath}"
 
-            if condition and condition.startswith("port:"):
-                port = int(condition[5:])
-                host = "localhost"
-                if window.host != "local":
-                    host = self.host_from_ssh_spec(window.host).hostname
-                try:
-                    result = subprocess.run(
-                        ["nc", "-z", host, str(port)],
-                        capture_output=True,
-                        timeout=5,
-                    )
-                    if result.returncode == 0:
-                        if self.executor.logger:
-                            self.executor.logger.log_detail("wait_port_open", f"Port {port} is open on {host}", {"elapsed_sec": elapsed})
-                        return True, f"Port {port} is open"
-                except (subprocess.TimeoutExpired, OSError):
-                    pass
+            if port:
+                if self.probe_port(port_host, port):
+                    if self.executor.logger:
+                        self.executor.logger.log_detail("wait_port_open", f"Port {port} is open on {port_host}", {"elapsed_sec": elapsed})
+                    return True, f"Port {port} is open"
 
             if condition == "idle":
                 bridge_pane = self.executor.tmux_bridge.get_pane(window.name)
                 # For local windows, check the actual target tmux session directly.
                 # Local bridge panes now run nested tmux clients, which are not a
                 # reliable signal for pane-idle detection.
-                if bridge_pane and window.host != "local":
+                if bridge_pane and remote_host:
                     return self.executor._wait_for_bridge_idle(window.name, bridge_pane, remaining)
                 if not window.remote_session:
                     return False, f"Window {target} has no tmux session"
@@ -317,7 +397,8 @@ class WaitHelper:
             remaining_str = self.format_duration(remaining)
             timeout_str = self.format_duration(timeout)
             self.executor.log(f"  Waiting... ({remaining_str} remaining of {timeout_str})")
-            time.sleep(poll_interval)
+            if self._pause(poll_interval):
+                return False, "Wait interrupted"
 
         timeout_msg = f"Timeout after {self.format_duration(timeout)}"
         if last_ssh_error:
@@ -11,6 +11,13 @@ from typing import Dict, List, Optional
 from .runtime_store import RuntimeStore
 
 
+def _normalize_recipe_path(path: str) -> str:
+    # The executor already hands over absolute paths; only resolve the rest.
+    if os.path.isabs(path):
+        return path
+    return os.path.abspath(os.path.expanduser(path))
+
+
 @dataclass
 class JobState:
     """Persistent state for a recipe execution job."""
@@ -55,7 +62,7 @@ class JobStateManager:
         self.store.save_checkpoint(
             {
                 "run_id": state.job_id,
-                "recipe_path": os.path.abspath(os.path.expanduser(state.recipe_path)),
+                "recipe_path": _normalize_recipe_path(state.recipe_path),
                 "recipe_name": state.recipe_name,
                 "current_step": int(state.current_step),
                 "total_steps": int(state.total_steps),
@@ -155,30 +162,16 @@ def check_remote_condition(host_spec: str, condition: str) -> tuple[bool, str]:
     import shlex
     import subprocess
 
+    from .executor_utils import _split_ssh_spec
+
     if condition.startswith("file:"):
         filepath = condition[5:]
         cmd = f"test -f {shlex.quote(filepath)} && echo EXISTS || echo NOTFOUND"
     else:
         return False, f"Unknown condition type: {condition}"
 
-    tokens = shlex.split(host_spec) if host_spec else []
-    ssh_args = ["ssh", "-o", "ConnectTimeout=10", "-o", "BatchMode=yes"]
-
-    host = ""
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        if token.startswith("-"):
-            ssh_args.append(token)
-            if token in {"-p", "-i", "-J", "-o", "-F"} and i + 1 < len(tokens):
-                ssh_args.append(tokens[i + 1])
-                i += 1
-        elif not host:
-            host = token
-        i += 1
-
-    if not host:
-        host = host_spec
+    host, options = _split_ssh_spec(host_spec)
+    ssh_args = ["ssh", "-o", "ConnectTimeout=10", "-o", "BatchMode=yes", *options]
 
     ssh_args.append(host)
     ssh_args.append(cmd)
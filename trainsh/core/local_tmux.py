@@ -11,6 +11,19 @@ from dataclasses import dataclass
 from typing import Optional
 
 
+# tmux/ssh stderr only ends up in error messages; keep the tail, which names the failure.
+STDERR_KEEP_CHARS = 4096
+
+
+def clip_stderr(text: Optional[str]) -> str:
+    """Trim captured stderr to its last STDERR_KEEP_CHARS characters."""
+    if not text:
+        return ""
+    if len(text) <= STDERR_KEEP_CHARS:
+        return text
+    return "..." + text[-STDERR_KEEP_CHARS:]
+
+
 @dataclass
 class TmuxCmdResult:
     """Normalized tmux command result."""
@@ -59,7 +72,7 @@ class LocalTmuxClient:
                 timeout=timeout,
                 env=self._tmux_env(),
             )
-            return TmuxCmdResult(cp.returncode, cp.stdout or "", cp.stderr or "")
+            return TmuxCmdResult(cp.returncode, cp.stdout or "", clip_stderr(cp.stderr))
         except subprocess.TimeoutExpired:
             return TmuxCmdResult(124, "", "tmux command timed out")
         except Exception as e:
@@ -104,6 +117,13 @@ class LocalTmuxClient:
 
         return self.run(*args)
 
+    def ensure_session(self, name: str) -> TmuxCmdResult:
+        """Create a detached session unless it already exists, in one tmux call."""
+        result = self.run("new-session", "-d", "-s", name)
+        if result.returncode != 0 and "duplicate session" in result.stderr:
+            return TmuxCmdResult(0, "", "")
+        return result
+
     def kill_session(self, name: str) -> TmuxCmdResult:
         return self.run("kill-session", "-t", name)
 
@@ -152,6 +172,10 @@ class LocalTmuxClient:
     def select_layout(self, target: str, layout: str) -> TmuxCmdResult:
         return self.run("select-layout", "-t", target, layout)
 
+    def set_pane_title_and_layout(self, pane_id: str, title: str, target: str, layout: str) -> TmuxCmdResult:
+        """Title a pane and re-layout its window in one tmux command sequence."""
+        return self.run("select-pane", "-t", pane_id, "-T", title, ";", "select-layout", "-t", target, layout)
+
     def kill_pane(self, pane_id: str) -> TmuxCmdResult:
         return self.run("kill-pane", "-t", pane_id)
 
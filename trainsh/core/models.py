@@ -68,7 +68,7 @@ class HostSystemInfo:
     last_updated: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Host:
     """Represents a remote host (SSH, Vast.ai, Colab, or Local)."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -216,7 +216,7 @@ class StorageType(Enum):
         return mapping.get(self, "local")
 
 
-@dataclass
+@dataclass(slots=True)
 class Storage:
     """Represents a storage backend."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -528,7 +528,7 @@ class TransferOperation(Enum):
     SYNC_NO_DELETE = "syncNoDelete"
 
 
-@dataclass
+@dataclass(slots=True)
 class TransferEndpoint:
     """Represents a source or destination for file transfer."""
     type: str  # "local", "host", "storage"
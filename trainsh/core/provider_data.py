@@ -162,24 +162,24 @@ class ExecutorProviderDataMixin:
         filename = self._interpolate(str(params.get("filename", ""))).strip()
         filenames = params.get("filenames")
 
-        command = f"huggingface-cli download {shlex.quote(repo_id)}"
+        parts = ["huggingface-cli", "download", shlex.quote(repo_id)]
         if revision:
-            command += f" --revision {shlex.quote(revision)}"
+            parts.extend(["--revision", shlex.quote(revision)])
         if local_dir:
-            command += f" --local-dir {shlex.quote(local_dir)}"
+            parts.extend(["--local-dir", shlex.quote(local_dir)])
         if token:
-            command += f" --token {shlex.quote(token)}"
+            parts.extend(["--token", shlex.quote(token)])
         if filename:
-            command += f" --filename {shlex.quote(filename)}"
+            parts.extend(["--filename", shlex.quote(filename)])
         elif isinstance(filenames, (list, tuple, set)):
             for item in filenames:
                 file_name = self._interpolate(str(item)).strip()
                 if file_name:
-                    command += f" --filename {shlex.quote(file_name)}"
+                    parts.extend(["--filename", shlex.quote(file_name)])
 
         return self._exec_provider_shell(
             {
-                "command": command,
+                "command": " ".join(parts),
                 "host": self._provider_host(params.get("host", "local")),
             }
         )
@@ -7,7 +7,7 @@ import shlex
 import socket
 import subprocess
 import time
-from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List
 
 from ..services.git_auth import (
@@ -55,7 +55,7 @@ class ExecutorProviderShellOpsMixin:
         if host != "local" and cwd is not None:
             run_command = f"cd {shlex.quote(str(cwd))} && ({command})"
 
-        start = datetime.now()
+        start_ns = time.monotonic_ns()
         try:
             if host == "local":
                 result = subprocess.run(
@@ -76,7 +76,7 @@ class ExecutorProviderShellOpsMixin:
                     timeout=run_timeout,
                 )
 
-            duration_ms = int((datetime.now() - start).total_seconds() * 1000)
+            duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             output = result.stdout or result.stderr
 
             if self.logger:
@@ -106,24 +106,28 @@ class ExecutorProviderShellOpsMixin:
         if not condition:
             return False, "Condition is empty"
 
-        if condition.startswith("var:"):
-            body = condition[4:]
+        # One split on the first colon names the condition kind, instead of
+        # probing every known prefix with startswith.
+        kind, sep, body = condition.partition(":")
+        if not sep:
+            return False, f"Unsupported condition: {condition!r}"
+
+        if kind == "var":
             if "==" in body:
                 name, expected = [item.strip() for item in body.split("==", 1)]
                 actual = str(self.ctx.variables.get(name, ""))
                 return actual == expected, f"{name} == {expected}"
             return bool(self.ctx.variables.get(body, "")), f"var:{body} is set"
 
-        if condition.startswith("env:"):
-            body = condition[4:]
+        if kind == "env":
             if "==" in body:
                 name, expected = [item.strip() for item in body.split("==", 1)]
                 actual = os.environ.get(name, "")
                 return str(actual) == expected, f"{name} == {expected}"
             return bool(os.environ.get(body, "")), f"env:{body} is set"
 
-        if condition.startswith("file_exists:"):
-            path = self._interpolate(condition[len("file_exists:") :].strip())
+        if kind == "file_exists":
+            path = self._interpolate(body.strip())
             if host == "local":
                 return os.path.exists(os.path.expanduser(path)), f"file_exists:{path}"
             ok, output = self._exec_provider_shell(
@@ -135,8 +139,8 @@ class ExecutorProviderShellOpsMixin:
             )
             return ok and "exists" in output, f"file_exists:{path}"
 
-        if condition.startswith("file_contains:"):
-            remain = condition[len("file_contains:") :].strip()
+        if kind == "file_contains":
+            remain = body.strip()
             path, sep, expected = remain.partition(":")
             path = self._interpolate(path.strip())
             expected = expected.strip()
@@ -149,8 +153,8 @@ class ExecutorProviderShellOpsMixin:
                 target = os.path.expanduser(path)
                 if not os.path.isfile(target):
                     return False, f"File not found: {target}"
-                with open(target, "r", encoding="utf-8", errors="replace") as f:
-                    return expected in f.read(), f"file_contains:{path} has expected text"
+                content = Path(target).read_text(encoding="utf-8", errors="replace")
+                return expected in content, f"file_contains:{path} has expected text"
 
             ok, output = self._exec_provider_shell(
                 {
@@ -164,8 +168,8 @@ class ExecutorProviderShellOpsMixin:
             )
             return ok and "found" in output, f"file_contains:{path} has expected text"
 
-        if condition.startswith("storage_exists:"):
-            raw_spec = condition[len("storage_exists:") :].strip()
+        if kind == "storage_exists":
+            raw_spec = body.strip()
             if not raw_spec:
                 return False, "Condition storage_exists is empty"
             storage_ref, _, path = raw_spec.partition(":")
@@ -179,8 +183,8 @@ class ExecutorProviderShellOpsMixin:
             ok, _ = self._exec_provider_storage_exists({"storage": storage_ref, "path": path})
             return ok, f"storage_exists:{storage_ref}:{path}"
 
-        if condition.startswith("command:"):
-            command = self._interpolate(condition[8:].strip())
+        if kind == "command":
+            command = self._interpolate(body.strip())
             if not command:
                 return False, "Condition command is empty"
             ok, _ = self._exec_provider_shell(
@@ -192,8 +196,8 @@ class ExecutorProviderShellOpsMixin:
             )
             return ok, f"command:{command}"
 
-        if condition.startswith("command_output:"):
-            remain = condition[len("command_output:") :].strip()
+        if kind == "command_output":
+            remain = body.strip()
             command, sep, expected = remain.partition(":")
             command = self._interpolate(command.strip())
             expected = expected.strip()
@@ -210,8 +214,8 @@ class ExecutorProviderShellOpsMixin:
             )
             return ok and (expected in output), f"command_output:{command} contains text"
 
-        if condition.startswith("host_online:"):
-            host_ref = condition[len("host_online:") :].strip()
+        if kind == "host_online":
+            host_ref = body.strip()
             if not host_ref:
                 return False, "Condition host_online requires host"
             target = self._provider_host(host_ref)
@@ -305,8 +309,7 @@ class ExecutorProviderShellOpsMixin:
             return state
 
         try:
-            with open(token_file, "r", encoding="utf-8", errors="replace") as handle:
-                token_text = handle.read().strip()
+            token_text = Path(token_file).read_text(encoding="utf-8", errors="replace").strip()
         except OSError as exc:
             if auth_mode == "github_token":
                 state["error"] = str(exc)
@@ -332,7 +335,7 @@ class ExecutorProviderShellOpsMixin:
     ) -> tuple[bool, str]:
         """Run one authenticated GitHub clone without mutating URLs or git config."""
         run_timeout = None if timeout in (None, 0) else timeout
-        start = datetime.now()
+        start_ns = time.monotonic_ns()
         try:
             if host == "local":
                 env = dict(os.environ)
@@ -358,7 +361,7 @@ class ExecutorProviderShellOpsMixin:
                     text=True,
                     timeout=run_timeout,
                 )
-            duration_ms = int((datetime.now() - start).total_seconds() * 1000)
+            duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             output = result.stdout or result.stderr
             if self.logger:
                 self.logger.log_ssh(
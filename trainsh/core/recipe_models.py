@@ -4,11 +4,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 
-class StepType(Enum):
-    """Type of executable recipe step."""
+class StepType(str, Enum):
+    """Type of executable recipe step.
+
+    The ``str`` mixin keeps hashing and equality in C for dispatch-table
+    lookups while leaving the persisted ``.value`` strings unchanged.
+    """
 
     CONTROL = "control"
     EXECUTE = "execute"
@@ -16,7 +20,7 @@ class StepType(Enum):
     WAIT = "wait"
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeStepModel:
     """Normalized runtime step model."""
 
@@ -24,7 +28,7 @@ class RecipeStepModel:
     line_num: int
     raw: str
     command: str = ""
-    args: List[str] = field(default_factory=list)
+    args: Tuple[str, ...] = ()
     host: str = ""
     commands: str = ""
     background: bool = False
@@ -41,7 +45,7 @@ class RecipeStepModel:
     condition: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeModel:
     """Normalized runtime recipe model."""
 
@@ -51,5 +55,18 @@ class RecipeModel:
     storages: Dict[str, Any] = field(default_factory=dict)
     steps: List[RecipeStepModel] = field(default_factory=list)
 
+    def tmux_open_index(self) -> Tuple[List[int], List[Tuple[str, str]]]:
+        """Return step indices and (host_ref, window) pairs of ``tmux.open @host as name`` steps."""
+        indices: List[int] = []
+        entries: List[Tuple[str, str]] = []
+        for idx, step in enumerate(self.steps):
+            if step.type != StepType.CONTROL or step.command != "tmux.open":
+                continue
+            if len(step.args) < 3 or step.args[1] != "as":
+                continue
+            indices.append(idx)
+            entries.append((step.args[0], step.args[2]))
+        return indices, entries
+
 
 __all__ = ["RecipeModel", "RecipeStepModel", "StepType"]
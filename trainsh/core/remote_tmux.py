@@ -8,7 +8,12 @@ import subprocess
 import uuid
 from typing import Callable, Optional
 
-from .local_tmux import TmuxCmdResult
+from .local_tmux import TmuxCmdResult, clip_stderr
+
+# write_and_source() exit code when the file could not be written, and the
+# line it prints when no tmux server was running to reload.
+WRITE_FAILED_RC = 97
+NO_SERVER_MARKER = "__trainsh_no_tmux_server__"
 
 
 class RemoteTmuxClient:
@@ -35,7 +40,7 @@ class RemoteTmuxClient:
         except Exception as e:
             return TmuxCmdResult(1, "", str(e))
 
-        return TmuxCmdResult(cp.returncode, cp.stdout or "", cp.stderr or "")
+        return TmuxCmdResult(cp.returncode, cp.stdout or "", clip_stderr(cp.stderr))
 
     def _run_tmux(self, args: list[str], timeout: Optional[int] = None) -> TmuxCmdResult:
         cmd = "tmux " + " ".join(shlex.quote(a) for a in args)
@@ -119,9 +124,42 @@ class RemoteTmuxClient:
             args.append(command)
         return self._run_tmux(args)
 
+    def ensure_session(self, name: str) -> TmuxCmdResult:
+        """Create a detached session unless it already exists, in one SSH round-trip."""
+        return self.ensure_sessions([name])
+
+    def ensure_sessions(self, names: list[str]) -> TmuxCmdResult:
+        """Create several detached sessions in one SSH round-trip.
+
+        Each session is attempted independently; stdout lists, one per line,
+        the names that exist afterwards (see ensured_session_names).
+        """
+        commands = []
+        for name in names:
+            target = shlex.quote(name)
+            command = f"tmux has-session -t {target} 2>/dev/null || tmux new-session -d -s {target}"
+            if len(names) == 1:
+                return self._run_shell(command)
+            commands.append(f"{{ {command}; }} && printf '%s\\n' {target}")
+        return self._run_shell("; ".join(commands))
+
+    @staticmethod
+    def ensured_session_names(result: TmuxCmdResult, names: list[str]) -> list[str]:
+        """Names from an ensure_sessions call that were created or already existed."""
+        if len(names) == 1:
+            return list(names) if result.returncode == 0 else []
+        reported = set(result.stdout.splitlines())
+        return [name for name in names if name in reported]
+
     def kill_session(self, name: str) -> TmuxCmdResult:
         return self._run_tmux(["kill-session", "-t", name])
 
+    def kill_sessions(self, names: list[str]) -> TmuxCmdResult:
+        """Kill several sessions in one SSH round-trip."""
+        return self._run_shell(
+            "; ".join(f"tmux kill-session -t {shlex.quote(name)} 2>/dev/null" for name in names) + "; true"
+        )
+
     def list_sessions(self, fmt: str = "#{session_name}") -> list[str]:
         result = self._run_tmux(["list-sessions", "-F", fmt])
         if result.returncode != 0:
@@ -189,22 +227,41 @@ class RemoteTmuxClient:
     def wait_for(self, signal: str, timeout: Optional[int] = None) -> TmuxCmdResult:
         return self._run_tmux(["wait-for", signal], timeout=timeout)
 
-    def write_text(self, path: str, content: str) -> TmuxCmdResult:
+    @staticmethod
+    def _shell_path(path: str) -> str:
+        """Quote a remote path for the shell, expanding a leading ~ to $HOME."""
+        if path == "~":
+            return '"$HOME"'
+        if path.startswith("~/"):
+            safe_tail = path[2:].replace('"', '\\"')
+            return f'"$HOME/{safe_tail}"'
+        return shlex.quote(path)
+
+    def _heredoc_write(self, path: str, content: str, on_error: str = "") -> str:
         delimiter = f"TRAINSH_EOF_{uuid.uuid4().hex}"
         while delimiter in content:
             delimiter = f"TRAINSH_EOF_{uuid.uuid4().hex}"
 
-        if path == "~":
-            target = '"$HOME"'
-        elif path.startswith("~/"):
-            safe_tail = path[2:].replace('"', '\\"')
-            target = f'"$HOME/{safe_tail}"'
-        else:
-            target = shlex.quote(path)
-
-        cmd = (
-            f"cat > {target} <<'{delimiter}'\n"
+        return (
+            f"cat > {self._shell_path(path)} <<'{delimiter}'{on_error}\n"
             f"{content}\n"
             f"{delimiter}\n"
         )
+
+    def write_text(self, path: str, content: str) -> TmuxCmdResult:
+        return self._run_shell(self._heredoc_write(path, content))
+
+    def write_and_source(self, path: str, content: str) -> TmuxCmdResult:
+        """Write a tmux config file and source it in one SSH round-trip.
+
+        Exits with WRITE_FAILED_RC when the file cannot be written; prints
+        NO_SERVER_MARKER instead of failing when no tmux server is running.
+        """
+        cmd = (
+            self._heredoc_write(path, content, on_error=f" || exit {WRITE_FAILED_RC}")
+            + f"tmux source-file {self._shell_path(path)} && exit 0\n"
+            + "rc=$?\n"
+            + f"tmux list-sessions >/dev/null 2>&1 || {{ echo {NO_SERVER_MARKER}; exit 0; }}\n"
+            + "exit $rc\n"
+        )
         return self._run_shell(cmd)
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import mmap
 import os
+import re
+import tempfile
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from ..constants import RUNTIME_STATE_DIR
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+
 
 def to_jsonable(value: Any) -> Any:
     if value is None or isinstance(value, (str, int, float, bool)):
@@ -26,6 +35,50 @@ def to_jsonable(value: Any) -> Any:
     return str(value)
 
 
+def _encode_line(record: Dict[str, Any]) -> bytes:
+    """Serialize one JSONL record to UTF-8 bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+    return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+# 19+ digit runs may be ints orjson would read back as floats.
+_WIDE_INT = re.compile(rb"\d{19}")
+
+
+def _decode_line(line: bytes) -> Any:
+    """Decode one JSONL record, matching what stdlib json reads.
+
+    Older records were written by ``json.dumps`` and may hold NaN/Infinity
+    or ints wider than 64 bits; those lines go through stdlib json.
+    """
+    if orjson is not None and _WIDE_INT.search(line) is None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
+# JSONL files are scanned as raw bytes through a large buffer; lines are
+# only decoded once they pass the prefilter.
+_READ_BUFFER_SIZE = 128 * 1024
+# Lines per os.writev call; each line also needs a newline buffer and
+# IOV_MAX is 1024 on Linux and macOS.
+_WRITEV_BATCH = 512
+# Several stores (executor, logger) may share one runs.index.json; fold and
+# rewrite it one thread at a time.
+_RUNS_INDEX_LOCK = threading.Lock()
+# Bytes just before the folded offset, hashed to notice runs.jsonl being rewritten.
+_RUNS_INDEX_CHECK_BYTES = 64
+
+
+def _index_check(window: bytes) -> str:
+    return hashlib.blake2b(window, digest_size=8).hexdigest()
+
+
 def json_dumps(value: Any) -> str:
     return json.dumps(to_jsonable(value), ensure_ascii=False)
 
@@ -59,6 +112,36 @@ def _record_sort_key(record: Dict[str, Any]) -> str:
     )
 
 
+def _write_lines(handle: Any, lines: List[bytes]) -> None:
+    """Append newline-terminated lines with vectored writes where available.
+
+    ``os.writev`` hands the encoded lines to the kernel as-is, so a batch
+    with large step output is never joined into one more copy.
+    """
+    writev = getattr(os, "writev", None)
+    fd = handle.fileno()
+    if writev is None:
+        # The handle is unbuffered, so a single write may be short.
+        rest = memoryview(b"\n".join(lines) + b"\n")
+        while rest:
+            rest = rest[os.write(fd, rest):]
+        return
+    for start in range(0, len(lines), _WRITEV_BATCH):
+        buffers: List[bytes] = []
+        for line in lines[start:start + _WRITEV_BATCH]:
+            buffers.append(line)
+            buffers.append(b"\n")
+        written = writev(fd, buffers)
+        if written < sum(map(len, buffers)):
+            rest = memoryview(b"".join(buffers))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+
+
+def _run_id_needle(run_id: str) -> str:
+    return json.dumps(run_id, ensure_ascii=False)[1:-1]
+
+
 class RuntimeStore:
     """Append-only JSONL runtime store with latest-snapshot helpers."""
 
@@ -70,54 +153,184 @@ class RuntimeStore:
         self.checkpoints_path = self.root / "checkpoints.jsonl"
         self.xcom_path = self.root / "xcom.jsonl"
         self.pools_path = self.root / "pools.json"
+        self.runs_index_path = self.root / "runs.index.json"
         self._lock = threading.RLock()
 
     def _append_jsonl(self, path: Path, record: Dict[str, Any]) -> None:
-        payload = dict(to_jsonable(record))
+        self._append_jsonl_many(path, (record,))
+
+    def _append_jsonl_many(self, path: Path, records: Iterable[Dict[str, Any]]) -> None:
+        lines = [_encode_line(dict(to_jsonable(record))) for record in records]
+        if not lines:
+            return
         with self._lock:
             path.parent.mkdir(parents=True, exist_ok=True)
-            with path.open("a", encoding="utf-8") as handle:
-                handle.write(json.dumps(payload, ensure_ascii=False))
-                handle.write("\n")
-
-    def _iter_jsonl(self, path: Path) -> Iterable[Dict[str, Any]]:
-        if not path.exists():
-            return []
-        records: List[Dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as handle:
+            with path.open("ab", buffering=0) as handle:
+                _write_lines(handle, lines)
+
+    def _iter_jsonl(self, path: Path, *, contains: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream records from one JSONL file.
+
+        ``contains`` is a cheap raw-text prefilter: lines without it are
+        skipped before JSON decoding.
+        """
+        needle = contains.encode("utf-8") if contains is not None else None
+        try:
+            handle = path.open("rb", buffering=_READ_BUFFER_SIZE)
+        except FileNotFoundError:
+            return
+        with handle:
             for line in handle:
-                text = line.strip()
-                if not text:
+                if needle is not None and needle not in line:
+                    continue
+                line = line.strip()
+                if not line:
                     continue
                 try:
-                    payload = json.loads(text)
+                    payload = _decode_line(line)
                 except Exception:
                     continue
                 if isinstance(payload, dict):
-                    records.append(payload)
-        return records
+                    yield payload
+
+    def _iter_jsonl_reversed(self, path: Path, *, contains: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream records from one JSONL file, newest line first.
+
+        The file is memory-mapped so tail reads never load the whole log,
+        which keeps live "recent events" lookups cheap on long runs.
+        """
+        needle = contains.encode("utf-8") if contains is not None else None
+        try:
+            handle = path.open("rb")
+        except FileNotFoundError:
+            return
+        with handle:
+            try:
+                view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return
+            with view:
+                end = len(view)
+                while end > 0:
+                    start = view.rfind(b"\n", 0, end) + 1
+                    line = view[start:end]
+                    end = start - 1
+                    if needle is not None and needle not in line:
+                        continue
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        payload = _decode_line(line)
+                    except Exception:
+                        continue
+                    if isinstance(payload, dict):
+                        yield payload
 
     def _latest_by(self, path: Path, key_fields: tuple[str, ...]) -> Dict[tuple[str, ...], Dict[str, Any]]:
-        latest: Dict[tuple[str, ...], Dict[str, Any]] = {}
+        # Keep each winner's sort key next to it so it is computed once per record.
+        latest: Dict[tuple[str, ...], tuple[str, Dict[str, Any]]] = {}
         for record in self._iter_jsonl(path):
             key = tuple(str(record.get(field, "") or "") for field in key_fields)
             if not any(key):
                 continue
+            sort_key = _record_sort_key(record)
             previous = latest.get(key)
+            if previous is None or sort_key >= previous[0]:
+                latest[key] = (sort_key, record)
+        return {key: record for key, (_, record) in latest.items()}
+
+    def _load_runs_index(self) -> tuple[int, Dict[str, Dict[str, Any]], Optional[int], str]:
+        try:
+            payload = json.loads(self.runs_index_path.read_text(encoding="utf-8"))
+            offset = int(payload["offset"])
+            latest = payload["latest"]
+        except Exception:
+            return 0, {}, None, ""
+        if offset < 0 or not isinstance(latest, dict):
+            return 0, {}, None, ""
+        return offset, latest, payload.get("inode"), str(payload.get("check", ""))
+
+    def _latest_runs(self) -> Dict[str, Dict[str, Any]]:
+        """Latest snapshot per run, folded incrementally via a sidecar index.
+
+        runs.jsonl is append-only, so the index records how many bytes were
+        already folded and only the tail appended since then is decoded. The
+        file's inode and a hash of the bytes before that offset are kept too;
+        if runs.jsonl was replaced or rewritten, the index is rebuilt.
+        """
+        with _RUNS_INDEX_LOCK:
+            return self._fold_runs_index()
+
+    def _fold_runs_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            stat = self.runs_path.stat()
+        except FileNotFoundError:
+            return {}
+        offset, latest, inode, check = self._load_runs_index()
+        if offset > stat.st_size or inode != stat.st_ino:
+            offset, latest = 0, {}
+
+        with self.runs_path.open("rb") as handle:
+            start = max(0, offset - _RUNS_INDEX_CHECK_BYTES)
+            handle.seek(start)
+            window = handle.read(offset - start)
+            if offset and _index_check(window) != check:
+                offset, latest, window = 0, {}, b""
+                handle.seek(0)
+            elif offset == stat.st_size:
+                return latest
+            data = handle.read()
+        lines = data.split(b"\n")
+        # A trailing partial line belongs to an in-flight append; fold it next time.
+        folded = len(data) - len(lines.pop())
+        offset += folded
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = _decode_line(line)
+            except Exception:
+                continue
+            if not isinstance(record, dict):
+                continue
+            run_id = str(record.get("run_id", "") or "")
+            if not run_id:
+                continue
+            previous = latest.get(run_id)
             if previous is None or _record_sort_key(record) >= _record_sort_key(previous):
-                latest[key] = record
+                latest[run_id] = record
+
+        payload = {
+            "offset": offset,
+            "inode": stat.st_ino,
+            "check": _index_check((window + data[:folded])[-_RUNS_INDEX_CHECK_BYTES:]),
+            "latest": latest,
+        }
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f".{self.runs_index_path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_path, self.runs_index_path)
+        except OSError:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
         return latest
 
     def append_run(self, record: Dict[str, Any]) -> None:
         self._append_jsonl(self.runs_path, record)
 
     def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
-        return self._latest_by(self.runs_path, ("run_id",)).get((str(run_id),))
+        return self._latest_runs().get(str(run_id))
 
     def list_runs(self, *, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         runs = [
             record
-            for record in self._latest_by(self.runs_path, ("run_id",)).values()
+            for record in self._latest_runs().values()
             if not record.get("_deleted")
         ]
         runs.sort(key=lambda item: (_record_sort_key(item), str(item.get("run_id", ""))), reverse=True)
@@ -142,11 +355,29 @@ class RuntimeStore:
     def append_event(self, record: Dict[str, Any]) -> None:
         self._append_jsonl(self.events_path, record)
 
+    def append_events(self, records: Iterable[Dict[str, Any]]) -> None:
+        self._append_jsonl_many(self.events_path, records)
+
     def list_events(self, run_id: str) -> List[Dict[str, Any]]:
-        records = [record for record in self._iter_jsonl(self.events_path) if str(record.get("run_id", "")) == str(run_id)]
+        run_id = str(run_id)
+        # Only decode lines that can mention this run; the exact match below
+        # still filters out accidental substring hits.
+        needle = _run_id_needle(run_id)
+        records = [
+            record
+            for record in self._iter_jsonl(self.events_path, contains=needle)
+            if str(record.get("run_id", "")) == run_id
+        ]
         records.sort(key=_record_sort_key)
         return records
 
+    def iter_events_reversed(self, run_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield one run's events in reverse append order, reading from the file tail."""
+        run_id = str(run_id)
+        for record in self._iter_jsonl_reversed(self.events_path, contains=_run_id_needle(run_id)):
+            if str(record.get("run_id", "")) == run_id:
+                yield record
+
     def save_checkpoint(self, record: Dict[str, Any]) -> None:
         self._append_jsonl(self.checkpoints_path, record)
 
@@ -22,11 +22,16 @@ _STORAGE_TYPE_ALIASES = {
     "smb": StorageType.SMB,
 }
 
-_BUCKET_STORAGE_TYPES = {
-    StorageType.R2,
-    StorageType.B2,
-    StorageType.GCS,
-    StorageType.HF,
+# Storage type -> (config key for the spec remainder, strip surrounding slashes).
+_SPEC_REMAINDER_FIELDS = {
+    StorageType.R2: ("bucket", True),
+    StorageType.B2: ("bucket", True),
+    StorageType.GCS: ("bucket", True),
+    StorageType.HF: ("bucket", True),
+    StorageType.GOOGLE_DRIVE: ("remote_name", False),
+    StorageType.LOCAL: ("path", False),
+    StorageType.SSH: ("host", False),
+    StorageType.SMB: ("host", False),
 }
 
 _INLINE_TRANSFER_STORAGE_TYPES = {
@@ -37,6 +42,9 @@ _INLINE_TRANSFER_STORAGE_TYPES = {
     StorageType.GOOGLE_DRIVE,
 }
 
+_RE_REMOTE_UNSAFE = re.compile(r"[^A-Za-z0-9_]+")
+_RE_UNDERSCORES = re.compile(r"_+")
+
 
 def normalize_storage_reference(value: Any) -> str:
     """Normalize storage references like '@artifacts' to 'artifacts'."""
@@ -74,8 +82,8 @@ def unsupported_inline_storage_error(value: Any) -> Optional[str]:
 def sanitize_rclone_remote_name(name: Any, *, uppercase: bool = False) -> str:
     """Convert arbitrary storage names into safe rclone remote identifiers."""
     text = str(name).strip() if name is not None else ""
-    text = re.sub(r"[^A-Za-z0-9_]+", "_", text)
-    text = re.sub(r"_+", "_", text).strip("_") or "storage"
+    text = _RE_REMOTE_UNSAFE.sub("_", text)
+    text = _RE_UNDERSCORES.sub("_", text).strip("_") or "storage"
     if text[0].isdigit():
         text = f"s_{text}"
     return text.upper() if uppercase else text.lower()
@@ -117,24 +125,10 @@ def build_storage_from_spec(
 
     config = {}
     remainder = remainder.strip()
-    if storage_type in _BUCKET_STORAGE_TYPES:
-        if remainder:
-            config["bucket"] = remainder.strip("/")
-    elif storage_type == StorageType.GOOGLE_DRIVE:
-        if remainder:
-            config["remote_name"] = remainder
-    elif storage_type == StorageType.HF:
-        if remainder:
-            config["bucket"] = remainder.strip("/")
-    elif storage_type == StorageType.LOCAL:
-        if remainder:
-            config["path"] = remainder
-    elif storage_type == StorageType.SSH:
-        if remainder:
-            config["host"] = remainder
-    elif storage_type == StorageType.SMB:
-        if remainder:
-            config["host"] = remainder
+    field = _SPEC_REMAINDER_FIELDS.get(storage_type)
+    if field is not None and remainder:
+        key, strip_slashes = field
+        config[key] = remainder.strip("/") if strip_slashes else remainder
 
     name = storage_name or build_inline_storage_name(text)
     return Storage(
@@ -131,25 +131,20 @@ class TmuxBridgeManager:
             return None
 
         expected_title = self._pane_title(window_name)
-        pane_ids = self._tmux.list_panes(self.window_target, "#{pane_id}")
-        for pane_id in pane_ids:
-            if not pane_id:
-                continue
-            title_result = self._tmux.display_message(pane_id, "#{pane_title}")
-            if title_result.returncode != 0:
-                continue
-            if title_result.stdout.strip() == expected_title:
+        # One list-panes call reports every title instead of a display-message per pane.
+        for line in self._tmux.list_panes(self.window_target, "#{pane_id}\t#{pane_title}"):
+            pane_id, _, title = line.partition("\t")
+            if pane_id and title.strip() == expected_title:
                 return pane_id
         return None
 
-    def _set_pane_title(self, pane_id: str, window_name: str) -> None:
-        """Set pane title to make resume idempotent."""
-        self._tmux.set_pane_title(pane_id, self._pane_title(window_name))
-
-    def _normalize_layout(self) -> None:
-        """Keep all bridge panes visible and easy to monitor."""
+    def _finish_new_pane(self, pane_id: str, window_name: str) -> None:
+        """Set pane title (so resume is idempotent) and keep all bridge panes visible."""
+        title = self._pane_title(window_name)
         if self.window_target:
-            self._tmux.select_layout(self.window_target, "tiled")
+            self._tmux.set_pane_title_and_layout(pane_id, title, self.window_target, "tiled")
+        else:
+            self._tmux.set_pane_title(pane_id, title)
 
     def connect(self, window_name: str, attach_command: str) -> Tuple[bool, str]:
         """Create or reuse a split pane for a window attach command."""
@@ -196,8 +191,7 @@ class TmuxBridgeManager:
             attach_command=attach_command,
         )
         self._split_target = pane_id
-        self._set_pane_title(pane_id, window_name)
-        self._normalize_layout()
+        self._finish_new_pane(pane_id, window_name)
 
         if self.mode == "detached_session" and not self._detached_notice_emitted:
             self._detached_notice_emitted = True
@@ -6,6 +6,9 @@ from __future__ import annotations
 import re
 from typing import Optional
 
+_RE_NON_ALNUM = re.compile(r"[^a-zA-Z0-9]+")
+_RE_UNDERSCORES = re.compile(r"_+")
+
 
 def get_job_token(job_id: str) -> str:
     """Normalized short token used in tmux naming."""
@@ -14,8 +17,8 @@ def get_job_token(job_id: str) -> str:
 
 def _sanitize_name(value: str) -> str:
     """Sanitize arbitrary names to tmux-safe snake-like segments."""
-    normalized = re.sub(r"[^a-zA-Z0-9]+", "_", value or "")
-    normalized = re.sub(r"_+", "_", normalized).strip("_").lower()
+    normalized = _RE_NON_ALNUM.sub("_", value or "")
+    normalized = _RE_UNDERSCORES.sub("_", normalized).strip("_").lower()
     return normalized or "job"
 
 
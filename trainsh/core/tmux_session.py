@@ -1,6 +1,8 @@
 # tmux-trainsh tmux session management
 # Simplified tmux wrapper leveraging native tmux features
 
+import os
+import re
 import shlex
 import time
 from dataclasses import dataclass, field
@@ -256,9 +258,8 @@ class TmuxSession:
         Returns:
             True if command completed successfully
         """
-        import uuid
         pane_id = self.panes.get(target, target)
-        signal = signal or f"train_{uuid.uuid4().hex[:8]}"
+        signal = signal or f"train_{os.urandom(4).hex()}"
 
         # Wrap command: run command, then signal completion
         # Using ( ) to group command preserves exit code
@@ -324,12 +325,11 @@ class TmuxSession:
         Returns:
             True if pattern found
         """
-        import re
-
+        regex = re.compile(pattern)
         start_time = time.time()
         while time.time() - start_time < timeout:
             output = self.capture(target, start=-100)
-            if re.search(pattern, output):
+            if regex.search(output):
                 return True
             time.sleep(poll_interval)
 
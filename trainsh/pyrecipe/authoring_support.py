@@ -81,6 +81,8 @@ def normalize_condition(condition: str) -> str:
         raise PythonRecipeError("condition cannot be empty")
     if ":" in text:
         return text
+    if "==" not in text:
+        return f"var:{text}"
 
     matched = _EQ_CONDITION.match(text)
     if not matched:
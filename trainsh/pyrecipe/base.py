@@ -12,6 +12,7 @@ from typing import Any, Dict, Iterable, List, Optional
 
 from ..core.recipe_models import RecipeModel, RecipeStepModel
 from ..core.models import Storage as RuntimeStorage
+from ..runtime_executors import normalize_executor_name
 
 from .control_steps import RecipeControlMixin
 from .models import Host, HostPath, PythonRecipeError, ProviderStep, RecipeStep, Storage, StoragePath
@@ -32,6 +33,7 @@ from .references import wrap_step_handle
 
 
 _ACTIVE_RECIPE: "RecipeSpecCore | None" = None
+_RE_ALIAS_UNSAFE = re.compile(r"[^A-Za-z0-9_]+")
 
 
 def get_active_recipe():
@@ -69,7 +71,7 @@ class RecipeSpecCore:
         self.runpod = RunpodNamespace(self)
         self.vllm = VllmNamespace(self)
         self.notify = NotifyNamespace(self)
-        if "".join(ch for ch in str(executor).lower() if ch.isalnum()) in {
+        if normalize_executor_name(executor) in {
             "k8s",
             "kubernetes",
             "kubernetesexecutor",
@@ -112,7 +114,7 @@ class RecipeSpecCore:
         """Change executor type and options."""
         if not name:
             raise PythonRecipeError("executor name cannot be empty")
-        normalized = "".join(ch for ch in str(name).lower() if ch.isalnum())
+        normalized = normalize_executor_name(name)
         if normalized in {
             "k8s",
             "kubernetes",
@@ -539,21 +541,39 @@ class RecipeSpecCore:
         """Look up previously remembered session metadata."""
         return self._session_registry.get(self._clean_session(str(name)))
 
-    def _host_alias_for(self, host: Host) -> str:
-        cached = self._resource_host_aliases.get(host)
-        if cached:
-            return cached
-
-        base = re.sub(r"[^A-Za-z0-9_]+", "_", (host.name or host.spec).strip()).strip("_") or "host"
+    @staticmethod
+    def _register_alias(
+        target: dict[str, Any],
+        cache: dict[Any, str],
+        cache_key: Any,
+        label: str,
+        value: Any,
+        default: str,
+    ) -> str:
+        """Reserve a unique alias for one resource in ``target`` and memoize it."""
+        base = _RE_ALIAS_UNSAFE.sub("_", label.strip()).strip("_") or default
         alias = base
         suffix = 1
-        while alias in self.hosts and self.hosts[alias] != host.spec:
+        while alias in target and target[alias] != value:
             suffix += 1
             alias = f"{base}_{suffix}"
-        self.hosts[alias] = host.spec
-        self._resource_host_aliases[host] = alias
+        target[alias] = value
+        cache[cache_key] = alias
         return alias
 
+    def _host_alias_for(self, host: Host) -> str:
+        cached = self._resource_host_aliases.get(host)
+        if cached:
+            return cached
+        return self._register_alias(
+            self.hosts,
+            self._resource_host_aliases,
+            host,
+            host.name or host.spec,
+            host.spec,
+            "host",
+        )
+
     def _storage_alias_for(self, storage: Storage) -> str:
         cache_key = id(storage)
         cached = self._resource_storage_aliases.get(cache_key)
@@ -561,21 +581,15 @@ class RecipeSpecCore:
             return cached
 
         raw = storage.spec
-        if isinstance(raw, RuntimeStorage):
-            base_text = raw.name or raw.type.value
-            stored_value: Any = raw
-        else:
-            base_text = str(raw)
-            stored_value = raw
-        base = re.sub(r"[^A-Za-z0-9_]+", "_", (storage.name or base_text).strip()).strip("_") or "storage"
-        alias = base
-        suffix = 1
-        while alias in self.storages and self.storages[alias] != stored_value:
-            suffix += 1
-            alias = f"{base}_{suffix}"
-        self.storages[alias] = stored_value
-        self._resource_storage_aliases[cache_key] = alias
-        return alias
+        base_text = (raw.name or raw.type.value) if isinstance(raw, RuntimeStorage) else str(raw)
+        return self._register_alias(
+            self.storages,
+            self._resource_storage_aliases,
+            cache_key,
+            storage.name or base_text,
+            raw,
+            "storage",
+        )
 
     def resolve_host(self, host: Any) -> str:
         if isinstance(host, Host):
@@ -17,13 +17,12 @@ class RecipeControlMixin:
         args: Iterable[str],
         raw: str,
     ) -> RecipeStepModel:
-        args = list(args)
         return RecipeStepModel(
             type=StepType.CONTROL,
             line_num=0,
             raw=raw,
             command=command,
-            args=args,
+            args=tuple(args),
         )
 
     def tmux_open(
@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..core.models import Storage as RuntimeStorage
 from ..core.recipe_models import RecipeStepModel, StepType
@@ -207,7 +207,7 @@ class RecipeStep:
         return self.step_model.command
 
     @property
-    def args(self) -> List[str]:
+    def args(self) -> Tuple[str, ...]:
         return self.step_model.args
 
     @property
@@ -293,8 +293,8 @@ class ProviderStep:
         return "provider"
 
     @property
-    def args(self) -> List[str]:
-        return [self.provider, self.operation]
+    def args(self) -> Tuple[str, ...]:
+        return (self.provider, self.operation)
 
     def to_step_model(self) -> RecipeStepModel:
         return RecipeStepModel(
@@ -302,5 +302,5 @@ class ProviderStep:
             line_num=0,
             raw=self.raw,
             command="provider",
-            args=[self.provider, self.operation],
+            args=(self.provider, self.operation),
         )
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import concurrent.futures
+import re
 from typing import Any, Callable, Dict
 
+_RE_NON_ALNUM = re.compile(r"[\W_]+")
+
 
 def normalize_executor_name(name: str) -> str:
     """Normalize executor names for compatibility checks."""
-    return "".join(ch for ch in str(name).lower() if ch.isalnum())
+    return _RE_NON_ALNUM.sub("", str(name).lower())
 
 
 def _coerce_max_workers(kwargs: Dict[str, Any], default: int = 4) -> int:
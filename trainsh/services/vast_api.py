@@ -2,8 +2,10 @@
 # REST API client for Vast.ai GPU marketplace
 
 import json
+import threading
+import time
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError, URLError
 import ssl
@@ -32,6 +34,10 @@ class VastAPIClient:
     - Manage SSH keys
     """
 
+    # Instance reads repeated within this window reuse the last response.
+    READ_CACHE_TTL = 2.0
+    READ_CACHE_SIZE = 128
+
     def __init__(self, api_key: str):
         """
         Initialize the API client.
@@ -41,6 +47,24 @@ class VastAPIClient:
         """
         self.api_key = api_key
         self.base_url = VAST_API_BASE
+        # Loading the CA bundle is the costly part of a context; share one per client.
+        self._ssl_context = ssl.create_default_context()
+        self._read_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._read_cache_lock = threading.Lock()
+
+    def _cached_get(self, endpoint: str) -> Dict[str, Any]:
+        """GET an endpoint, reusing a response fetched within READ_CACHE_TTL."""
+        now = time.monotonic()
+        with self._read_cache_lock:
+            hit = self._read_cache.get(endpoint)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        response = self._request(endpoint)
+        with self._read_cache_lock:
+            if len(self._read_cache) >= self.READ_CACHE_SIZE:
+                self._read_cache.clear()
+            self._read_cache[endpoint] = (now + self.READ_CACHE_TTL, response)
+        return response
 
     def _request(
         self,
@@ -62,6 +86,11 @@ class VastAPIClient:
         Raises:
             VastAPIError: If the API returns an error
         """
+        if method != "GET":
+            # Any write may change instance state; drop cached reads.
+            with self._read_cache_lock:
+                self._read_cache.clear()
+
         url = f"{self.base_url}/{endpoint}/"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -72,13 +101,10 @@ class VastAPIClient:
         if data:
             body = json.dumps(data).encode("utf-8")
 
-        # Create SSL context that allows unverified certificates (for testing)
-        ctx = ssl.create_default_context()
-
         req = Request(url, data=body, headers=headers, method=method)
 
         try:
-            with urlopen(req, context=ctx) as response:
+            with urlopen(req, context=self._ssl_context) as response:
                 response_data = response.read().decode("utf-8")
                 if response_data:
                     return json.loads(response_data)
@@ -93,15 +119,39 @@ class VastAPIClient:
     # Instance Operations
     # =========================================================================
 
-    def list_instances(self) -> List[VastInstance]:
+    def list_instances(
+        self,
+        gpu_name: Optional[str] = None,
+        num_gpus: Optional[int] = None,
+        min_gpu_ram: Optional[float] = None,
+        max_dph: Optional[float] = None,
+    ) -> List[VastInstance]:
         """
-        List all instances for the account.
+        List instances for the account.
+
+        The instances endpoint takes no query filters, so the optional
+        filters are applied to the raw rows before any VastInstance is built.
+
+        Args:
+            gpu_name: Only instances with this GPU (case-insensitive)
+            num_gpus: Minimum number of GPUs
+            min_gpu_ram: Minimum GPU RAM in GB
+            max_dph: Maximum dollars per hour
 
         Returns:
             List of VastInstance objects
         """
-        response = self._request("instances")
+        response = self._cached_get("instances")
         instances = response.get("instances", [])
+        if gpu_name or num_gpus or min_gpu_ram or max_dph:
+            wanted_gpu = gpu_name.upper() if gpu_name else None
+            instances = [
+                i for i in instances
+                if (wanted_gpu is None or (i.get("gpu_name") or "").upper() == wanted_gpu)
+                and (not num_gpus or (i.get("num_gpus") or 0) >= num_gpus)
+                and (not min_gpu_ram or (i.get("gpu_ram") or 0) / 1024.0 >= min_gpu_ram)
+                and (not max_dph or (i.get("dph_total") or 0.0) <= max_dph)
+            ]
         return [self._parse_instance(i) for i in instances]
 
     def get_instance(self, instance_id: int) -> VastInstance:
@@ -114,7 +164,7 @@ class VastAPIClient:
         Returns:
             VastInstance object
         """
-        response = self._request(f"instances/{instance_id}")
+        response = self._cached_get(f"instances/{instance_id}")
         raw = response.get("instances")
         if raw is None:
             raise VastAPIError(404, f'{{"success":false,"error":"no_such_instance","msg":"Instance {instance_id} not found."}}')
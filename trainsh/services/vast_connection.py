@@ -1,9 +1,23 @@
-"""Shared Vast.ai SSH target resolution helpers."""
+"""Shared Vast.ai SSH target resolution, key record, and wait pacing helpers."""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
 from typing import Any, Optional
 
+from ..constants import STATE_DIR
+
+WAIT_POLL_BASE = 2.0
+WAIT_BACKOFF = 1.5
+WAIT_JITTER = 0.5
+# Re-list the account's SSH keys at least this often even when recorded.
+ATTACHED_KEY_TTL = 24 * 3600
+
 
 def _read_value(instance: Any, name: str, default=None):
     if isinstance(instance, dict):
@@ -137,9 +151,73 @@ def ssh_target_to_command(target: dict[str, Any]) -> str:
     return f"ssh -p {port} {username}@{hostname}"
 
 
+def vast_wait_delay(poll_count: int, poll_interval: float, running: bool) -> float:
+    """Seconds to sleep before the next vast.wait poll.
+
+    A running instance only waits on SSH, so it is re-checked quickly;
+    otherwise polls back off from WAIT_POLL_BASE toward poll_interval.
+    """
+    if running:
+        return min(poll_interval, WAIT_POLL_BASE)
+    delay = WAIT_POLL_BASE * WAIT_BACKOFF ** (poll_count - 1)
+    return min(poll_interval, delay + random.uniform(0, WAIT_JITTER))
+
+
+def attached_key_digest(account: str, key_type: str, key_data: str) -> str:
+    """Digest of a public key, keyed by account so switching API keys re-checks."""
+    return hashlib.sha256(f"{account}\n{key_type} {key_data}".encode("utf-8")).hexdigest()
+
+
+def load_attached_keys() -> dict[str, float]:
+    """Read unexpired digests of keys known to be attached (best effort)."""
+    try:
+        data = json.loads((STATE_DIR / "vast" / "ssh_keys.json").read_text(encoding="utf-8"))
+        entries = data.get("attached", {})
+        cutoff = time.time() - ATTACHED_KEY_TTL
+        return {digest: float(seen) for digest, seen in entries.items() if float(seen) > cutoff}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return {}
+
+
+def _save_attached_keys(entries: dict[str, float]) -> None:
+    """Replace the attached-key record atomically (best effort)."""
+    path = STATE_DIR / "vast" / "ssh_keys.json"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".ssh_keys.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"attached": entries}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def remember_attached_key(digest: str) -> None:
+    """Record an attached key digest so later waits skip the key listing."""
+    entries = load_attached_keys()
+    entries[digest] = time.time()
+    _save_attached_keys(entries)
+
+
+def forget_attached_key(digest: str) -> None:
+    """Drop a key digest so the next attach check lists the account's keys again."""
+    entries = load_attached_keys()
+    if entries.pop(digest, None) is not None:
+        _save_attached_keys(entries)
+
+
 __all__ = [
+    "attached_key_digest",
+    "forget_attached_key",
+    "load_attached_keys",
     "preferred_vast_ssh_target",
+    "remember_attached_key",
     "ssh_target_to_command",
     "ssh_target_to_spec",
     "vast_ssh_targets",
+    "vast_wait_delay",
 ]